@@ -3,13 +3,21 @@ AIResume - Streamlit Frontend
 Professional resume tailoring application with AI-powered optimization.
 """
 
+import time
+import uuid
 import streamlit as st
 from pathlib import Path
 import config
 from backend.file_parser import extract_text_from_uploaded_file
+from backend.deadline import Deadline
 from backend.resume_analyzer import calculate_match_score, get_match_summary
-from backend.resume_tailor import quick_tailor
-from backend.document_generator import generate_resume_document
+from backend.resume_tailor import (
+    plan_tailoring, find_reusable_tailoring, reuse_tailoring, preview_tailoring
+)
+from backend.balance_cache import get_balance_cache
+from backend.job_queue import get_job_queue
+from backend.rate_limiter import get_rate_scheduler
+from backend.document_generator import render_document
 
 
 # Page configuration
@@ -33,6 +41,80 @@ def init_session_state():
         st.session_state.tailoring_result = None
     if 'initial_analysis' not in st.session_state:
         st.session_state.initial_analysis = None
+    if 'loaded_job_id' not in st.session_state:
+        st.session_state.loaded_job_id = None
+    if 'user_id' not in st.session_state:
+        # Identifies this browser session for fair sharing of the API rate limits
+        st.session_state.user_id = uuid.uuid4().hex
+
+
+def format_balance_age(balance_info):
+    """Describe how fresh the cached balance is."""
+    age = balance_info.get('age') or 0
+    if age < 60:
+        text = "Updated just now"
+    elif age < 3600:
+        text = f"Updated {age / 60:.0f} min ago"
+    else:
+        text = f"Updated {age / 3600:.1f} h ago"
+
+    if balance_info.get('local_spend'):
+        text += f" · includes ~${balance_info['local_spend']:.4f} estimated since"
+    if balance_info.get('refreshing'):
+        text += " · refreshing..."
+    elif balance_info.get('refresh_error'):
+        text += " · last refresh failed"
+    return text
+
+
+def poll_tailoring_job():
+    """
+    Show the status of the current tailoring job and load its result once done.
+
+    The job ID is kept in the URL (?job=...), so a refresh or reconnect picks
+    the result up from the job queue instead of losing it.
+    """
+    job_id = st.query_params.get('job')
+    if not job_id or job_id == st.session_state.loaded_job_id:
+        return
+
+    job = get_job_queue().get(job_id)
+    if job is None:
+        st.warning("⚠️ That tailoring job has expired. Please run the tailoring again.")
+        del st.query_params['job']
+        return
+
+    if job['status'] in ('queued', 'running'):
+        if job['status'] == 'queued':
+            label = f"⏳ Waiting for a free worker (position {job['queue_position']} in queue)..."
+        else:
+            label = "🤖 AI is tailoring your resume... This may take 30-60 seconds..."
+        with st.spinner(label):
+            time.sleep(config.JOB_POLL_INTERVAL)
+        st.rerun()
+
+    st.session_state.loaded_job_id = job_id
+
+    if job['status'] != 'done':
+        st.error(f"❌ Tailoring failed: {job.get('error') or job['status']}")
+        return
+
+    st.session_state.tailoring_result = job['result']
+    result = job['result']
+    if result['success']:
+        st.success("✅ Resume tailored successfully!")
+        if result.get('failed_roles'):
+            st.warning("⚠️ Some projects could not be tailored and were kept unchanged.")
+        if result.get('repairs'):
+            st.info("🔧 The AI output was repaired automatically: " + "; ".join(result['repairs']))
+        if result.get('truncated'):
+            st.warning("⚠️ The AI response was still cut off after continuation. "
+                       "Review the end of the tailored resume.")
+    elif result.get('status') == 'deadline_exceeded':
+        st.error(f"⏱️ Tailoring timed out during {result.get('stage') or 'processing'} "
+                 f"(limit {config.TAILORING_DEADLINE:.0f}s). Please try again.")
+    else:
+        st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
 
 
 def main():
@@ -56,12 +138,12 @@ def main():
         with col2:
             refresh_balance = st.button("🔄", help="Refresh balance")
 
-        # Initialize balance in session state
-        if 'balance_info' not in st.session_state or refresh_balance:
-            from backend.resume_tailor import get_account_balance
-            st.session_state.balance_info = get_account_balance()
-
-        balance_info = st.session_state.balance_info
+        # Shared by all sessions and refreshed in the background; tailoring
+        # costs are added locally until the next refresh
+        if refresh_balance:
+            balance_info = get_balance_cache().refresh()
+        else:
+            balance_info = get_balance_cache().get()
 
         if balance_info.get('success'):
             usage = balance_info.get('usage', 0)
@@ -80,7 +162,7 @@ def main():
                 )
 
                 # Progress bar
-                st.progress(usage_percent / 100)
+                st.progress(min(usage_percent / 100, 1.0))
 
                 # Additional info
                 with st.expander("💰 Credit Details"):
@@ -92,6 +174,8 @@ def main():
                         st.caption("🆓 Free Tier Account")
             else:
                 st.info("💳 Pay-as-you-go account (no credit limit)")
+
+            st.caption(format_balance_age(balance_info))
         else:
             st.warning(f"⚠️ Unable to fetch balance: {balance_info.get('error', 'Unknown error')}")
 
@@ -132,6 +216,22 @@ def main():
             help="Number of recent projects to modify"
         )
 
+        parallel_mode = st.checkbox(
+            "⚡ Fast mode (tailor each project in parallel)",
+            value=config.TAILORING_MODE == 'parallel',
+            help="Rewrites only the bullets of each project, one request per project at once"
+        )
+
+        rate_stats = get_rate_scheduler().stats().get(selected_model)
+        if rate_stats:
+            with st.expander("🚦 API Rate Limits"):
+                st.write(f"**Requests waiting:** {rate_stats['queue_depth']} "
+                         f"({rate_stats['users_waiting']} users)")
+                st.write(f"**Average wait:** {rate_stats['mean_wait']:.1f}s "
+                         f"(p95 {rate_stats['p95_wait']:.1f}s)")
+                st.write(f"**Available now:** {rate_stats['requests_available']} requests, "
+                         f"{rate_stats['tokens_available']:,} tokens")
+
         st.markdown("---")
 
         # Cost information
@@ -161,7 +261,9 @@ def main():
         if resume_file:
             try:
                 with st.spinner("Extracting resume text..."):
-                    st.session_state.resume_text = extract_text_from_uploaded_file(resume_file)
+                    st.session_state.resume_text = extract_text_from_uploaded_file(
+                        resume_file, Deadline(config.EXTRACTION_DEADLINE)
+                    )
                 st.success(f"✅ Resume loaded: {resume_file.name}")
 
                 # Show preview
@@ -195,7 +297,9 @@ def main():
             if jd_file:
                 try:
                     with st.spinner("Extracting job description..."):
-                        st.session_state.jd_text = extract_text_from_uploaded_file(jd_file)
+                        st.session_state.jd_text = extract_text_from_uploaded_file(
+                            jd_file, Deadline(config.EXTRACTION_DEADLINE)
+                        )
                     st.success(f"✅ Job description loaded: {jd_file.name}")
 
                     with st.expander("📄 View Job Description"):
@@ -286,36 +390,81 @@ def main():
                     else:
                         st.success("All technical skills matched!")
 
+            # Pre-flight quote (offline estimate, no API call)
+            quote = plan_tailoring(
+                st.session_state.resume_text,
+                st.session_state.jd_text,
+                st.session_state.initial_analysis,
+                model=selected_model,
+                max_projects=max_projects
+            )
+
+            with st.sidebar:
+                st.markdown("---")
+                st.subheader("🧾 Pre-flight Quote")
+                quote_col1, quote_col2 = st.columns(2)
+                with quote_col1:
+                    st.metric(
+                        "Est. Cost",
+                        f"${quote['estimated_cost']:.4f}" if quote['estimated_cost'] is not None else "N/A"
+                    )
+                with quote_col2:
+                    st.metric("Est. Time", f"~{quote['expected_latency']:.0f}s")
+                st.caption(
+                    f"~{quote['prompt_tokens']:,} prompt + ~{quote['completion_tokens']:,} completion tokens"
+                )
+                for compaction in quote['compactions']:
+                    st.caption(f"✂️ {compaction} to fit the budget")
+                if not quote['within_budget']:
+                    st.warning("⚠️ Estimated usage exceeds the configured budget even after compaction")
+
+            # Offer a prior tailoring of this resume against a near-duplicate JD
+            reusable = None
+            if config.JD_REUSE_MODE == 'offer':
+                reusable = find_reusable_tailoring(
+                    st.session_state.resume_text,
+                    st.session_state.jd_text
+                )
+
             # Tailoring button
             st.markdown("---")
             col1, col2, col3 = st.columns([1, 2, 1])
 
             with col2:
+                if reusable:
+                    st.info(f"♻️ This job description is {reusable['similarity'] * 100:.0f}% similar to one "
+                            f"this resume was already tailored for.")
+                    if st.button("♻️ Reuse Prior Tailoring (no API cost)", use_container_width=True):
+                        st.session_state.tailoring_result = reuse_tailoring(
+                            reusable,
+                            st.session_state.resume_text,
+                            st.session_state.jd_text,
+                            st.session_state.initial_analysis
+                        )
+                        st.success("✅ Reused prior tailoring, re-scored against this job description")
+
+                if st.button("⚡ Instant Preview (free, no AI call)", use_container_width=True):
+                    st.session_state.tailoring_result = preview_tailoring(
+                        st.session_state.resume_text,
+                        st.session_state.jd_text,
+                        st.session_state.initial_analysis,
+                        max_projects
+                    )
+
                 if st.button("✨ Tailor Resume to Job Description", type="primary", use_container_width=True):
-                    with st.spinner("🤖 AI is tailoring your resume... This may take 30-60 seconds..."):
-                        try:
-                            # Update max_projects in config temporarily
-                            config.MAX_PROJECTS_TO_TAILOR = max_projects
-
-                            # Tailor resume
-                            st.session_state.tailoring_result = quick_tailor(
-                                st.session_state.resume_text,
-                                st.session_state.jd_text,
-                                model=selected_model
-                            )
-
-                            if st.session_state.tailoring_result['success']:
-                                st.success("✅ Resume tailored successfully!")
-
-                                # Refresh balance after successful tailoring
-                                from backend.resume_tailor import get_account_balance
-                                st.session_state.balance_info = get_account_balance()
-                            else:
-                                st.error(f"❌ Error: {st.session_state.tailoring_result.get('error', 'Unknown error')}")
-
-                        except Exception as e:
-                            st.error(f"❌ Tailoring failed: {e}")
-                            st.session_state.tailoring_result = None
+                    # Runs on a background worker; this page polls the job by ID
+                    job_id = get_job_queue().submit('tailor', {
+                        'resume_text': st.session_state.resume_text,
+                        'jd_text': st.session_state.jd_text,
+                        'model': selected_model,
+                        'mode': 'parallel' if parallel_mode else 'full',
+                        'max_projects': max_projects,
+                        'user': st.session_state.user_id
+                    })
+                    st.query_params['job'] = job_id
+                    st.session_state.tailoring_result = None
+
+    poll_tailoring_job()
 
     # Display tailoring results
     if st.session_state.tailoring_result and st.session_state.tailoring_result.get('success'):
@@ -347,6 +496,15 @@ def main():
             else:
                 st.warning("⚠️ Minor improvement")
 
+        if st.session_state.tailoring_result.get('preview'):
+            st.caption(f"⚡ Instant preview computed locally in "
+                       f"{st.session_state.tailoring_result['latency_ms']:.0f} ms. "
+                       f"Run the AI tailoring for deeper rewording.")
+
+        reused = st.session_state.tailoring_result.get('reused')
+        if reused:
+            st.caption(f"♻️ Reused a prior tailoring for a {reused['similarity'] * 100:.0f}% similar job description")
+
         # Summary of changes
         st.markdown("### 📝 Summary of Changes")
         st.info(st.session_state.tailoring_result['summary'])
@@ -366,38 +524,28 @@ def main():
 
         download_col1, download_col2 = st.columns(2)
 
+        # Rendered only when a download is clicked, and cached by content, so
+        # reruns do no rendering work
+        tailored_text = st.session_state.tailoring_result['tailored_resume']
+
         with download_col1:
-            # Generate DOCX
-            docx_result = generate_resume_document(
-                st.session_state.tailoring_result['tailored_resume'],
-                format='docx'
+            st.download_button(
+                label="📥 Download as DOCX",
+                data=lambda: render_document(tailored_text, 'docx', Deadline(config.RENDER_DEADLINE)),
+                file_name="tailored_resume.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True
             )
 
-            if docx_result['success']:
-                st.download_button(
-                    label="📥 Download as DOCX",
-                    data=docx_result['docx_bytes'],
-                    file_name="tailored_resume.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    use_container_width=True
-                )
-
         with download_col2:
-            # Generate PDF
-            pdf_result = generate_resume_document(
-                st.session_state.tailoring_result['tailored_resume'],
-                format='pdf'
+            st.download_button(
+                label="📥 Download as PDF",
+                data=lambda: render_document(tailored_text, 'pdf', Deadline(config.RENDER_DEADLINE)),
+                file_name="tailored_resume.pdf",
+                mime="application/pdf",
+                use_container_width=True
             )
 
-            if pdf_result['success']:
-                st.download_button(
-                    label="📥 Download as PDF",
-                    data=pdf_result['pdf_bytes'],
-                    file_name="tailored_resume.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
-
         # Cost and usage information
         st.markdown("### 💰 API Usage & Cost")
 
@@ -443,6 +591,19 @@ def main():
             st.write(f"**Model Used:** {st.session_state.tailoring_result.get('model_used', 'N/A')}")
             st.write(f"**Total Tokens:** {usage_info.get('total_tokens', 'N/A')}")
 
+            if st.session_state.tailoring_result.get('coalesced'):
+                st.caption("🔗 Shared the result of an identical request already in progress (no additional cost)")
+
+            calls = st.session_state.tailoring_result.get('calls', [])
+            if len(calls) > 1:
+                st.write(f"**API Calls:** {len(calls)} (all included in the cost below)")
+                for call in calls:
+                    status = "used" if call.get('won') else "cancelled" if call.get('cancelled') else "discarded"
+                    st.caption(
+                        f"• {call.get('model')} ({call.get('role', 'primary')}, {status}): "
+                        f"{call.get('usage_info', {}).get('total_tokens', 0):,} tokens"
+                    )
+
             if cost_info.get('estimated_cost') is not None:
                 st.write(f"**Input Cost:** ${cost_info.get('input_cost', 0):.4f}")
                 st.write(f"**Output Cost:** ${cost_info.get('output_cost', 0):.4f}")
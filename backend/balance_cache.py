@@ -0,0 +1,156 @@
+"""
+Balance Cache Module
+Process-wide cache of the OpenRouter account balance, refreshed in the
+background so page loads never wait on the network, and adjusted locally
+by the estimated cost of each tailoring until the next refresh.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import config
+
+
+class BalanceCache:
+    """
+    Stale-while-revalidate cache of get_account_balance().
+
+    get() always answers from memory; when the value is older than the TTL
+    it also starts a refresh on a background thread. Costs recorded with
+    record_spend() are added to the cached usage until a refresh started
+    after them replaces it.
+    """
+
+    def __init__(self, fetch: Callable[[], Dict] = None, ttl: float = None):
+        self.fetch = fetch
+        self.ttl = config.BALANCE_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._value: Optional[Dict] = None
+        self._fetched_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._local_spend = 0.0
+        self._refreshing = False
+        self._refreshed = threading.Event()
+        self._refresh_error: Optional[str] = None
+
+    def _fetch(self) -> Dict:
+        if self.fetch is not None:
+            return self.fetch()
+        # Imported here to avoid a circular import with resume_tailor
+        from .resume_tailor import get_account_balance
+        return get_account_balance()
+
+    def _start_refresh(self) -> threading.Event:
+        """Start a background refresh unless one is running (caller holds the lock)."""
+        if not self._refreshing:
+            self._refreshing = True
+            self._refreshed = threading.Event()
+            threading.Thread(target=self._refresh, args=(self._local_spend,), name='balance-refresh',
+                             daemon=True).start()
+        return self._refreshed
+
+    def _refresh(self, spend_at_start: float) -> None:
+        try:
+            result = self._fetch()
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+
+        with self._lock:
+            now = time.time()
+            self._attempted_at = now
+            if result.get('success') or self._value is None or not self._value.get('success'):
+                self._value = result
+                self._fetched_at = now
+                self._refresh_error = None
+                if result.get('success'):
+                    # Spend recorded while the request was in flight may not be counted yet
+                    self._local_spend = max(0.0, self._local_spend - spend_at_start)
+            else:
+                # Keep showing the last good balance
+                self._refresh_error = result.get('error')
+            self._refreshing = False
+            self._refreshed.set()
+
+    def get(self, max_wait: float = None) -> Dict:
+        """
+        Get the cached balance, refreshing it in the background when stale.
+
+        Args:
+            max_wait: Seconds to wait for the first fetch when nothing is
+                cached yet (defaults to config.BALANCE_INITIAL_WAIT)
+
+        Returns:
+            Dictionary shaped like get_account_balance() plus 'age'
+            (seconds since fetched, None if never), 'stale', 'refreshing',
+            'local_spend' (estimated cost added to usage since the fetch)
+            and 'refresh_error' (why the latest refresh failed, if it did)
+        """
+        if max_wait is None:
+            max_wait = config.BALANCE_INITIAL_WAIT
+
+        with self._lock:
+            if self._attempted_at is None or time.time() - self._attempted_at > self.ttl:
+                refreshed = self._start_refresh()
+            else:
+                refreshed = self._refreshed
+            empty = self._value is None
+
+        if empty and max_wait:
+            refreshed.wait(max_wait)
+
+        return self.snapshot()
+
+    def refresh(self, wait: float = None) -> Dict:
+        """
+        Refresh now (e.g. on a user's request).
+
+        Args:
+            wait: Seconds to wait for the refresh to finish (defaults to
+                config.BALANCE_INITIAL_WAIT)
+
+        Returns:
+            The cached balance after the refresh, or the current one if it
+            did not finish in time
+        """
+        with self._lock:
+            refreshed = self._start_refresh()
+        refreshed.wait(config.BALANCE_INITIAL_WAIT if wait is None else wait)
+        return self.snapshot()
+
+    def record_spend(self, cost: Optional[float]) -> None:
+        """Add an estimated cost to the cached usage until the next refresh."""
+        if cost:
+            with self._lock:
+                self._local_spend += cost
+
+    def snapshot(self) -> Dict:
+        """Current cached balance without triggering a refresh."""
+        with self._lock:
+            if self._value is None:
+                return {'success': False, 'error': 'Balance not loaded yet', 'age': None, 'stale': True,
+                        'refreshing': self._refreshing, 'local_spend': self._local_spend,
+                        'refresh_error': None}
+
+            age = time.time() - self._fetched_at
+            balance = dict(self._value, age=age, stale=age > self.ttl, refreshing=self._refreshing,
+                           local_spend=self._local_spend, refresh_error=self._refresh_error)
+            if balance.get('success') and balance.get('usage') is not None:
+                balance['usage'] += self._local_spend
+            return balance
+
+
+_balance_cache: Optional[BalanceCache] = None
+_balance_cache_lock = threading.Lock()
+
+
+def get_balance_cache() -> BalanceCache:
+    """Get the process-wide balance cache (created on first use)."""
+    global _balance_cache
+
+    if _balance_cache is None:
+        with _balance_cache_lock:
+            if _balance_cache is None:
+                _balance_cache = BalanceCache()
+
+    return _balance_cache
@@ -0,0 +1,217 @@
+"""
+Batch Render Module
+Renders a JSONL file of resumes ({"id": ..., "text": ...} per line) to
+DOCX and/or PDF across a process pool, streaming them into a ZIP archive.
+
+Usage:
+    python -m backend.batch_render resumes.jsonl resumes.zip
+    python -m backend.batch_render resumes.jsonl resumes.zip --format pdf --workers 4
+    python -m backend.batch_render resumes.jsonl resumes.zip --docx-backend ooxml
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+import config
+from .document_generator import DOCX_BACKENDS, RENDERERS, classify_lines, get_renderer
+
+
+# Characters not allowed in archive member names (taken from record ids)
+UNSAFE_NAME_PATTERN = re.compile(r'[^\w.-]+')
+
+
+def read_records(input_path: Union[str, Path]) -> Iterator[Tuple[int, Dict]]:
+    """
+    Read a JSONL file one record at a time.
+
+    Args:
+        input_path: JSONL file with one {"id", "text"} object per line
+
+    Yields:
+        (line number, record) pairs; malformed lines yield an 'error' record
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = {'error': f"Invalid JSON: {e}"}
+            if not isinstance(record, dict):
+                record = {'error': 'Expected a JSON object'}
+            yield line_number, record
+
+
+def render_record(text: str, formats: Tuple[str, ...], template: str = None,
+                  docx_backend: str = None) -> List[Tuple[str, bytes]]:
+    """
+    Render one resume in a worker process.
+
+    The render cache is bypassed: a batch renders each text once, and
+    caching would only fill every worker's memory.
+
+    Args:
+        text: Resume text
+        formats: Formats to render ('docx', 'pdf')
+        template: Registered template name (defaults to DEFAULT_TEMPLATE)
+        docx_backend: DOCX writer (defaults to config.DOCX_BACKEND)
+
+    Returns:
+        List of (format, document bytes)
+    """
+    blocks = classify_lines(text)
+    return [(name, get_renderer(name, template, docx_backend).render(blocks)) for name in formats]
+
+
+def _member_name(record_id, line_number: int, used: set) -> str:
+    """Archive name for a record: its id made filename-safe and unique."""
+    base = UNSAFE_NAME_PATTERN.sub('_', str(record_id)).strip('._') if record_id is not None else ''
+    base = base or f"line-{line_number}"
+    name = base
+    suffix = 2
+    while name in used:
+        name = f"{base}-{suffix}"
+        suffix += 1
+    used.add(name)
+    return name
+
+
+def render_batch(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    format: str = 'both',
+    workers: int = None,
+    template: str = None,
+    docx_backend: str = None,
+    progress: Callable[[Dict], None] = None
+) -> Dict:
+    """
+    Render every resume in a JSONL file into a ZIP archive.
+
+    Records are read lazily and at most a few per worker are in flight at
+    once; each finished document is written to the archive straight away
+    and released, so memory use does not grow with the batch size.
+    Documents are stored in input order as '<id>.docx' / '<id>.pdf'.
+    Records that cannot be rendered are skipped and listed in an
+    'errors.jsonl' member.
+
+    Templates registered at runtime reach the workers only if they were
+    registered before this is called (worker processes are forked).
+
+    Args:
+        input_path: JSONL file with one {"id", "text"} object per line
+        output_path: ZIP archive to write (overwritten)
+        format: 'pdf', 'docx', or 'both'
+        workers: Worker processes (defaults to config.BATCH_RENDER_WORKERS,
+            or the CPU count)
+        template: Registered template name (defaults to DEFAULT_TEMPLATE)
+        docx_backend: DOCX writer, 'python-docx' or 'ooxml' (defaults to
+            config.DOCX_BACKEND)
+        progress: Optional callback given the running stats after each record
+
+    Returns:
+        Dictionary with 'records', 'documents', 'failed', 'bytes',
+        'seconds', 'docs_per_second' and 'errors' ({'id', 'line', 'error'})
+    """
+    formats = tuple(name for name in RENDERERS if format in (name, 'both'))
+    if not formats:
+        raise ValueError(f"Unknown format: {format}")
+    workers = workers or config.BATCH_RENDER_WORKERS or os.cpu_count() or 1
+    max_in_flight = workers * config.BATCH_RENDER_IN_FLIGHT_PER_WORKER
+
+    stats = {'records': 0, 'documents': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0, 'docs_per_second': 0.0,
+             'errors': []}
+    used_names = set()
+    pending = deque()
+    started = time.perf_counter()
+
+    def fail(record_id, line_number: int, error: str) -> None:
+        stats['failed'] += 1
+        stats['errors'].append({'id': record_id, 'line': line_number, 'error': error})
+
+    def collect(archive: zipfile.ZipFile) -> None:
+        """Wait for the oldest record in flight and write its documents."""
+        record_id, line_number, future = pending.popleft()
+        try:
+            documents = future.result()
+        except Exception as e:
+            fail(record_id, line_number, str(e) or type(e).__name__)
+        else:
+            name = _member_name(record_id, line_number, used_names)
+            for extension, data in documents:
+                archive.writestr(f"{name}.{extension}", data)
+                stats['documents'] += 1
+                stats['bytes'] += len(data)
+        stats['records'] += 1
+        stats['seconds'] = time.perf_counter() - started
+        stats['docs_per_second'] = stats['documents'] / stats['seconds'] if stats['seconds'] else 0.0
+        if progress:
+            progress(stats)
+
+    # DOCX files are already deflated and reportlab compresses PDF streams,
+    # so members are stored rather than compressed a second time
+    with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        for line_number, record in read_records(input_path):
+            record_id = record.get('id')
+            text = record.get('text')
+            if 'error' in record or not isinstance(text, str) or not text.strip():
+                stats['records'] += 1
+                fail(record_id, line_number, record.get('error', "Missing or empty 'text'"))
+                continue
+
+            future = executor.submit(render_record, text, formats, template, docx_backend)
+            pending.append((record_id, line_number, future))
+            if len(pending) >= max_in_flight:
+                collect(archive)
+
+        while pending:
+            collect(archive)
+
+        if stats['errors']:
+            archive.writestr('errors.jsonl', ''.join(json.dumps(error) + '\n' for error in stats['errors']))
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['docs_per_second'] = stats['documents'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='JSONL file with one {"id", "text"} object per line')
+    parser.add_argument('output', help='ZIP archive to write')
+    parser.add_argument('--format', choices=('docx', 'pdf', 'both'), default='both')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--template', default=None, help='Registered template to render with')
+    parser.add_argument('--docx-backend', choices=sorted(DOCX_BACKENDS), default=None,
+                        help='DOCX writer (default: config.DOCX_BACKEND)')
+    args = parser.parse_args()
+
+    def report(stats: Dict) -> None:
+        if stats['records'] % 100 == 0:
+            print(f"{stats['records']} resumes, {stats['documents']} documents, "
+                  f"{stats['docs_per_second']:.1f} docs/s", file=sys.stderr)
+
+    stats = render_batch(args.input, args.output, format=args.format, workers=args.workers,
+                         template=args.template, docx_backend=args.docx_backend, progress=report)
+
+    for error in stats['errors']:
+        print(f"line {error['line']} (id {error['id']}): {error['error']}", file=sys.stderr)
+    print(f"Rendered {stats['documents']} documents from {stats['records']} resumes "
+          f"({stats['failed']} failed) in {stats['seconds']:.1f}s: {stats['docs_per_second']:.1f} docs/s, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB -> {args.output}")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Deadline Module
+Request-scoped time budget threaded through extraction, analysis, the LLM call
+and rendering, so a hung stage cannot hold a worker thread indefinitely.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import config
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage starts (or is cut off) after the deadline passed."""
+
+    def __init__(self, stage: str, partial: Optional[str] = None):
+        super().__init__(f"Deadline exceeded during {stage}")
+        self.stage = stage
+        self.partial = partial
+
+
+class Deadline:
+    """
+    Time budget for one request, shared by every stage that serves it.
+
+    Stages call check() before starting work; long blocking calls use
+    timeout_for() to cap their own timeouts, and watch() cancels an LLM call
+    (through its CancelToken) the moment the deadline passes.
+    """
+
+    def __init__(self, timeout: Optional[float]):
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.expires_at = None if timeout is None else self.started + timeout
+        self.stages: List[Dict] = []
+
+    @classmethod
+    def from_config(cls, timeout: Optional[float] = None) -> 'Deadline':
+        """Create a deadline using config.TAILORING_DEADLINE unless a timeout is given."""
+        return cls(config.TAILORING_DEADLINE if timeout is None else timeout)
+
+    def remaining(self) -> float:
+        """Seconds left (infinite if there is no deadline)."""
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def check(self, stage: str) -> None:
+        """Raise DeadlineExceeded if no time is left for stage."""
+        if self.expired:
+            raise DeadlineExceeded(stage)
+
+    def timeout_for(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        Timeout for a blocking call: the remaining time, capped at cap.
+
+        Returns:
+            Seconds, or None if neither a deadline nor a cap applies
+        """
+        remaining = self.remaining()
+        if cap is not None:
+            remaining = min(remaining, cap)
+        return None if remaining == math.inf else remaining
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Check the budget before a stage and record how long it took."""
+        self.check(name)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages.append({'stage': name, 'seconds': round(time.monotonic() - started, 3)})
+
+    @contextmanager
+    def watch(self, cancel_token) -> Iterator[None]:
+        """Cancel cancel_token when the deadline passes while the block runs."""
+        if self.expires_at is None:
+            yield
+            return
+
+        timer = threading.Timer(self.remaining(), cancel_token.cancel, args=('deadline exceeded',))
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        finally:
+            timer.cancel()
@@ -3,249 +3,692 @@ Document Generator Module
 Generates tailored resume in PDF and DOCX formats.
 """
 
+import hashlib
 import io
+import json
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, Dict
+from typing import Union, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from reportlab.lib.colors import HexColor
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 
+import config
+from .deadline import Deadline, DeadlineExceeded
 
-def generate_docx(resume_text: str, output_path: Union[str, Path] = None) -> Union[Document, bytes]:
+
+# Bump whenever rendering changes, so cached documents are not served stale
+TEMPLATE_VERSION = '2'
+
+# Lines containing one of these words are section headers
+SECTION_KEYWORDS = ('EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS', 'CERTIFICATIONS', 'SUMMARY', 'OBJECTIVE')
+
+BULLET_MARKERS = ('•', '-', '*')
+
+# The first line is taken as the candidate's name if it is shorter than this
+MAX_NAME_LENGTH = 50
+
+
+def classify_lines(resume_text: str) -> List[Tuple[str, str]]:
     """
-    Generate DOCX document from resume text.
+    Classify resume lines into the document model shared by the renderers.
 
     Args:
         resume_text: Tailored resume text
-        output_path: Optional path to save document
 
     Returns:
-        Document object or bytes if no output_path
+        List of (kind, text) blocks, kind being 'blank', 'name', 'header'
+        (text uppercased), 'bullet' (marker removed) or 'body'
     """
-    doc = Document()
-
-    # Set document margins
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.75)
-        section.right_margin = Inches(0.75)
-
-    # Parse resume text and add to document
-    lines = resume_text.split('\n')
+    blocks = []
 
-    for line in lines:
+    for i, line in enumerate(resume_text.split('\n')):
         line = line.strip()
 
         if not line:
-            # Add spacing for empty lines
-            doc.add_paragraph()
+            blocks.append(('blank', ''))
             continue
 
-        # Detect headers (all caps or specific keywords)
-        is_header = (
-            line.isupper() or
-            any(keyword in line.upper() for keyword in [
-                'EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS',
-                'CERTIFICATIONS', 'SUMMARY', 'OBJECTIVE'
-            ])
-        )
-
-        # Detect name (first line, typically)
-        is_name = len(doc.paragraphs) == 0 and len(line) < 50
-
-        # Detect bullet points
-        is_bullet = line.startswith('•') or line.startswith('-') or line.startswith('*')
-
-        if is_name:
-            # Format name
-            p = doc.add_paragraph(line)
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = p.runs[0]
-            run.font.size = Pt(18)
-            run.font.bold = True
-
-        elif is_header:
-            # Format section header
-            p = doc.add_paragraph(line.upper())
-            run = p.runs[0]
-            run.font.size = Pt(12)
-            run.font.bold = True
-            run.font.color.rgb = RGBColor(0, 0, 128)  # Dark blue
-
-        elif is_bullet:
-            # Format bullet point
+        upper = line.upper()
+        if i == 0 and len(line) < MAX_NAME_LENGTH:
+            # Name at top
+            blocks.append(('name', line))
+        elif line.isupper() or any(keyword in upper for keyword in SECTION_KEYWORDS):
+            blocks.append(('header', upper))
+        elif line.startswith(BULLET_MARKERS):
             # Remove existing bullet markers
-            clean_line = line.lstrip('•-* ').strip()
-            p = doc.add_paragraph(clean_line, style='List Bullet')
-            run = p.runs[0]
-            run.font.size = Pt(10)
-
+            blocks.append(('bullet', line.lstrip('•-* ').strip()))
         else:
-            # Regular paragraph
-            p = doc.add_paragraph(line)
-            run = p.runs[0]
-            run.font.size = Pt(10)
+            blocks.append(('body', line))
+
+    return blocks
+
+
+# Built-in resume theme. Styles are per block kind; 'pdf_parent' is the
+# reportlab sample style a PDF style inherits its font and leading from.
+CLASSIC_TEMPLATE = {
+    'name': 'classic',
+    'margins': {'top': 0.5, 'bottom': 0.5, 'left': 0.75, 'right': 0.75},  # Inches
+    'blank_space': 0.1,  # Inches of space for an empty line in PDFs
+    'styles': {
+        'name': {'font_size': 18, 'bold': True, 'color': '#000000', 'align': 'center', 'space_after': 12,
+                 'pdf_parent': 'Heading1'},
+        'header': {'font_size': 12, 'bold': True, 'color': '#000080', 'space_before': 12, 'space_after': 6,
+                   'pdf_parent': 'Heading2'},
+        'body': {'font_size': 10, 'space_after': 6, 'pdf_parent': 'Normal'},
+        'bullet': {'font_size': 10, 'left_indent': 20, 'bullet_indent': 10, 'space_after': 4,
+                   'pdf_parent': 'Normal', 'docx_base': 'List Bullet'}
+    }
+}
 
-    # Save or return bytes
-    if output_path:
-        doc.save(output_path)
-        return doc
-    else:
-        # Return as bytes
+DEFAULT_TEMPLATE = 'classic'
+
+TEMPLATES: Dict[str, Dict] = {}
+
+# Hash of each registered template's contents, part of the render cache key
+TEMPLATE_DIGESTS: Dict[str, str] = {}
+
+_renderers: Dict[Tuple[str, str, str], object] = {}
+_renderers_lock = threading.Lock()
+
+
+def register_template(template: Dict) -> None:
+    """
+    Register (or replace) a resume theme for every format.
+
+    A template has a 'name', 'margins' (top/bottom/left/right inches),
+    'blank_space' and 'styles' for the 'name', 'header', 'body' and
+    'bullet' block kinds (font_size, bold, color as '#rrggbb', align,
+    space_before/space_after and left_indent/bullet_indent in points).
+
+    Args:
+        template: Template dictionary
+    """
+    missing = {'name', 'header', 'body', 'bullet'} - set(template.get('styles', {}))
+    if missing:
+        raise ValueError(f"Template {template.get('name')}: no style for {', '.join(sorted(missing))}")
+    with _renderers_lock:
+        TEMPLATES[template['name']] = template
+        TEMPLATE_DIGESTS[template['name']] = hashlib.blake2b(
+            json.dumps(template, sort_keys=True).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        for key in [key for key in _renderers if key[1] == template['name']]:
+            del _renderers[key]
+
+
+register_template(CLASSIC_TEMPLATE)
+
+
+class DocxRenderer:
+    """
+    DOCX renderer for one template.
+
+    Margins and one paragraph style per block kind are set up once in a
+    package skeleton; each render opens the skeleton and only adds
+    paragraphs that reference those styles. The skeleton is stripped of the
+    default template's unused styles and optional parts, which otherwise
+    dominate the cost of opening and saving every document.
+    """
+
+    # Styles Word expects to exist even when nothing references them
+    REQUIRED_STYLES = ('Normal', 'DefaultParagraphFont', 'TableNormal', 'NoList')
+
+    # Optional parts of the default template (relationship type suffixes)
+    DROPPED_PARTS = ('stylesWithEffects', 'customXml', 'webSettings', 'thumbnail')
+
+    def __init__(self, template: Dict):
+        doc = Document()
+        margins = template['margins']
+        for section in doc.sections:
+            section.top_margin = Inches(margins['top'])
+            section.bottom_margin = Inches(margins['bottom'])
+            section.left_margin = Inches(margins['left'])
+            section.right_margin = Inches(margins['right'])
+
+        self.style_ids = {}
+        for kind, spec in template['styles'].items():
+            style = doc.styles.add_style(f"Resume {kind.title()}", WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = doc.styles[spec.get('docx_base', 'Normal')]
+            style.font.size = Pt(spec['font_size'])
+            if spec.get('bold'):
+                style.font.bold = True
+            if spec.get('color'):
+                style.font.color.rgb = RGBColor.from_string(spec['color'].lstrip('#').upper())
+            if spec.get('align') == 'center':
+                style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            self.style_ids[kind] = style.style_id
+        self._prune(doc)
+
+        skeleton = io.BytesIO()
+        doc.save(skeleton)
+        self._skeleton = skeleton.getvalue()
+
+    def _prune(self, doc: Document) -> None:
+        """Drop styles the renderer never uses (keeping their base styles) and optional parts."""
+        styles = doc.styles.element
+        by_id = {style.get(qn('w:styleId')): style for style in styles.findall(qn('w:style'))}
+        keep = set()
+        pending = list(self.REQUIRED_STYLES) + list(self.style_ids.values())
+        while pending:
+            style_id = pending.pop()
+            if style_id in keep or style_id not in by_id:
+                continue
+            keep.add(style_id)
+            for tag in ('w:basedOn', 'w:link', 'w:next'):
+                reference = by_id[style_id].find(qn(tag))
+                if reference is not None:
+                    pending.append(reference.get(qn('w:val')))
+
+        for style_id, style in by_id.items():
+            if style_id not in keep:
+                styles.remove(style)
+        latent = styles.find(qn('w:latentStyles'))
+        if latent is not None:
+            styles.remove(latent)
+
+        for rels in (doc.part.rels, doc.part.package.rels):
+            for rel in list(rels.values()):
+                if rel.reltype.endswith(self.DROPPED_PARTS):
+                    rels.pop(rel.rId)
+
+    def render(self, blocks: List[Tuple[str, str]], output_path: Union[str, Path] = None) -> Union[Document, bytes]:
+        """
+        Render classified resume blocks as a DOCX document.
+
+        Args:
+            blocks: Document model from classify_lines
+            output_path: Optional path to save document
+
+        Returns:
+            Document object or bytes if no output_path
+        """
+        doc = Document(io.BytesIO(self._skeleton))
+
+        for kind, text in blocks:
+            p = doc.add_paragraph(text)
+            if kind != 'blank':
+                # Set the style ID directly; looking styles up by name is slow
+                p._p.get_or_add_pPr().style = self.style_ids[kind]
+
+        # Save or return bytes
+        if output_path:
+            doc.save(output_path)
+            return doc
         bio = io.BytesIO()
         doc.save(bio)
-        bio.seek(0)
         return bio.getvalue()
 
 
-def generate_pdf(resume_text: str, output_path: Union[str, Path] = None) -> bytes:
+class OoxmlDocxRenderer(DocxRenderer):
     """
-    Generate PDF document from resume text.
+    DOCX renderer that writes word/document.xml directly.
+
+    The template is compiled into the same skeleton package as DocxRenderer;
+    its static parts are zipped once, and each render appends a
+    document.xml streamed from per-kind paragraph templates, without
+    building python-docx's object tree. The paragraphs are the ones
+    DocxRenderer produces, so both backends give the same document.
+    """
+
+    DOCUMENT_PART = 'word/document.xml'
+
+    # Characters XML 1.0 does not allow (python-docx raises on them; here they are dropped)
+    INVALID_XML_PATTERN = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+    # Run content python-docx turns into elements rather than text
+    RUN_BREAK_PATTERN = re.compile(r'(\t|\r)')
+
+    # Paragraphs written to the compressor at a time
+    FLUSH_EVERY = 256
+
+    def __init__(self, template: Dict):
+        super().__init__(template)
+
+        package = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(self._skeleton)) as skeleton, \
+                zipfile.ZipFile(package, 'w', compression=zipfile.ZIP_DEFLATED) as static:
+            for info in skeleton.infolist():
+                if info.filename == self.DOCUMENT_PART:
+                    self._date_time = info.date_time
+                    document = skeleton.read(info).decode('utf-8')
+                else:
+                    static.writestr(info, skeleton.read(info))
+        self._package = package.getvalue()
+
+        # Everything up to the body content, and the section properties that close it
+        body_start = document.index('<w:body>') + len('<w:body>')
+        body_end = document.rindex('<w:sectPr')
+        self._head = document[:body_start].encode('utf-8')
+        self._tail = document[body_end:].encode('utf-8')
+
+        self.paragraph_open = {
+            kind: f'<w:p><w:pPr><w:pStyle w:val="{escape(style_id)}"/></w:pPr>'
+            for kind, style_id in self.style_ids.items()
+        }
+
+    def _runs(self, text: str) -> str:
+        """Run XML for a line of text, as python-docx builds it."""
+        text = self.INVALID_XML_PATTERN.sub('', text)
+        if not text:
+            return ''
+        if '\t' not in text and '\r' not in text and text.strip() == text:
+            return f'<w:r><w:t>{escape(text)}</w:t></w:r>'
+
+        content = []
+        for piece in self.RUN_BREAK_PATTERN.split(text):
+            if piece == '\t':
+                content.append('<w:tab/>')
+            elif piece == '\r':
+                content.append('<w:br/>')
+            elif piece:
+                space = '' if piece.strip() == piece else ' xml:space="preserve"'
+                content.append(f'<w:t{space}>{escape(piece)}</w:t>')
+        return f"<w:r>{''.join(content)}</w:r>"
+
+    def render(self, blocks: List[Tuple[str, str]], output_path: Union[str, Path] = None) -> bytes:
+        """
+        Render classified resume blocks as a DOCX document.
+
+        Args:
+            blocks: Document model from classify_lines
+            output_path: Optional path to save document
+
+        Returns:
+            DOCX bytes (None if saved to output_path)
+        """
+        buffer = io.BytesIO(self._package)
+        info = zipfile.ZipInfo(self.DOCUMENT_PART, date_time=self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+
+        with zipfile.ZipFile(buffer, 'a') as package, package.open(info, 'w') as document:
+            document.write(self._head)
+            pending = []
+            for kind, text in blocks:
+                if kind == 'blank':
+                    pending.append('<w:p/>')
+                else:
+                    pending.append(f'{self.paragraph_open[kind]}{self._runs(text)}</w:p>')
+                if len(pending) >= self.FLUSH_EVERY:
+                    document.write(''.join(pending).encode('utf-8'))
+                    pending = []
+            document.write(''.join(pending).encode('utf-8'))
+            document.write(self._tail)
+
+        if output_path:
+            Path(output_path).write_bytes(buffer.getvalue())
+            return None
+        return buffer.getvalue()
+
+
+class PdfRenderer:
+    """
+    PDF renderer for one template.
+
+    Paragraph styles and page settings are compiled once; a render only
+    builds the story. The document template itself is bound to its output,
+    so it is still created per render.
+    """
+
+    # Template style keys -> ParagraphStyle attributes
+    STYLE_ATTRIBUTES = {
+        'font_size': 'fontSize',
+        'space_before': 'spaceBefore',
+        'space_after': 'spaceAfter',
+        'left_indent': 'leftIndent',
+        'bullet_indent': 'bulletIndent'
+    }
+
+    def __init__(self, template: Dict):
+        sample = getSampleStyleSheet()
+        self.styles = {}
+        for kind, spec in template['styles'].items():
+            attributes = {attribute: spec[key] for key, attribute in self.STYLE_ATTRIBUTES.items() if key in spec}
+            if spec.get('color'):
+                attributes['textColor'] = HexColor(spec['color'])
+            if spec.get('align') == 'center':
+                attributes['alignment'] = TA_CENTER
+            self.styles[kind] = ParagraphStyle(
+                name=f"{template['name']}-{kind}",
+                parent=sample[spec.get('pdf_parent', 'Normal')],
+                **attributes
+            )
+
+        margins = template['margins']
+        self.page = {
+            'pagesize': letter,
+            'rightMargin': margins['right'] * inch,
+            'leftMargin': margins['left'] * inch,
+            'topMargin': margins['top'] * inch,
+            'bottomMargin': margins['bottom'] * inch
+        }
+        self.blank_space = template['blank_space'] * inch
+
+    def render(self, blocks: List[Tuple[str, str]], output_path: Union[str, Path] = None) -> bytes:
+        """
+        Render classified resume blocks as a PDF document.
+
+        Args:
+            blocks: Document model from classify_lines
+            output_path: Optional path to save document
+
+        Returns:
+            PDF bytes (None if saved to output_path)
+        """
+        buffer = str(output_path) if output_path else io.BytesIO()
+        doc = SimpleDocTemplate(buffer, **self.page)
+
+        story = []
+        for kind, text in blocks:
+            if kind == 'blank':
+                story.append(Spacer(1, self.blank_space))
+            elif kind == 'bullet':
+                story.append(Paragraph(f"• {text}", self.styles['bullet']))
+            else:
+                story.append(Paragraph(text, self.styles[kind]))
+
+        doc.build(story)
+
+        if not output_path:
+            return buffer.getvalue()
+        return None
+
+
+# Renderer class per output format, all consuming the classify_lines model
+RENDERERS = {
+    'docx': DocxRenderer,
+    'pdf': PdfRenderer
+}
+
+# Interchangeable DOCX writers (config.DOCX_BACKEND picks the default)
+DOCX_BACKENDS = {
+    'python-docx': DocxRenderer,
+    'ooxml': OoxmlDocxRenderer
+}
+
+
+def get_renderer(format: str, template: str = None, docx_backend: str = None):
+    """
+    Get the process-wide renderer for a format and template, compiling it on first use.
+
+    Args:
+        format: 'docx' or 'pdf'
+        template: Registered template name (defaults to DEFAULT_TEMPLATE)
+        docx_backend: DOCX_BACKENDS entry for DOCX (defaults to config.DOCX_BACKEND)
+
+    Returns:
+        Renderer with a render(blocks, output_path=None) method
+    """
+    renderer_class = RENDERERS[format]
+    if format == 'docx':
+        renderer_class = DOCX_BACKENDS[docx_backend or config.DOCX_BACKEND]
+
+    key = (format, template or DEFAULT_TEMPLATE, renderer_class.__name__)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(key)
+            if renderer is None:
+                renderer = _renderers[key] = renderer_class(TEMPLATES[key[1]])
+    return renderer
+
+
+def render_docx(blocks: List[Tuple[str, str]], output_path: Union[str, Path] = None,
+                template: str = None) -> Union[Document, bytes]:
+    """Render classified resume blocks as DOCX with a registered template, using config.DOCX_BACKEND."""
+    return get_renderer('docx', template).render(blocks, output_path)
+
+
+def render_pdf(blocks: List[Tuple[str, str]], output_path: Union[str, Path] = None, template: str = None) -> bytes:
+    """Render classified resume blocks as PDF with a registered template (see PdfRenderer.render)."""
+    return get_renderer('pdf', template).render(blocks, output_path)
+
+
+def generate_docx(resume_text: str, output_path: Union[str, Path] = None) -> Union[Document, bytes]:
+    """
+    Generate DOCX document from resume text.
 
     Args:
         resume_text: Tailored resume text
         output_path: Optional path to save document
 
     Returns:
-        PDF bytes
+        Bytes if no output_path; otherwise the Document object (None with
+        the 'ooxml' backend)
     """
-    # Create buffer or file
-    if output_path:
-        buffer = str(output_path)
-    else:
-        buffer = io.BytesIO()
-
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        rightMargin=0.75 * inch,
-        leftMargin=0.75 * inch,
-        topMargin=0.5 * inch,
-        bottomMargin=0.5 * inch
-    )
-
-    # Styles
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    styles.add(ParagraphStyle(
-        name='CustomName',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor='black',
-        alignment=TA_CENTER,
-        spaceAfter=12
-    ))
-
-    styles.add(ParagraphStyle(
-        name='CustomHeader',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor='darkblue',
-        bold=True,
-        spaceAfter=6,
-        spaceBefore=12
-    ))
-
-    styles.add(ParagraphStyle(
-        name='CustomBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6
-    ))
-
-    styles.add(ParagraphStyle(
-        name='CustomBullet',
-        parent=styles['Normal'],
-        fontSize=10,
-        leftIndent=20,
-        bulletIndent=10,
-        spaceAfter=4
-    ))
-
-    # Build document content
-    story = []
-    lines = resume_text.split('\n')
-
-    for i, line in enumerate(lines):
-        line = line.strip()
+    return render_docx(classify_lines(resume_text), output_path)
 
-        if not line:
-            story.append(Spacer(1, 0.1 * inch))
-            continue
 
-        # Detect different sections
-        is_header = (
-            line.isupper() or
-            any(keyword in line.upper() for keyword in [
-                'EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS',
-                'CERTIFICATIONS', 'SUMMARY', 'OBJECTIVE'
-            ])
-        )
+def generate_pdf(resume_text: str, output_path: Union[str, Path] = None) -> bytes:
+    """
+    Generate PDF document from resume text.
 
-        is_name = i == 0 and len(line) < 50
+    Args:
+        resume_text: Tailored resume text
+        output_path: Optional path to save document
 
-        is_bullet = line.startswith('•') or line.startswith('-') or line.startswith('*')
+    Returns:
+        PDF bytes
+    """
+    return render_pdf(classify_lines(resume_text), output_path)
 
-        if is_name:
-            # Name at top
-            p = Paragraph(line, styles['CustomName'])
-            story.append(p)
 
-        elif is_header:
-            # Section header
-            p = Paragraph(line.upper(), styles['CustomHeader'])
-            story.append(p)
+class RenderCache:
+    """
+    Rendered documents keyed by a hash of the text, format and template version.
 
-        elif is_bullet:
-            # Bullet point
-            clean_line = line.lstrip('•-* ').strip()
-            bullet_text = f"• {clean_line}"
-            p = Paragraph(bullet_text, styles['CustomBullet'])
-            story.append(p)
+    A memory LRU bounded by total bytes sits in front of an optional disk
+    tier (one file per document, oldest evicted past its byte bound). Disk
+    hits are promoted to memory.
+    """
 
-        else:
-            # Regular text
-            p = Paragraph(line, styles['CustomBody'])
-            story.append(p)
+    def __init__(self, max_bytes: int = None, directory: Union[str, Path] = None, disk_max_bytes: int = None):
+        self.max_bytes = config.RENDER_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.directory = Path(directory) if directory else None
+        self.disk_max_bytes = config.RENDER_CACHE_DISK_MAX_BYTES if disk_max_bytes is None else disk_max_bytes
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._bytes = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._disk_bytes = None  # Estimate, recounted whenever it exceeds the bound
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(resume_text: str, format: str, template: str = None, docx_backend: str = None) -> str:
+        """
+        Cache key of a document: hash of the template version, name and
+        contents, format (with the DOCX writer for DOCX) and text.
+
+        A template re-registered with different styles, or a switch of
+        config.DOCX_BACKEND, gets new keys, so documents from the old
+        layout or writer are not served.
+        """
+        template = template or DEFAULT_TEMPLATE
+        writer = (docx_backend or config.DOCX_BACKEND) if format == 'docx' else ''
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{TEMPLATE_VERSION}\0{template}\0{TEMPLATE_DIGESTS.get(template, '')}\0"
+                      f"{format}\0{writer}\0".encode('utf-8'))
+        digest.update(resume_text.encode('utf-8'))
+        return f"{digest.hexdigest()}.{format}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached document bytes, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return data
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # Mark as recently used for disk eviction
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+                self._remember(key, data)
+                return data
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store a rendered document in memory and, if enabled, on disk."""
+        self._remember(key, data)
+        if self.directory:
+            path = self._path(key)
+            try:
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            except OSError:
+                return  # The disk tier is best effort
+            with self._lock:
+                if self._disk_bytes is not None:
+                    self._disk_bytes += len(data)
+                over = self._disk_bytes is None or self._disk_bytes > self.disk_max_bytes
+            if over:
+                self._evict_disk()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def _evict_disk(self) -> None:
+        """Recount the disk tier and delete least recently used files until it fits its bound."""
+        files = []
+        total = 0
+        for path in self.directory.glob('*/*'):
+            if path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total > self.disk_max_bytes:
+            for _, size, path in sorted(files):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.disk_max_bytes:
+                    break
+        with self._lock:
+            self._disk_bytes = total
+
+    def snapshot(self) -> Dict:
+        """Hit/miss counters and the memory tier's size."""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
+
+
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Get the process-wide render cache (disk tier in config.RENDER_CACHE_DIR, if set)."""
+    global _render_cache
+
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache(directory=config.RENDER_CACHE_DIR)
+
+    return _render_cache
+
+
+def render_document(resume_text: str, format: str, deadline: Deadline = None, template: str = None) -> bytes:
+    """
+    Rendered document bytes for one format, from the render cache if possible.
 
-    # Build PDF
-    doc.build(story)
+    Meant for lazy downloads: nothing is rendered until this is called, and
+    the same text is never rendered twice.
 
-    # Return bytes if no output path
-    if not output_path:
-        buffer.seek(0)
-        return buffer.getvalue()
+    Args:
+        resume_text: Tailored resume text
+        format: 'pdf' or 'docx'
+        deadline: Optional deadline, checked before rendering
+        template: Registered template name (defaults to DEFAULT_TEMPLATE)
 
-    return None
+    Returns:
+        Document bytes
+    """
+    result = generate_resume_document(resume_text, format=format, deadline=deadline, template=template)
+    if not result['success']:
+        if result.get('status') == 'deadline_exceeded':
+            raise DeadlineExceeded(f'render {format}')
+        raise RuntimeError(result.get('error', 'Rendering failed'))
+    return result[f'{format}_bytes']
 
 
 def generate_resume_document(
     resume_text: str,
     format: str = 'both',
     output_dir: Union[str, Path] = None,
-    filename_base: str = 'tailored_resume'
+    filename_base: str = 'tailored_resume',
+    deadline: Deadline = None,
+    template: str = None
 ) -> Dict:
     """
     Generate resume document in specified format(s).
 
+    Documents are served from the render cache when the same text was
+    rendered before. Otherwise the text is classified once and, with format
+    'both', the DOCX and PDF renderers run concurrently on the same
+    document model.
+
     Args:
         resume_text: Tailored resume text
         format: 'pdf', 'docx', or 'both'
         output_dir: Directory to save files (if None, returns bytes)
         filename_base: Base filename without extension
+        deadline: Optional deadline, checked before each format; formats
+            rendered before it passed are still returned
+        template: Registered template name (defaults to DEFAULT_TEMPLATE)
 
     Returns:
         Dictionary with file paths or bytes
     """
+    if deadline is None:
+        deadline = Deadline(None)
+
     result = {
         'success': True,
         'formats': []
@@ -255,25 +698,57 @@ def generate_resume_document(
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True, parents=True)
 
+    formats = [name for name in RENDERERS if format in (name, 'both')]
+    cache = get_render_cache()
+    blocks = None
+
+    def render(name: str) -> Tuple[str, bytes, Exception]:
+        """Render one format; failures are returned so other formats are still collected."""
+        try:
+            deadline.check(f'render {name}')
+            data = get_renderer(name, template).render(blocks)
+            cache.put(cache.key(resume_text, name, template), data)
+            return name, data, None
+        except Exception as e:
+            return name, None, e
+
     try:
-        if format in ['docx', 'both']:
-            if output_dir:
-                docx_path = output_dir / f"{filename_base}.docx"
-                generate_docx(resume_text, docx_path)
-                result['docx_path'] = str(docx_path)
+        rendered = {name: cache.get(cache.key(resume_text, name, template)) for name in formats}
+        missing = [name for name in formats if rendered[name] is None]
+
+        outcomes = []
+        if missing:
+            blocks = classify_lines(resume_text)
+            if len(missing) > 1:
+                with ThreadPoolExecutor(max_workers=len(missing), thread_name_prefix='render') as executor:
+                    outcomes = list(executor.map(render, missing))
             else:
-                result['docx_bytes'] = generate_docx(resume_text)
-            result['formats'].append('docx')
-
-        if format in ['pdf', 'both']:
+                outcomes = [render(missing[0])]
+
+        errors = []
+        for name, data, error in outcomes:
+            if error is not None:
+                errors.append(error)
+            rendered[name] = data
+
+        for name in formats:
+            data = rendered[name]
+            if data is None:
+                continue
             if output_dir:
-                pdf_path = output_dir / f"{filename_base}.pdf"
-                generate_pdf(resume_text, pdf_path)
-                result['pdf_path'] = str(pdf_path)
+                path = output_dir / f"{filename_base}.{name}"
+                path.write_bytes(data)
+                result[f'{name}_path'] = str(path)
             else:
-                result['pdf_bytes'] = generate_pdf(resume_text)
-            result['formats'].append('pdf')
+                result[f'{name}_bytes'] = data
+            result['formats'].append(name)
+        if errors:
+            raise errors[0]
 
+    except DeadlineExceeded as e:
+        result['success'] = False
+        result['status'] = 'deadline_exceeded'
+        result['error'] = str(e)
     except Exception as e:
         result['success'] = False
         result['error'] = str(e)
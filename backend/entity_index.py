@@ -0,0 +1,261 @@
+"""
+Entity Index Module
+Extracts the employers, job titles and date ranges from a resume's role
+headers once, into hashed lookups that tailored output is checked against.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from .resume_sections import DATE_RANGE_PATTERN, segment_resume
+
+
+# Separators between the fields of a role header ("Company — Title | Dates")
+FIELD_SEPARATOR_PATTERN = re.compile(r'\s+[-–—|]\s+|\s*[|•·]\s*|,\s+|\t+')
+
+# "Title at Company" headers name the title first
+TITLE_AT_COMPANY_PATTERN = re.compile(r'^(?P<title>.+?)\s+(?:at|@)\s+(?P<company>.+)$', re.IGNORECASE)
+
+# Header fields that are employment types rather than employers or titles
+NON_ENTITY_PATTERN = re.compile(r'^(?:remote|hybrid|on-?site|contract|full[- ]time|part[- ]time)$', re.IGNORECASE)
+
+# State or country closing a "City, ST" location ("New York, NY", "Pune, India")
+REGION_PATTERN = re.compile(r'^(?:[A-Z]{2}|USA|U\.S\.A?\.?|United States|United Kingdom|India|Canada|Australia|'
+                            r'Germany|Singapore)$')
+
+# Words that mark a header field as a job title rather than an employer
+TITLE_WORD_PATTERN = re.compile(r'\b(?:engineer|developer|programmer|architect|analyst|scientist|consultant|manager|'
+                                r'director|lead|head|intern|trainee|specialist|administrator|designer|associate|'
+                                r'officer|coordinator|tester|vp|president)s?\b', re.IGNORECASE)
+
+
+def entity_key(text: str) -> str:
+    """Normalize an entity for lookup: lowercase, punctuation and spacing collapsed."""
+    return ' '.join(re.sub(r'[^\w&+#]+', ' ', text.lower()).split())
+
+
+def date_key(text: str) -> str:
+    """Normalize a date range for lookup ('Jan 2020 – Present' -> 'jan 2020 - present')."""
+    return ' '.join(re.sub(r'\s*(?:-|–|—|to|until)\s*', ' - ', text.lower(), count=1).split())
+
+
+def _line_fields(line: str) -> List[str]:
+    """Fields of one header line, without locations and employment types."""
+    fields = []
+    for position, field in enumerate(FIELD_SEPARATOR_PATTERN.split(line)):
+        field = field.strip(' \t()[]:;-–—')
+        if not field or NON_ENTITY_PATTERN.match(field):
+            continue
+        if REGION_PATTERN.match(field):
+            # "Acme Corp, New York, NY": the field before the region is the
+            # city, unless it opens the line ("Acme Corp, NY")
+            if fields and fields[-1][0] > 0:
+                fields.pop()
+            continue
+        fields.append((position, field))
+    return [field for _, field in fields]
+
+
+def parse_role_header(header_lines: List[str]) -> Dict:
+    """
+    Split a role's header lines into company, title and date range.
+
+    The date range is taken out first; the remaining fields are split on the
+    usual separators (dash, pipe, comma) and "City, ST" locations are
+    dropped. A field naming a role ("Engineer", "Manager", ...) is the
+    title and the first other field the company; without such a word the
+    first field is the company and the second the title, except in
+    'Title at Company' headers.
+
+    Args:
+        header_lines: Non-blank header lines of a role
+
+    Returns:
+        Dictionary with 'company', 'title', 'dates' (None when absent) and
+        'fields' (every employer/title field in header order)
+    """
+    dates = None
+    fields = []
+    for line in header_lines:
+        match = DATE_RANGE_PATTERN.search(line)
+        if match and dates is None:
+            dates = match.group(0)
+            line = line[:match.start()] + ' | ' + line[match.end():]
+        fields.extend(_line_fields(line))
+
+    if len(fields) == 1:
+        match = TITLE_AT_COMPANY_PATTERN.match(fields[0])
+        if match:
+            fields = [match.group('company'), match.group('title')]
+
+    title_at = next((i for i, field in enumerate(fields) if TITLE_WORD_PATTERN.search(field)), None)
+    if title_at is None and len(fields) > 1:
+        title_at = 1
+    others = [field for i, field in enumerate(fields) if i != title_at]
+    title = fields[title_at] if title_at is not None else None
+    company = others[0] if others else None
+
+    return {'company': company, 'title': title, 'dates': dates, 'fields': fields}
+
+
+def _role_entities(resume_text: str) -> List[Dict]:
+    """Parsed headers of every role in a resume, with their lookup keys."""
+    entities = []
+    for role in segment_resume(resume_text)['roles']:
+        parsed = parse_role_header(role['header_lines'])
+        if not role['bullets'] and parsed['dates'] is None:
+            # A stray line (e.g. a placeholder) rather than a role
+            continue
+        parsed['field_keys'] = {entity_key(field): field for field in parsed['fields']}
+        parsed['dates_key'] = date_key(parsed['dates']) if parsed['dates'] else None
+        parsed['signature'] = (frozenset(parsed['field_keys']), parsed['dates_key'])
+        entities.append(parsed)
+    return entities
+
+
+@lru_cache(maxsize=32)
+def build_entity_index(resume_text: str) -> Dict:
+    """
+    Index the employers, titles and date ranges of a resume's roles.
+
+    Built once per resume text and cached; the returned index must not be
+    modified.
+
+    Args:
+        resume_text: Original resume text
+
+    Returns:
+        Dictionary with 'roles' (parsed headers in order), 'companies',
+        'titles', 'fields' (every header field) and 'dates' (key -> display
+        text), and 'roles_by_signature' (header fields and dates -> role
+        positions)
+    """
+    roles = _role_entities(resume_text)
+    index = {
+        'roles': roles,
+        'companies': {},
+        'titles': {},
+        'fields': {},
+        'dates': {},
+        'roles_by_signature': {}
+    }
+    for position, role in enumerate(roles):
+        if role['company']:
+            index['companies'].setdefault(entity_key(role['company']), role['company'])
+        if role['title']:
+            index['titles'].setdefault(entity_key(role['title']), role['title'])
+        for key, field in role['field_keys'].items():
+            index['fields'].setdefault(key, field)
+        if role['dates_key']:
+            index['dates'].setdefault(role['dates_key'], role['dates'])
+        index['roles_by_signature'].setdefault(role['signature'], []).append(position)
+    return index
+
+
+def extract_entities(resume_text: str) -> Dict[str, List[str]]:
+    """
+    List the employers, titles and date ranges in a resume.
+
+    Args:
+        resume_text: Resume text
+
+    Returns:
+        Dictionary with 'companies', 'titles' and 'dates' (in resume order)
+    """
+    index = build_entity_index(resume_text)
+    return {
+        'companies': list(index['companies'].values()),
+        'titles': list(index['titles'].values()),
+        'dates': list(index['dates'].values())
+    }
+
+
+def _describe(role: Dict) -> str:
+    return ' | '.join(role['fields'] + ([role['dates']] if role['dates'] else []))
+
+
+def check_entities(original_text: str, tailored_text: str) -> Dict:
+    """
+    Check the tailored resume's role headers against the original's entities.
+
+    Header fields are compared as a set rather than by position, so a
+    header that lists the title before the employer, or adds a location,
+    is not mistaken for a changed employer. Each tailored role whose fields
+    and dates match an original role exactly is paired with it by a hash
+    lookup. Every other tailored role is paired with an unmatched original
+    role, one with the same dates first and otherwise the next in order,
+    and the header fields and dates that differ are reported. Original
+    roles left unpaired were dropped, and tailored roles left unpaired were
+    invented or duplicated.
+
+    Args:
+        original_text: Original resume text
+        tailored_text: Tailored resume text
+
+    Returns:
+        Dictionary with 'consistent' and 'mismatches', each with 'kind'
+        ('unknown_field', 'moved_field', 'missing_field', 'unknown_dates', 'altered_dates',
+        'missing_dates', 'extra_role' or 'missing_role'), 'severity' and
+        'message'
+    """
+    index = build_entity_index(original_text)
+    originals = index['roles']
+    unmatched_originals = dict.fromkeys(range(len(originals)))
+    by_signature = {signature: list(positions) for signature, positions in index['roles_by_signature'].items()}
+    mismatches = []
+
+    def mismatch(kind: str, severity: str, message: str) -> None:
+        mismatches.append({'kind': kind, 'severity': severity, 'message': message})
+
+    unmatched = []
+    for role in _role_entities(tailored_text):
+        positions = by_signature.get(role['signature'])
+        if positions:
+            del unmatched_originals[positions.pop(0)]
+        else:
+            unmatched.append(role)
+
+    for role in unmatched:
+        position = next((position for position in unmatched_originals
+                         if role['dates_key'] and originals[position]['dates_key'] == role['dates_key']),
+                        next(iter(unmatched_originals), None))
+        if position is None:
+            mismatch('extra_role', 'critical', f"Role not in the original resume: {_describe(role)}")
+            continue
+        del unmatched_originals[position]
+        original = originals[position]
+
+        # A field swapped for another is one change, reported once
+        missing = [field for key, field in original['field_keys'].items() if key not in role['field_keys']]
+        for key, field in role['field_keys'].items():
+            if key in original['field_keys']:
+                continue
+            replaces = f" in place of {missing.pop(0)}" if missing else ''
+            if key in index['fields']:
+                mismatch('moved_field', 'critical', f"Header field belongs to a different role in the original: "
+                                                    f"{field}{replaces} (in {_describe(role)})")
+            else:
+                mismatch('unknown_field', 'critical', f"Header field not in the original resume: {field}{replaces} "
+                                                      f"(in {_describe(role)})")
+        for field in missing:
+            mismatch('missing_field', 'high', f"Header field missing from the tailored resume: {field} "
+                                              f"(was {_describe(original)})")
+
+        if role['dates_key'] == original['dates_key']:
+            continue
+        if role['dates_key'] is None:
+            mismatch('missing_dates', 'high', f"Dates missing from the tailored resume: {_describe(original)}")
+        elif role['dates_key'] not in index['dates']:
+            mismatch('unknown_dates', 'critical', f"Dates not in the original resume: {_describe(role)}")
+        else:
+            mismatch('altered_dates', 'critical', f"Dates belong to a different role in the original: "
+                                                  f"{_describe(role)}")
+
+    for position in unmatched_originals:
+        mismatch('missing_role', 'critical', f"Role missing from the tailored resume: {_describe(originals[position])}")
+
+    return {
+        'consistent': not mismatches,
+        'mismatches': mismatches
+    }
@@ -11,26 +11,37 @@ import pdfplumber
 import fitz  # PyMuPDF
 from docx import Document
 
+from .deadline import Deadline, DeadlineExceeded
 
-def extract_text_from_pdf(file_path: Union[str, Path]) -> str:
+
+def extract_text_from_pdf(file_path: Union[str, Path], deadline: Deadline = None) -> str:
     """
     Extract text from PDF file using multiple methods for better accuracy.
 
     Args:
         file_path: Path to the PDF file
+        deadline: Optional deadline, checked before every page
 
     Returns:
         Extracted text as string
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during extraction
     """
     text = ""
+    if deadline is None:
+        deadline = Deadline(None)
 
     # Method 1: Try pdfplumber first (best for formatted resumes)
     try:
         with pdfplumber.open(file_path) as pdf:
             for page in pdf.pages:
+                deadline.check('extraction')
                 page_text = page.extract_text()
                 if page_text:
                     text += page_text + "\n"
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         print(f"pdfplumber extraction failed: {e}")
 
@@ -40,8 +51,11 @@ def extract_text_from_pdf(file_path: Union[str, Path]) -> str:
             doc = fitz.open(file_path)
             text = ""
             for page in doc:
+                deadline.check('extraction')
                 text += page.get_text() + "\n"
             doc.close()
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"PyMuPDF extraction failed: {e}")
 
@@ -52,7 +66,10 @@ def extract_text_from_pdf(file_path: Union[str, Path]) -> str:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text = ""
                 for page in pdf_reader.pages:
+                    deadline.check('extraction')
                     text += page.extract_text() + "\n"
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"PyPDF2 extraction failed: {e}")
 
@@ -109,12 +126,13 @@ def extract_text_from_txt(file_path: Union[str, Path]) -> str:
             return file.read()
 
 
-def extract_text_from_uploaded_file(uploaded_file) -> str:
+def extract_text_from_uploaded_file(uploaded_file, deadline: Deadline = None) -> str:
     """
     Extract text from Streamlit uploaded file object.
 
     Args:
         uploaded_file: Streamlit UploadedFile object
+        deadline: Optional deadline (applies to PDF extraction, the only slow format)
 
     Returns:
         Extracted text as string
@@ -126,9 +144,10 @@ def extract_text_from_uploaded_file(uploaded_file) -> str:
         temp_path = Path(f"/tmp/{uploaded_file.name}")
         with open(temp_path, 'wb') as f:
             f.write(uploaded_file.getbuffer())
-        text = extract_text_from_pdf(temp_path)
-        temp_path.unlink()  # Delete temp file
-        return text
+        try:
+            return extract_text_from_pdf(temp_path, deadline)
+        finally:
+            temp_path.unlink()  # Delete temp file
 
     elif file_extension == 'docx':
         # Process DOCX from bytes
@@ -151,12 +170,13 @@ def extract_text_from_uploaded_file(uploaded_file) -> str:
         raise ValueError(f"Unsupported file format: {file_extension}")
 
 
-def extract_text_from_file(file_path: Union[str, Path]) -> str:
+def extract_text_from_file(file_path: Union[str, Path], deadline: Deadline = None) -> str:
     """
     Main function to extract text from any supported file format.
 
     Args:
         file_path: Path to the file
+        deadline: Optional deadline (applies to PDF extraction)
 
     Returns:
         Extracted text as string
@@ -165,7 +185,7 @@ def extract_text_from_file(file_path: Union[str, Path]) -> str:
     file_extension = file_path.suffix.lower()
 
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, deadline)
     elif file_extension == '.docx':
         return extract_text_from_docx(file_path)
     elif file_extension == '.txt':
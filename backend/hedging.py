@@ -0,0 +1,190 @@
+"""
+Hedging Module
+Tracks observed LLM latency per model and runs hedged requests: if the primary
+model is slow to produce its first token, the same request is fired at a
+fallback model and the first valid result wins.
+"""
+
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Optional
+
+import config
+from .llm_client import CancelToken
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of first-token and total latencies per model."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._first_token = defaultdict(lambda: deque(maxlen=window))
+        self._total = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, model: str, first_token_latency: Optional[float], total_latency: Optional[float]) -> None:
+        """Record one completed call."""
+        with self._lock:
+            if first_token_latency is not None:
+                self._first_token[model].append(first_token_latency)
+            if total_latency is not None:
+                self._total[model].append(total_latency)
+
+    def sample_count(self, model: str) -> int:
+        with self._lock:
+            return len(self._first_token[model])
+
+    def percentile(self, model: str, pct: float, kind: str = 'first_token') -> Optional[float]:
+        """
+        Get a latency percentile for a model.
+
+        Args:
+            model: Model ID
+            pct: Percentile in [0, 100]
+            kind: 'first_token' or 'total'
+
+        Returns:
+            Latency in seconds, or None if no samples were recorded
+        """
+        source = self._first_token if kind == 'first_token' else self._total
+        with self._lock:
+            samples = sorted(source[model])
+
+        if not samples:
+            return None
+
+        index = min(len(samples) - 1, max(0, int(round(pct / 100.0 * (len(samples) - 1)))))
+        return samples[index]
+
+
+# Process-wide tracker shared by all tailoring calls
+latency_tracker = LatencyTracker()
+
+
+def hedge_delay(model: str) -> float:
+    """
+    Seconds to wait for the primary's first token before hedging.
+
+    Uses config.HEDGE_LATENCY_PERCENTILE of the observed first-token latency
+    once enough samples exist, otherwise config.HEDGE_DEFAULT_DELAY.
+    """
+    if latency_tracker.sample_count(model) < config.HEDGE_MIN_SAMPLES:
+        return config.HEDGE_DEFAULT_DELAY
+
+    return latency_tracker.percentile(model, config.HEDGE_LATENCY_PERCENTILE)
+
+
+def choose_fallback_model(primary_model: str) -> Optional[str]:
+    """
+    Pick the fallback model for a hedged request.
+
+    Prefers the configured fallback; if that is the primary itself, picks
+    the alternative model with the lowest observed median first-token latency.
+
+    Returns:
+        Model ID, or None if no other model is available
+    """
+    if config.HEDGE_FALLBACK_MODEL and config.HEDGE_FALLBACK_MODEL != primary_model:
+        return config.HEDGE_FALLBACK_MODEL
+
+    candidates = [model_id for model_id in config.MODEL_IDS if model_id != primary_model]
+    if not candidates:
+        return None
+
+    def median_latency(model_id: str) -> float:
+        median = latency_tracker.percentile(model_id, 50)
+        return median if median is not None else float('inf')
+
+    return min(candidates, key=median_latency)
+
+
+def _attempt_result(future, model: str, timeout: float = None) -> Dict:
+    """Get an attempt's result, converting errors into a failed result."""
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        raise
+    except Exception as e:
+        return {'success': False, 'model': model, 'error': str(e)}
+
+
+def run_hedged(
+    call: Callable[[str, CancelToken, threading.Event], Dict],
+    primary_model: str,
+    fallback_model: str,
+    delay: float,
+    is_valid: Callable[[Dict], bool]
+) -> Dict:
+    """
+    Run a request against the primary model, hedging to a fallback if slow.
+
+    `call(model, cancel_token, first_token_event)` must perform one complete
+    LLM call, set first_token_event when the first token arrives, stop early
+    when cancel_token is cancelled, and return a dict with at least
+    'success'. Whichever call first returns a result accepted by is_valid
+    wins; the other is cancelled. If neither is valid, the primary's result
+    is preferred. A loser that does not stop within config.HEDGE_CANCEL_GRACE
+    is abandoned and reported without usage.
+
+    Returns:
+        Dictionary with 'winner' (the chosen attempt result or None),
+        'attempts' (every attempt result, including cancelled ones) and
+        'hedged' (whether the fallback was fired)
+    """
+    tokens = {primary_model: CancelToken()}
+    first_token = threading.Event()
+
+    # Not used as a context manager: a cancelled loser that is still waiting
+    # for response headers must not hold up the winner.
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='hedge')
+    try:
+        futures = {executor.submit(call, primary_model, tokens[primary_model], first_token): primary_model}
+
+        hedged = False
+        done, _ = wait(futures, timeout=delay)
+        if not done and not first_token.is_set() and fallback_model:
+            hedged = True
+            tokens[fallback_model] = CancelToken()
+            futures[executor.submit(call, fallback_model, tokens[fallback_model], threading.Event())] = fallback_model
+
+        results: Dict[str, Dict] = {}
+        winner = None
+        pending = set(futures)
+
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                model = futures[future]
+                results[model] = _attempt_result(future, model)
+                if winner is None and results[model].get('success') and is_valid(results[model]):
+                    winner = model
+
+        if winner is not None:
+            for model, token in tokens.items():
+                if model != winner:
+                    token.cancel('lost hedge')
+
+        # Give the cancelled loser a moment to report its partial usage
+        for future in pending:
+            model = futures[future]
+            try:
+                results[model] = _attempt_result(future, model, timeout=config.HEDGE_CANCEL_GRACE)
+            except FuturesTimeoutError:
+                results[model] = {'success': False, 'model': model, 'cancelled': True,
+                                  'cancel_reason': 'lost hedge'}
+    finally:
+        executor.shutdown(wait=False)
+
+    if winner is None:
+        for model in (primary_model, fallback_model):
+            if model in results and results[model].get('success'):
+                winner = model
+                break
+
+    attempts: List[Dict] = [results[futures[future]] for future in futures]
+    return {
+        'winner': results.get(winner) if winner else None,
+        'attempts': attempts,
+        'hedged': hedged
+    }
@@ -0,0 +1,236 @@
+"""
+JD Similarity Module
+Near-duplicate job description detection with MinHash signatures and an
+on-disk LSH index, used to reuse prior tailorings of the same resume against
+reposted job descriptions.
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import config
+from .resume_analyzer import clean_text, strip_jd_boilerplate
+
+
+# Mersenne prime used for the universal hash permutations
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: signatures must stay comparable across processes and restarts
+_rng = random.Random(0x4A44)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(config.MINHASH_PERMUTATIONS)
+]
+
+ROWS_PER_BAND = config.MINHASH_PERMUTATIONS // config.LSH_BANDS
+
+
+def normalize_jd(jd_text: str) -> str:
+    """Normalize a job description (boilerplate and location lines removed)."""
+    return clean_text(strip_jd_boilerplate(jd_text))
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Get word shingles (n-grams) of normalized text."""
+    words = text.split()
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+@lru_cache(maxsize=32)
+def jd_signature(jd_text: str) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a job description.
+
+    Cached, since the same JD is looked up before tailoring and stored after.
+
+    Args:
+        jd_text: Job description text
+
+    Returns:
+        Tuple of config.MINHASH_PERMUTATIONS minimum hash values
+    """
+    hashes = [_hash64(shingle) for shingle in shingles(normalize_jd(jd_text))]
+    if not hashes:
+        return (MERSENNE_PRIME,) * len(PERMUTATIONS)
+
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS)
+
+
+def estimate_similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+
+def resume_fingerprint(resume_text: str) -> str:
+    """Hash the resume so that only tailorings of the same resume are matched."""
+    return hashlib.sha256(resume_text.strip().encode('utf-8')).hexdigest()
+
+
+def _band_keys(resume_hash: str, signature: Tuple[int, ...]) -> List[bytes]:
+    """LSH bucket key for each band, scoped to one resume."""
+    keys = []
+    for band in range(config.LSH_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(resume_hash.encode('ascii'))
+        digest.update(struct.pack(f'>{len(rows)}Q', *rows))
+        keys.append(digest.digest())
+    return keys
+
+
+class JDIndex:
+    """On-disk LSH index of prior tailorings keyed by (resume, JD signature)."""
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or config.JD_INDEX_DB)
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'id INTEGER PRIMARY KEY, resume_hash TEXT, signature BLOB, '
+                'result TEXT, created_at REAL)'
+            )
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (bucket BLOB, entry_id INTEGER)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (bucket)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_buckets_entry ON buckets (entry_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_created ON entries (created_at)')
+            conn.commit()
+
+    def add(self, resume_text: str, jd_text: str, result: Dict) -> int:
+        """
+        Store a tailoring result for later reuse.
+
+        Entries older than config.JD_INDEX_TTL, and all but the newest
+        config.JD_INDEX_MAX_ENTRIES, are purged with their buckets in the
+        same transaction.
+
+        Args:
+            resume_text: Original resume text
+            jd_text: Job description it was tailored to
+            result: JSON-serializable tailoring result to store
+
+        Returns:
+            ID of the stored entry
+        """
+        resume_hash = resume_fingerprint(resume_text)
+        signature = jd_signature(jd_text)
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO entries (resume_hash, signature, result, created_at) VALUES (?, ?, ?, ?)',
+                (resume_hash, struct.pack(f'>{len(signature)}Q', *signature), json.dumps(result), time.time())
+            )
+            entry_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO buckets (bucket, entry_id) VALUES (?, ?)',
+                [(key, entry_id) for key in _band_keys(resume_hash, signature)]
+            )
+            self._purge(conn)
+            conn.commit()
+
+        return entry_id
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Delete expired and surplus entries and their buckets (caller commits)."""
+        expired_before = time.time() - config.JD_INDEX_TTL if config.JD_INDEX_TTL else 0.0
+        oldest_kept = 0
+        if config.JD_INDEX_MAX_ENTRIES:
+            row = conn.execute('SELECT id FROM entries ORDER BY id DESC LIMIT 1 OFFSET ?',
+                               (config.JD_INDEX_MAX_ENTRIES - 1,)).fetchone()
+            oldest_kept = row[0] if row else 0
+
+        condition = 'created_at < ? OR id < ?'
+        conn.execute(f'DELETE FROM buckets WHERE entry_id IN (SELECT id FROM entries WHERE {condition})',
+                     (expired_before, oldest_kept))
+        conn.execute(f'DELETE FROM entries WHERE {condition}', (expired_before, oldest_kept))
+
+    def query(self, resume_text: str, jd_text: str, threshold: float = None) -> Optional[Dict]:
+        """
+        Find the most similar prior tailoring of this resume.
+
+        Args:
+            resume_text: Original resume text
+            jd_text: New job description
+            threshold: Minimum estimated Jaccard similarity
+                (defaults to config.JD_SIMILARITY_THRESHOLD)
+
+        Returns:
+            Dictionary with 'similarity', 'created_at' and 'result', or None
+        """
+        if threshold is None:
+            threshold = config.JD_SIMILARITY_THRESHOLD
+
+        resume_hash = resume_fingerprint(resume_text)
+        signature = jd_signature(jd_text)
+        keys = _band_keys(resume_hash, signature)
+        # Entries past their TTL are skipped until the next add purges them
+        expired_before = time.time() - config.JD_INDEX_TTL if config.JD_INDEX_TTL else 0.0
+
+        with self._connect() as conn:
+            placeholders = ','.join('?' * len(keys))
+            rows = conn.execute(
+                f'SELECT DISTINCT e.id, e.signature, e.created_at FROM buckets b '
+                f'JOIN entries e ON e.id = b.entry_id WHERE b.bucket IN ({placeholders}) AND e.created_at >= ?',
+                (*keys, expired_before)
+            ).fetchall()
+
+            best = None
+            for entry_id, packed, created_at in rows:
+                candidate = struct.unpack(f'>{len(packed) // 8}Q', packed)
+                similarity = estimate_similarity(signature, candidate)
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (entry_id, similarity, created_at)
+
+            if best is None:
+                return None
+
+            result = conn.execute('SELECT result FROM entries WHERE id = ?', (best[0],)).fetchone()[0]
+
+        return {
+            'entry_id': best[0],
+            'similarity': round(best[1], 3),
+            'created_at': best[2],
+            'result': json.loads(result)
+        }
+
+
+_jd_index: Optional[JDIndex] = None
+_jd_index_lock = threading.Lock()
+
+
+def get_jd_index() -> JDIndex:
+    """Get the process-wide JD index (created on first use)."""
+    global _jd_index
+
+    if _jd_index is None:
+        with _jd_index_lock:
+            if _jd_index is None:
+                _jd_index = JDIndex()
+
+    return _jd_index
@@ -0,0 +1,289 @@
+"""
+Job Queue Module
+Durable SQLite-backed queue of tailoring jobs run by a pool of worker threads,
+so UI requests return immediately and results survive reruns and refreshes.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import config
+
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert a result to JSON-safe types (sets become sorted lists)."""
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(to_jsonable(item) for item in value)
+    return value
+
+
+def _run_tailor_job(payload: Dict) -> Dict:
+    """Handler for 'tailor' jobs: payload holds quick_tailor's arguments."""
+    from .resume_tailor import quick_tailor
+
+    return quick_tailor(
+        payload['resume_text'],
+        payload['jd_text'],
+        model=payload.get('model'),
+        reuse=payload.get('reuse'),
+        mode=payload.get('mode'),
+        max_projects=payload.get('max_projects'),
+        user=payload.get('user')
+    )
+
+
+# Job kind -> handler(payload) returning a JSON-serializable result
+JOB_HANDLERS: Dict[str, Callable[[Dict], Dict]] = {
+    'tailor': _run_tailor_job,
+}
+
+
+class JobQueue:
+    """
+    Priority job queue persisted in SQLite and drained by worker threads.
+
+    Jobs left 'running' by a process that died are re-queued: at once if
+    their owner's pid is no longer alive (checked at start and every
+    config.JOB_STALE_TIMEOUT while polling), otherwise once they are older
+    than JOB_STALE_TIMEOUT.
+    """
+
+    def __init__(self, db_path=None, workers: int = None):
+        self.db_path = str(db_path or config.JOB_QUEUE_DB)
+        self.workers = config.JOB_WORKERS if workers is None else workers
+        # pid plus a token, so jobs of an earlier process that had the same pid are told apart
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._requeue_lock = threading.Lock()
+        self._last_requeue: Optional[float] = None  # time.monotonic() of the last stale-job check
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, kind TEXT, priority INTEGER, status TEXT, payload TEXT, '
+                'result TEXT, error TEXT, owner TEXT, created_at REAL, started_at REAL, finished_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority, created_at)')
+
+    def start(self) -> None:
+        """Start the worker threads (idempotent)."""
+        with self._start_lock:
+            if self._threads:
+                return
+            self._maybe_requeue_stale()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, kind: str, payload: Dict, priority: int = PRIORITY_INTERACTIVE) -> str:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job kind (a key of JOB_HANDLERS)
+            payload: JSON-serializable job arguments
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH (lower runs first)
+
+        Returns:
+            Job ID
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, priority, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, priority, 'queued', json.dumps(payload), time.time())
+            )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a job's status and, once finished, its result.
+
+        Returns:
+            Dictionary with id, kind, status ('queued', 'running', 'done',
+            'failed' or 'cancelled'), result, error, timestamps and
+            'queue_position' for queued jobs; None if the job is unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(row)
+            job['queue_position'] = None
+            if job['status'] == 'queued':
+                job['queue_position'] = conn.execute(
+                    'SELECT COUNT(*) FROM jobs WHERE status = ? AND (priority < ? OR (priority = ? AND created_at < ?))',
+                    ('queued', job['priority'], job['priority'], job['created_at'])
+                ).fetchone()[0] + 1
+
+        job.pop('payload')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet; returns True if it was cancelled."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?',
+                ('cancelled', time.time(), job_id, 'queued')
+            )
+            return cursor.rowcount == 1
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Atomically move the highest-priority queued job to 'running'."""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT * FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1', ('queued',)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        'UPDATE jobs SET status = ?, owner = ?, started_at = ? WHERE id = ?',
+                        ('running', self._owner, time.time(), row['id'])
+                    )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return row
+
+    def _finish(self, job_id: str, status: str, result: Dict = None, error: str = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    @staticmethod
+    def _owner_alive(owner: Optional[str]) -> bool:
+        """Whether the process that claimed a job may still be running (owner is 'pid-token')."""
+        pid_text = (owner or '').split('-', 1)[0]
+        if not pid_text.isdigit() or os.name == 'nt':
+            # Unknown owner, or no signal-0 probe (os.kill terminates on Windows): wait for the timeout
+            return True
+        pid = int(pid_text)
+        if pid == os.getpid():
+            # Our pid under another token: an earlier process that had this pid
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True  # Exists, owned by another user
+        return True
+
+    def _requeue_stale(self) -> None:
+        """Re-queue jobs whose worker died mid-run and purge expired results."""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT id, owner FROM jobs WHERE status = ? AND owner != ?', ('running', self._owner)
+            ).fetchall()
+            for row in rows:
+                if not self._owner_alive(row['owner']):
+                    conn.execute(
+                        'UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE id = ? AND owner = ?',
+                        ('queued', row['id'], row['owner'])
+                    )
+            conn.execute(
+                'UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE status = ? AND started_at < ?',
+                ('queued', 'running', now - config.JOB_STALE_TIMEOUT)
+            )
+            conn.execute(
+                'DELETE FROM jobs WHERE status NOT IN (?, ?) AND finished_at < ?',
+                ACTIVE_STATUSES + (now - config.JOB_RESULT_TTL,)
+            )
+
+    def _maybe_requeue_stale(self) -> None:
+        """Run _requeue_stale if no worker has in the last config.JOB_STALE_TIMEOUT seconds."""
+        now = time.monotonic()
+        with self._requeue_lock:
+            if self._last_requeue is not None and now - self._last_requeue < config.JOB_STALE_TIMEOUT:
+                return
+            self._last_requeue = now
+        self._requeue_stale()
+
+    def _worker(self) -> None:
+        while True:
+            try:
+                self._maybe_requeue_stale()
+                row = self._claim_next()
+            except sqlite3.Error as e:
+                logger.warning("Job queue error: %s", e)
+                row = None
+
+            if row is None:
+                self._wakeup.wait(config.JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+
+            try:
+                result = JOB_HANDLERS[row['kind']](json.loads(row['payload']))
+                outcome = {'status': 'done', 'result': to_jsonable(result)}
+            except Exception as e:
+                outcome = {'status': 'failed', 'error': str(e)}
+
+            # A failure to record the outcome must not end the worker thread; the
+            # job stays 'running' and is re-queued once stale
+            try:
+                self._finish(row['id'], **outcome)
+            except Exception:
+                logger.exception("Could not record the outcome of job %s", row['id'])
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue, starting its workers on first use."""
+    global _job_queue
+
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+                _job_queue.start()
+
+    return _job_queue
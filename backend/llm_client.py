@@ -0,0 +1,307 @@
+"""
+LLM Client Module
+Process-wide pooled HTTP transport and OpenRouter client with explicit timeouts,
+jittered exponential backoff on 429/5xx, and Retry-After support.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+import openai
+from openai import OpenAI
+
+import config
+from .deadline import DeadlineExceeded
+
+
+# Status codes that are worth retrying (rate limiting and upstream failures)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_openai_client: Optional[OpenAI] = None
+
+
+def _build_timeout() -> httpx.Timeout:
+    """Build the shared connect/read/write/pool timeout policy."""
+    return httpx.Timeout(
+        connect=config.LLM_CONNECT_TIMEOUT,
+        read=config.LLM_READ_TIMEOUT,
+        write=config.LLM_WRITE_TIMEOUT,
+        pool=config.LLM_POOL_TIMEOUT
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide pooled HTTP client (created on first use).
+
+    Returns:
+        httpx.Client with keep-alive connection pooling
+    """
+    global _http_client
+
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = openai.DefaultHttpxClient(
+                    timeout=_build_timeout(),
+                    limits=httpx.Limits(
+                        max_connections=config.LLM_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=config.LLM_POOL_MAX_KEEPALIVE,
+                        keepalive_expiry=config.LLM_POOL_KEEPALIVE_EXPIRY
+                    )
+                )
+
+    return _http_client
+
+
+def get_client() -> OpenAI:
+    """
+    Get the process-wide OpenRouter client (created on first use).
+
+    The SDK's own retries are disabled so that every call goes through
+    call_with_retries and shares one backoff policy.
+
+    Returns:
+        OpenAI client configured for OpenRouter
+    """
+    global _openai_client
+
+    config.validate_config()
+
+    if _openai_client is None:
+        http_client = get_http_client()
+        with _lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(
+                    base_url=config.OPENROUTER_BASE_URL,
+                    api_key=config.OPENROUTER_API_KEY,
+                    http_client=http_client,
+                    timeout=_build_timeout(),
+                    max_retries=0
+                )
+
+    return _openai_client
+
+
+def close_clients() -> None:
+    """Close the pooled transport (used on shutdown and in tests)."""
+    global _http_client, _openai_client
+
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _openai_client = None
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Parse Retry-After style headers into a delay in seconds.
+
+    Args:
+        headers: Response headers (mapping) or None
+
+    Returns:
+        Delay in seconds, or None if no usable header is present
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000.0, 0.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+
+    # HTTP-date form
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Compute the delay before the next retry.
+
+    Uses full-jitter exponential backoff unless the server asked for a
+    specific delay via Retry-After, which takes precedence.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        retry_after: Server-requested delay in seconds, if any
+
+    Returns:
+        Delay in seconds (capped at config.LLM_BACKOFF_MAX)
+    """
+    if retry_after is not None:
+        return min(retry_after, config.LLM_BACKOFF_MAX)
+
+    ceiling = min(config.LLM_BACKOFF_MAX, config.LLM_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether an SDK or transport error is worth retrying."""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    return False
+
+
+def _error_headers(error: Exception):
+    """Get response headers attached to an error, if any."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'headers', None)
+
+
+def call_with_retries(func: Callable, *args, max_retries: int = None, deadline=None, **kwargs):
+    """
+    Call func, retrying transient failures with backoff.
+
+    Args:
+        func: Callable performing one upstream request
+        max_retries: Override for config.LLM_MAX_RETRIES
+        deadline: Optional deadline.Deadline; each attempt gets a `timeout`
+            keyword capped at the remaining time, and DeadlineExceeded is
+            raised once it passes or a retry's backoff would outlast it
+        *args, **kwargs: Passed through to func
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        The last error if retries are exhausted or the error is not retryable
+    """
+    if max_retries is None:
+        max_retries = config.LLM_MAX_RETRIES
+
+    attempt = 0
+    while True:
+        if deadline is not None:
+            deadline.check('llm request')
+            kwargs['timeout'] = deadline.timeout_for(config.LLM_READ_TIMEOUT)
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if deadline is not None and deadline.expired:
+                # The capped timeout fired: report the deadline, not the timeout
+                raise DeadlineExceeded('llm request') from e
+            if attempt >= max_retries or not _is_retryable(e):
+                raise
+            backoff = compute_backoff(attempt, parse_retry_after(_error_headers(e)))
+            if deadline is not None and backoff >= deadline.remaining():
+                raise DeadlineExceeded('llm request') from e
+            time.sleep(backoff)
+            attempt += 1
+
+
+def http_get(url: str, headers: Dict = None, max_retries: int = None) -> httpx.Response:
+    """
+    Issue a GET on the shared transport, retrying 429/5xx with backoff.
+
+    Args:
+        url: Absolute URL to fetch
+        headers: Optional request headers
+        max_retries: Override for config.LLM_MAX_RETRIES
+
+    Returns:
+        Final httpx.Response (may still be an error status)
+    """
+    if max_retries is None:
+        max_retries = config.LLM_MAX_RETRIES
+
+    client = get_http_client()
+
+    def _request() -> httpx.Response:
+        response = client.get(url, headers=headers)
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code}", request=response.request, response=response
+            )
+        return response
+
+    attempt = 0
+    while True:
+        try:
+            return _request()
+        except httpx.HTTPStatusError as e:
+            if attempt >= max_retries:
+                return e.response
+            time.sleep(compute_backoff(attempt, parse_retry_after(e.response.headers)))
+        except (httpx.TimeoutException, httpx.TransportError):
+            if attempt >= max_retries:
+                raise
+            time.sleep(compute_backoff(attempt))
+        attempt += 1
+
+
+class CancelToken:
+    """
+    Cooperative cancellation handle for an in-flight LLM call.
+
+    The streaming loop checks `cancelled` between chunks; cancel() also
+    closes any bound stream so that a read blocked on the network returns
+    immediately instead of waiting for the read timeout.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._resources = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def bind(self, resource) -> None:
+        """Register a closeable resource (e.g. an SDK stream) to close on cancel."""
+        with self._lock:
+            if not self._event.is_set():
+                self._resources.append(resource)
+                return
+        _close_quietly(resource)
+
+    def cancel(self, reason: str = 'cancelled') -> None:
+        """Cancel the call and close any bound resources."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            resources, self._resources = self._resources, []
+        for resource in resources:
+            _close_quietly(resource)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until cancelled or timeout; returns True if cancelled."""
+        return self._event.wait(timeout)
+
+
+def _close_quietly(resource) -> None:
+    """Close a resource, ignoring errors from already-closed streams."""
+    try:
+        resource.close()
+    except Exception:
+        pass
@@ -0,0 +1,167 @@
+"""
+Output Repair Module
+Salvages a tailored resume that failed validation without another LLM call:
+strips placeholders and commentary, and splices the original text back in
+around the AI's edits to the editable roles.
+"""
+
+import re
+from typing import Dict, List
+
+import config
+from .output_validator import get_rule_engine, validate_resume_sections
+from .resume_sections import get_editable_roles, segment_resume
+
+
+# Finding types removed from the output (everything else needs the model to fix)
+STRIPPABLE_TYPES = {'placeholder', 'meta_text'}
+
+# What may be left of a line once a placeholder is cut out of it for the line to be dropped
+LEFTOVER_PATTERN = re.compile(r'^[\s\-–—*•·:;,.()\[\]]*$')
+
+
+def strip_placeholders(text: str) -> Dict:
+    """
+    Remove placeholder and commentary findings from text.
+
+    A line left empty (or only punctuation) after its finding is cut out is
+    dropped entirely.
+
+    Args:
+        text: Tailored resume text
+
+    Returns:
+        Dictionary with 'text' (cleaned) and 'removed' (removed snippets)
+    """
+    findings = get_rule_engine().scan(text, types=STRIPPABLE_TYPES)
+    if not findings:
+        return {'text': text, 'removed': []}
+
+    # Merge overlapping spans (several rules can match the same placeholder)
+    spans: List[List[int]] = []
+    for finding in findings:
+        if spans and finding['start'] < spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], finding['end'])
+        else:
+            spans.append([finding['start'], finding['end']])
+
+    pieces = []
+    removed = []
+    position = 0
+    for start, end in spans:
+        pieces.append(text[position:start])
+        removed.append(text[start:end])
+        position = end
+    pieces.append(text[position:])
+
+    kept_lines = []
+    for original_line, line in zip(text.split('\n'), ''.join(pieces).split('\n')):
+        if line != original_line and LEFTOVER_PATTERN.match(line):
+            continue
+        kept_lines.append(line)
+    # Span removal never removes newlines, so lines stay aligned with the original text
+
+    return {'text': '\n'.join(kept_lines), 'removed': removed}
+
+
+def splice_editable_roles(original_text: str, tailored_text: str, max_projects: int) -> Dict:
+    """
+    Rebuild the resume from the original, taking only the editable roles'
+    bullets (and trailer lines) from the tailored text.
+
+    Roles are matched by position; a tailored role whose dates disagree with
+    the original, or which has no bullets, is not used and the original
+    role is kept.
+
+    Args:
+        original_text: Original resume text
+        tailored_text: Tailored resume text (placeholders already stripped)
+        max_projects: Number of recent roles tailoring may edit
+
+    Returns:
+        Dictionary with 'text' (spliced resume), 'roles_taken' and
+        'roles_kept' (indexes of editable roles kept from the original)
+    """
+    original = segment_resume(original_text)
+    tailored = segment_resume(tailored_text)
+    original_roles = get_editable_roles(original, max_projects)
+    tailored_roles = get_editable_roles(tailored, max_projects)
+
+    lines = list(original['lines'])
+    roles_taken = []
+    roles_kept = []
+
+    # Splice from the bottom up so earlier line offsets stay valid
+    for index in reversed(range(len(original_roles))):
+        role = original_roles[index]
+        candidate = tailored_roles[index] if index < len(tailored_roles) else None
+        if (candidate is None or not candidate['bullets']
+                or (role['dates'] and candidate['dates'] and role['dates'] != candidate['dates'])):
+            roles_kept.append(index)
+            continue
+        lines[role['header_end']:role['end']] = tailored['lines'][candidate['header_end']:candidate['end']]
+        roles_taken.append(index)
+
+    return {
+        'text': '\n'.join(lines),
+        'roles_taken': sorted(roles_taken),
+        'roles_kept': sorted(roles_kept)
+    }
+
+
+def cut_before_violation(content: str, violation: Dict) -> str:
+    """Output of an aborted stream up to the start of the line holding the violation."""
+    return content[:content.rfind('\n', 0, violation['start']) + 1]
+
+
+def salvageable(original_text: str, partial_text: str, max_projects: int) -> bool:
+    """Whether partial output already has usable bullets for every editable role."""
+    return not splice_editable_roles(original_text, partial_text, max_projects)['roles_kept']
+
+
+def repair_resume(original_text: str, tailored_text: str, max_projects: int = None, validation: Dict = None) -> Dict:
+    """
+    Repair a tailored resume that failed validation, locally.
+
+    Placeholders and commentary are stripped, then every preserved section
+    (summary, skills, education, older roles, role headers) is restored from
+    the original while the edited bullets of the editable roles are kept.
+    Issues that need rewriting (e.g. inflated verbs) are not repaired.
+
+    Args:
+        original_text: Original resume text
+        tailored_text: Tailored resume text
+        max_projects: Number of recent roles tailoring may edit
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
+        validation: validate_resume_sections result for tailored_text, if
+            already computed
+
+    Returns:
+        Dictionary with 'tailored_resume' (repaired), 'repairs' (what was
+        done, human-readable), 'roles_kept' (editable roles left as in the
+        original) and 'validation' (of the repaired resume)
+    """
+    if max_projects is None:
+        max_projects = config.MAX_PROJECTS_TO_TAILOR
+    if validation is None:
+        validation = validate_resume_sections(tailored_text, original_text, max_projects)
+
+    repairs = []
+
+    stripped = strip_placeholders(tailored_text)
+    if stripped['removed']:
+        repairs.append(f"Removed {len(stripped['removed'])} placeholder/commentary snippet(s)")
+
+    spliced = splice_editable_roles(original_text, stripped['text'], max_projects)
+    restored = [block['name'] for block in validation.get('drifted', []) if block['status'] != 'added']
+    if restored:
+        repairs.append(f"Restored from the original: {', '.join(restored)}")
+    for index in spliced['roles_kept']:
+        repairs.append(f"Kept the original bullets of role {index + 1} (not usable in the AI output)")
+
+    return {
+        'tailored_resume': spliced['text'],
+        'repairs': repairs,
+        'roles_kept': spliced['roles_kept'],
+        'validation': validate_resume_sections(spliced['text'], original_text, max_projects)
+    }
@@ -3,8 +3,215 @@ Output Validator Module
 Validates that LLM output contains all required sections without placeholders.
 """
 
-from typing import Dict, List, Tuple
+import json
 import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import config
+from .entity_index import check_entities
+from .preservation import check_preservation
+
+
+SEVERITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# Findings at these severities make a resume invalid
+BLOCKING_SEVERITIES = {'critical', 'high'}
+
+# Inline regex flags a rule may use
+RULE_FLAGS = 'imsx'
+
+
+def load_rules(path=None) -> List[Dict]:
+    """
+    Load validation rules from a JSON file.
+
+    Each rule has an 'id', 'type', 'severity', regex 'pattern', optional
+    'flags' (any of 'imsx'), 'keywords' (literals, one of which every match
+    contains; see RuleEngine), 'message', and optionally
+    'only_if_absent_from_original' (report only if the original resume
+    does not match the rule too).
+
+    Args:
+        path: Rules file (defaults to config.VALIDATION_RULES_FILE)
+
+    Returns:
+        List of rule dictionaries
+    """
+    with open(path or config.VALIDATION_RULES_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def keyword_trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the keywords, factored as a trie.
+
+    Alternatives sharing a prefix are merged, so matching cost at each
+    position depends on the keyword length, not on how many keywords there
+    are.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        optional = '' in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        return f"(?:{'|'.join(alternatives)}){'?' if optional else ''}"
+
+    return build(trie) or r'(?!)'
+
+
+class RuleEngine:
+    """
+    Registry of validation rules compiled into one keyword matcher.
+
+    Every rule lists 'keywords', literals (case-insensitive) at least one of
+    which occurs in anything it matches. All keywords are compiled into a
+    single trie-shaped regex, so a text is scanned once at a cost per byte
+    that does not grow with the number of rules; a rule's own pattern only
+    runs on the lines where one of its keywords was found. Rules therefore
+    match within a single line. Rules without keywords are run over the
+    whole text.
+    """
+
+    def __init__(self, rules: Iterable[Dict] = ()):
+        self.rules: Dict[str, Dict] = {}
+        self._compiled = None
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: Dict) -> None:
+        """Add (or replace) a rule; the matcher is rebuilt on next use."""
+        flags = rule.get('flags', '')
+        unknown = set(flags) - set(RULE_FLAGS)
+        if unknown:
+            raise ValueError(f"Rule {rule['id']}: unknown flags {''.join(sorted(unknown))}")
+        if rule.get('severity') not in SEVERITY_ORDER:
+            raise ValueError(f"Rule {rule['id']}: unknown severity {rule.get('severity')}")
+        # Fail on a bad pattern now rather than in the middle of a scan
+        re.compile(rule['pattern'])
+        self.rules[rule['id']] = rule
+        self._compiled = None
+
+    def _compile(self):
+        if self._compiled is None:
+            patterns = {}
+            keyword_rules: Dict[str, List[str]] = {}
+            unkeyed = []
+            for rule_id, rule in self.rules.items():
+                flags = rule.get('flags', '')
+                patterns[rule_id] = re.compile(f"(?{flags}:{rule['pattern']})" if flags else rule['pattern'])
+                if rule.get('keywords'):
+                    for keyword in rule['keywords']:
+                        keyword_rules.setdefault(keyword.lower(), []).append(rule_id)
+                else:
+                    unkeyed.append(rule_id)
+            # The trie matches the longest keyword at a position, so a keyword
+            # also carries the rules of keywords that are its prefixes
+            for keyword, rule_ids in keyword_rules.items():
+                for other, other_rule_ids in keyword_rules.items():
+                    if other != keyword and keyword.startswith(other):
+                        rule_ids.extend(rule_id for rule_id in other_rule_ids if rule_id not in rule_ids)
+            # Zero-width lookahead so keywords overlapping an earlier hit are still found
+            trie = f"(?=({keyword_trie_pattern(keyword_rules)}))"
+            self._compiled = (
+                re.compile(trie),
+                re.compile(trie, re.IGNORECASE),
+                keyword_rules,
+                patterns,
+                unkeyed
+            )
+        return self._compiled
+
+    def scan(self, text: str, types: Iterable[str] = None) -> List[Dict]:
+        """
+        Find every rule match in text in a single pass.
+
+        Args:
+            text: Text to validate
+            types: Only report rules of these types (all if None)
+
+        Returns:
+            Findings in text order, each with rule, type, severity, message,
+            the matched text, start/end offsets and 1-based line number
+        """
+        keyword_pattern, keyword_pattern_nocase, keyword_rules, patterns, unkeyed = self._compile()
+        types = set(types) if types is not None else None
+
+        def wanted(rule_id: str) -> bool:
+            return types is None or self.rules[rule_id]['type'] in types
+
+        matches = []
+        for rule_id in unkeyed:
+            if wanted(rule_id):
+                matches.extend((rule_id, match) for match in patterns[rule_id].finditer(text))
+
+        # Matching lowercased text against lowercase keywords is much faster than
+        # IGNORECASE; the rare text whose length changes when lowercased falls back
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            hits = keyword_pattern.finditer(lowered)
+        else:
+            hits = keyword_pattern_nocase.finditer(text)
+
+        checked = set()
+        for hit in hits:
+            position = hit.start()
+            line_start = text.rfind('\n', 0, position) + 1
+            line_end = text.find('\n', position)
+            if line_end == -1:
+                line_end = len(text)
+            for rule_id in keyword_rules[hit.group(1).lower()]:
+                if (rule_id, line_start) in checked or not wanted(rule_id):
+                    continue
+                checked.add((rule_id, line_start))
+                matches.extend((rule_id, match) for match in patterns[rule_id].finditer(text, line_start, line_end))
+
+        matches.sort(key=lambda item: (item[1].start(), item[0]))
+
+        findings = []
+        line, line_checked = 1, 0
+        for rule_id, match in matches:
+            rule = self.rules[rule_id]
+            start = match.start()
+            line += text.count('\n', line_checked, start)
+            line_checked = start
+            findings.append({
+                'rule': rule_id,
+                'type': rule['type'],
+                'severity': rule['severity'],
+                'message': rule['message'],
+                'text': match.group(),
+                'start': start,
+                'end': match.end(),
+                'line': line
+            })
+
+        return findings
+
+
+_rule_engine: Optional[RuleEngine] = None
+_rule_engine_lock = threading.Lock()
+
+
+def get_rule_engine() -> RuleEngine:
+    """Get the process-wide rule engine, loaded from config.VALIDATION_RULES_FILE."""
+    global _rule_engine
+
+    if _rule_engine is None:
+        with _rule_engine_lock:
+            if _rule_engine is None:
+                _rule_engine = RuleEngine(load_rules())
+
+    return _rule_engine
 
 
 def detect_placeholders(text: str) -> List[str]:
@@ -17,45 +224,140 @@ def detect_placeholders(text: str) -> List[str]:
     Returns:
         List of placeholder patterns found
     """
-    placeholders = []
-
-    # Common placeholder patterns
-    patterns = [
-        r'\[.*?PRESERVED.*?\]',
-        r'\[.*?AS WRITTEN.*?\]',
-        r'\[.*?EXACTLY.*?\]',
-        r'\[.*?UNCHANGED.*?\]',
-        r'\[Previous roles.*?\]',
-        r'\[Environment section.*?\]',
-        r'\[EDUCATION.*?\]',
-        r'\[TECHNICAL SKILLS.*?\]',
-        r'\[All previous.*?\]',
-        r'\[Earlier roles.*?\]',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        if matches:
-            placeholders.extend(matches)
-
-    return placeholders
-
-
-def validate_resume_sections(tailored_text: str, original_text: str) -> Dict:
+    findings = get_rule_engine().scan(text, types={'placeholder'})
+    # A placeholder matched by several rules is reported once
+    return list({(finding['start'], finding['end']): finding['text'] for finding in findings}.values())
+
+
+class IncrementalValidator:
+    """
+    Validate a completion while it streams, to abort doomed generations early.
+
+    Deltas are fed in as they arrive. Each completed line is scanned once;
+    the line still in progress is re-scanned on every delta while it is at
+    most `window` characters long, so a placeholder is caught as soon as its
+    closing bracket arrives. Only rules of the watched types and severities
+    count, and scanning stops at the tailoring summary marker, where
+    commentary is expected.
+    """
+
+    def __init__(
+        self,
+        types: Iterable[str] = ('placeholder', 'meta_text'),
+        severities: Iterable[str] = ('critical',),
+        window: int = None,
+        stop_marker: str = 'TAILORING SUMMARY'
+    ):
+        self.engine = get_rule_engine()
+        self.types = set(types)
+        self.severities = set(severities)
+        self.window = window if window is not None else config.STREAM_VALIDATION_WINDOW
+        self.stop_marker = stop_marker
+        self.violation: Optional[Dict] = None
+        self.stopped = False
+        self._line = ''  # Line in progress
+        self._offset = 0  # Offset of the line in progress in the whole output
+        self._line_number = 1
+
+    def _check(self, text: str, offset: int) -> Optional[Dict]:
+        """Scan text (starting at offset in the output) and record the first violation."""
+        marker = text.find(self.stop_marker)
+        if marker != -1:
+            text = text[:marker]
+            self.stopped = True
+        for finding in self.engine.scan(text, types=self.types):
+            if finding['severity'] in self.severities:
+                self.violation = dict(
+                    finding,
+                    start=finding['start'] + offset,
+                    end=finding['end'] + offset,
+                    line=finding['line'] + self._line_number - 1
+                )
+                break
+        return self.violation
+
+    def feed(self, delta: str) -> Optional[Dict]:
+        """
+        Consume the next piece of the completion.
+
+        Args:
+            delta: Newly streamed text
+
+        Returns:
+            The first violation found so far (a finding as from
+            RuleEngine.scan, with offsets into the whole output), or None
+        """
+        if self.violation is not None or self.stopped or not delta:
+            return self.violation
+
+        text = self._line + delta
+        last_newline = text.rfind('\n')
+        if last_newline != -1:
+            complete, self._line = text[:last_newline + 1], text[last_newline + 1:]
+            if self._check(complete, self._offset) or self.stopped:
+                return self.violation
+            self._offset += len(complete)
+            self._line_number += complete.count('\n')
+        else:
+            self._line = text
+
+        if self._line and len(self._line) <= self.window:
+            self._check(self._line, self._offset)
+        return self.violation
+
+
+def describe_drift(block: Dict) -> str:
+    """One-line description of a drifted block from check_preservation."""
+    if block['status'] == 'missing':
+        return f"Section missing: {block['name']}"
+    if block['status'] == 'added':
+        return f"Unexpected section added: {block['name']}"
+
+    details = []
+    if block['missing_lines']:
+        number, line = block['missing_lines'][0]
+        details.append(f"{len(block['missing_lines'])} line(s) changed or removed, first at line {number}: {line[:60]!r}")
+    if block['added_lines']:
+        number, line = block['added_lines'][0]
+        details.append(f"{len(block['added_lines'])} line(s) added, first at line {number}: {line[:60]!r}")
+    return f"Section altered: {block['name']} ({'; '.join(details) or 'lines reordered'})"
+
+
+def validate_resume_sections(tailored_text: str, original_text: str, max_projects: int = None) -> Dict:
     """
     Validate that tailored resume contains all required sections.
 
     Args:
         tailored_text: AI-generated tailored resume
         original_text: Original resume text
+        max_projects: Number of recent roles tailoring may edit
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
 
     Returns:
-        Dictionary with validation results
+        Dictionary with validation results: 'valid' (no critical or high
+        severity issue), 'issues', 'findings' (every rule match with
+        offsets), 'drifted' (preserved sections that changed, from
+        preservation.check_preservation), 'entity_mismatches' (role
+        headers that disagree with the original's employers, titles or
+        dates, from entity_index.check_entities) and 'placeholder_count'
     """
+    engine = get_rule_engine()
+    findings = engine.scan(tailored_text)
+
+    # Rules that only count when the original does not already match them
+    conditional = {rule_id for rule_id, rule in engine.rules.items() if rule.get('only_if_absent_from_original')}
+    if conditional and any(finding['rule'] in conditional for finding in findings):
+        in_original = {finding['rule'] for finding in engine.scan(original_text)}
+        findings = [
+            finding for finding in findings
+            if finding['rule'] not in conditional or finding['rule'] not in in_original
+        ]
+
     issues = []
 
-    # Check for placeholders
-    placeholders = detect_placeholders(tailored_text)
+    placeholders = list({
+        (finding['start'], finding['end']): finding['text'] for finding in findings if finding['type'] == 'placeholder'
+    }.values())
     if placeholders:
         issues.append({
             'type': 'placeholders',
@@ -63,87 +365,46 @@ def validate_resume_sections(tailored_text: str, original_text: str) -> Dict:
             'message': f'Found {len(placeholders)} placeholder(s): {placeholders[:3]}'
         })
 
-    # Check for ALL CAPS Professional Summary (wrong formatting)
-    if 'SENIOR DATA ENGINEER WITH 20+ YEARS' in tailored_text:
-        if 'Senior Data Engineer with 20+ years' in original_text:
-            issues.append({
-                'type': 'formatting',
-                'severity': 'high',
-                'message': 'Professional Summary changed to ALL CAPS (should preserve original formatting)'
-            })
-
-    # Check for specific company names from original
-    original_companies = extract_company_names(original_text)
-    for company in original_companies:
-        if company not in tailored_text and company not in ['AT&T', 'Cognizant']:
-            # Older companies should be present
-            issues.append({
-                'type': 'missing_company',
-                'severity': 'critical',
-                'message': f'Missing company: {company}'
-            })
-
-    # Check for Technical Skills section completeness
-    if 'Cloud Technology' in original_text:
-        if 'Cloud Technology' not in tailored_text:
-            issues.append({
-                'type': 'missing_section',
-                'severity': 'critical',
-                'message': 'Technical Skills section incomplete or missing'
-            })
+    # One issue per other rule, at the first place it matched
+    reported = set()
+    for finding in findings:
+        if finding['type'] == 'placeholder' or finding['rule'] in reported:
+            continue
+        reported.add(finding['rule'])
+        issues.append({
+            'type': finding['type'],
+            'severity': finding['severity'],
+            'message': f"{finding['message']} (line {finding['line']}: {finding['text'][:60]!r})"
+        })
 
-    # Check for Education section
-    if 'Master of Computer Applications' in original_text:
-        if 'Master of Computer Applications' not in tailored_text:
-            issues.append({
-                'type': 'missing_education',
-                'severity': 'critical',
-                'message': 'Education section missing or incomplete'
-            })
+    # Everything outside the editable roles must come back unchanged
+    preservation = check_preservation(original_text, tailored_text, max_projects)
+    for block in preservation['drifted']:
+        issues.append({
+            'type': 'missing_section' if block['status'] == 'missing' else 'altered_section',
+            'severity': 'critical',
+            'message': describe_drift(block)
+        })
 
-    # Check for forbidden words
-    forbidden_patterns = [
-        (r'\bArchitected\b', 'Uses "Architected" (should preserve original action verbs)'),
-        (r'\bLed\s+(?:development|implementation)', 'Adds "Led" (leadership inflation)'),
-    ]
-
-    original_lower = original_text.lower()
-    for pattern, message in forbidden_patterns:
-        if re.search(pattern, tailored_text, re.IGNORECASE):
-            # Check if it was in original
-            if not re.search(pattern, original_text, re.IGNORECASE):
-                issues.append({
-                    'type': 'verb_inflation',
-                    'severity': 'high',
-                    'message': message
-                })
+    # Employers, titles and dates in the role headers must all come from the original
+    entities = check_entities(original_text, tailored_text)
+    for mismatch in entities['mismatches']:
+        issues.append({
+            'type': 'entity_mismatch',
+            'severity': mismatch['severity'],
+            'message': mismatch['message']
+        })
 
     return {
-        'valid': len(issues) == 0,
+        'valid': not any(issue['severity'] in BLOCKING_SEVERITIES for issue in issues),
         'issues': issues,
+        'findings': findings,
+        'drifted': preservation['drifted'],
+        'entity_mismatches': entities['mismatches'],
         'placeholder_count': len(placeholders)
     }
 
 
-def extract_company_names(text: str) -> List[str]:
-    """Extract company names from resume text."""
-    companies = []
-
-    # Common patterns for company names in experience section
-    patterns = [
-        r'([A-Z][A-Za-z\s&]+(?:Corporation|Technology Solutions|Bank|Syntel))',
-        r'(Xoriant\s+Corporation)',
-        r'(Atos\s+Syntel)',
-        r'(ANZ\s+Bank)',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        companies.extend(matches)
-
-    return list(set(companies))
-
-
 def suggest_fixes(validation_result: Dict) -> List[str]:
     """
     Suggest fixes based on validation issues.
@@ -159,13 +420,15 @@ def suggest_fixes(validation_result: Dict) -> List[str]:
     for issue in validation_result['issues']:
         if issue['type'] == 'placeholders':
             suggestions.append('CRITICAL: Remove all placeholders and output complete content')
-        elif issue['type'] == 'missing_company':
-            suggestions.append(f"Add missing company: {issue['message']}")
-        elif issue['type'] == 'formatting':
-            suggestions.append('Fix Professional Summary: Use sentence case, not ALL CAPS')
+        elif issue['type'] == 'altered_section':
+            suggestions.append(f"Copy this section word-for-word from the original: {issue['message']}")
         elif issue['type'] == 'verb_inflation':
             suggestions.append(f"Fix action verbs: {issue['message']}")
         elif issue['type'] == 'missing_section':
             suggestions.append(f"Add missing section: {issue['message']}")
+        elif issue['type'] == 'entity_mismatch':
+            suggestions.append(f"Copy company names, titles and dates exactly from the original: {issue['message']}")
+        elif issue['type'] == 'meta_text':
+            suggestions.append(f"Remove commentary from the resume: {issue['message']}")
 
     return suggestions
@@ -0,0 +1,150 @@
+"""
+Preservation Module
+Checks that a tailored resume left everything outside the editable roles
+untouched, by comparing per-section line hashes of the original and tailored
+text, and reports exactly which sections and lines drifted.
+"""
+
+import hashlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import config
+from .resume_sections import EXPERIENCE_SECTIONS, segment_resume
+
+
+def line_digest(line: str) -> bytes:
+    """Hash of a line, ignoring surrounding whitespace."""
+    return hashlib.blake2b(line.strip().encode('utf-8'), digest_size=8).digest()
+
+
+def _unit(name: str, lines: List[str], line_numbers: List[int]) -> Dict:
+    """A preserved block: its non-blank lines, their hashes and a block digest."""
+    kept = [(number, line) for number, line in zip(line_numbers, lines) if line.strip()]
+    digests = [line_digest(line) for _, line in kept]
+    return {
+        'name': name,
+        'lines': kept,
+        'digests': digests,
+        'digest': hashlib.blake2b(b''.join(digests), digest_size=16).hexdigest()
+    }
+
+
+def preserved_units(resume_text: str, max_projects: int) -> Dict[str, Dict]:
+    """
+    Split a resume into the blocks tailoring must not change.
+
+    Every section outside Experience is one block (named by section, with a
+    counter if a section repeats). In Experience, the lines before the first
+    role, the header lines (company, title, dates) of each editable role
+    and every older role in full are blocks. Only the bullets and trailer
+    lines of the editable roles are left out.
+
+    Args:
+        resume_text: Resume text
+        max_projects: Number of recent roles tailoring may edit
+
+    Returns:
+        Ordered mapping of block name -> block with its lines (1-based line
+        number, text), line hashes and a digest of the whole block
+    """
+    structure = segment_resume(resume_text)
+    lines = structure['lines']
+    units: Dict[str, Dict] = {}
+    seen: Counter = Counter()
+
+    def add(name: str, start: int, end: int) -> None:
+        seen[name] += 1
+        key = name if seen[name] == 1 else f"{name} #{seen[name]}"
+        units[key] = _unit(key, lines[start:end], list(range(start + 1, end + 1)))
+
+    experience_done = False
+    for section in structure['sections']:
+        if section['name'] not in EXPERIENCE_SECTIONS or experience_done:
+            add(section['name'], section['start'], section['end'])
+            continue
+
+        experience_done = True
+        roles = structure['roles']
+        first_role = roles[0]['start'] if roles else section['end']
+        add('experience', section['start'], first_role)
+        for index, role in enumerate(roles):
+            if index < max_projects:
+                add(f"experience role {index + 1} header", role['start'], role['header_end'])
+            else:
+                add(f"experience role {index + 1}", role['start'], role['end'])
+
+    return units
+
+
+def _line_drift(original: Dict, tailored: Dict) -> Tuple[List, List]:
+    """Lines of a block missing from / added to the tailored version (multiset difference)."""
+    tailored_counts = Counter(tailored['digests'])
+    original_counts = Counter(original['digests'])
+
+    missing = []
+    for (number, line), digest in zip(original['lines'], original['digests']):
+        if tailored_counts[digest] > 0:
+            tailored_counts[digest] -= 1
+        else:
+            missing.append((number, line.strip()))
+
+    added = []
+    for (number, line), digest in zip(tailored['lines'], tailored['digests']):
+        if original_counts[digest] > 0:
+            original_counts[digest] -= 1
+        else:
+            added.append((number, line.strip()))
+
+    return missing, added
+
+
+def check_preservation(original_text: str, tailored_text: str, max_projects: int = None) -> Dict:
+    """
+    Verify that every block outside the editable roles is unchanged.
+
+    Blocks are compared by digest first; only blocks whose digests differ
+    are compared line by line. Blank lines and surrounding whitespace are
+    ignored.
+
+    Args:
+        original_text: Original resume text
+        tailored_text: Tailored resume text
+        max_projects: Number of recent roles tailoring may edit
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
+
+    Returns:
+        Dictionary with 'preserved' (True if nothing drifted) and 'drifted',
+        a list of blocks with 'name', 'status' ('changed', 'missing' or
+        'added'), 'missing_lines' (original line number, text) and
+        'added_lines' (tailored line number, text)
+    """
+    if max_projects is None:
+        max_projects = config.MAX_PROJECTS_TO_TAILOR
+
+    original_units = preserved_units(original_text, max_projects)
+    tailored_units = preserved_units(tailored_text, max_projects)
+
+    drifted = []
+    for name, original in original_units.items():
+        tailored = tailored_units.get(name)
+        if tailored is None:
+            if original['lines']:
+                drifted.append({'name': name, 'status': 'missing',
+                                'missing_lines': [(number, line.strip()) for number, line in original['lines']],
+                                'added_lines': []})
+            continue
+        if tailored['digest'] == original['digest']:
+            continue
+        missing, added = _line_drift(original, tailored)
+        drifted.append({'name': name, 'status': 'changed', 'missing_lines': missing, 'added_lines': added})
+
+    for name, tailored in tailored_units.items():
+        if name not in original_units and tailored['lines']:
+            drifted.append({'name': name, 'status': 'added', 'missing_lines': [],
+                            'added_lines': [(number, line.strip()) for number, line in tailored['lines']]})
+
+    return {
+        'preserved': not drifted,
+        'drifted': drifted
+    }
@@ -0,0 +1,234 @@
+"""
+Rate Limiter Module
+Token-bucket scheduler in front of the LLM client: enforces requests/min and
+tokens/min per model, queues callers fairly (round-robin between users) and
+reports queue depth and wait times.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+import config
+from .deadline import DeadlineExceeded
+
+
+class TokenBucket:
+    """Bucket refilled continuously up to its capacity (one minute's allowance)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Give back (positive) or charge extra (negative) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Ticket:
+    """One caller waiting for (then holding) capacity."""
+
+    def __init__(self, model: str, user: str, tokens: int):
+        self.model = model
+        self.user = user
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.wait_seconds = 0.0
+
+
+class _ModelState:
+    def __init__(self, limits: Dict):
+        self.requests = TokenBucket(limits['requests_per_minute'])
+        self.tokens = TokenBucket(limits['tokens_per_minute'])
+        # user -> FIFO of tickets; order of keys is the round-robin order
+        self.queues: 'OrderedDict[str, deque]' = OrderedDict()
+        self.waits = deque(maxlen=200)
+        self.granted = 0
+        self.tokens_estimated = 0
+        self.tokens_used = 0
+
+    def head(self) -> Optional[_Ticket]:
+        """Next ticket to serve: the oldest ticket of the next user in rotation."""
+        for tickets in self.queues.values():
+            if tickets:
+                return tickets[0]
+        return None
+
+    def remove(self, ticket: _Ticket) -> None:
+        tickets = self.queues.get(ticket.user)
+        if tickets and ticket in tickets:
+            tickets.remove(ticket)
+        if tickets is not None and not tickets:
+            del self.queues[ticket.user]
+
+
+class RateScheduler:
+    """
+    Per-model token-bucket scheduler with fair queuing between users.
+
+    acquire() blocks until both the model's request and token buckets can
+    cover the call, serving users round-robin so one user's batch cannot
+    starve another's interactive request. settle() corrects the token bucket
+    with the usage the API reported.
+    """
+
+    def __init__(self, default_limits: Dict = None, model_limits: Dict = None):
+        self.default_limits = default_limits or {
+            'requests_per_minute': config.RATE_LIMIT_REQUESTS_PER_MINUTE,
+            'tokens_per_minute': config.RATE_LIMIT_TOKENS_PER_MINUTE
+        }
+        self.model_limits = config.RATE_LIMITS_PER_MODEL if model_limits is None else model_limits
+        self._cond = threading.Condition()
+        self._models: Dict[str, _ModelState] = {}
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelState({**self.default_limits, **self.model_limits.get(model, {})})
+            self._models[model] = state
+        return state
+
+    def acquire(
+        self,
+        model: str,
+        estimated_tokens: int,
+        user: str = None,
+        deadline=None,
+        cancel_token=None
+    ) -> Optional[_Ticket]:
+        """
+        Wait for capacity to make one call.
+
+        Args:
+            model: Model ID
+            estimated_tokens: Expected prompt plus completion tokens
+            user: Caller identity for fair queuing (e.g. a session ID)
+            deadline: Optional deadline.Deadline bounding the wait
+            cancel_token: Optional llm_client.CancelToken; the wait is
+                abandoned when it is cancelled
+
+        Returns:
+            Ticket to pass to settle() once the call's usage is known, or
+            None if cancel_token was cancelled while waiting
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while waiting
+        """
+        ticket = _Ticket(model, user or 'anonymous', max(1, int(estimated_tokens)))
+
+        with self._cond:
+            state = self._state(model)
+            state.queues.setdefault(ticket.user, deque()).append(ticket)
+
+            while True:
+                if deadline is not None and deadline.expired:
+                    state.remove(ticket)
+                    self._cond.notify_all()
+                    raise DeadlineExceeded('rate limit')
+                if cancel_token is not None and cancel_token.cancelled:
+                    state.remove(ticket)
+                    self._cond.notify_all()
+                    return None
+
+                timeout = None
+                if state.head() is ticket:
+                    timeout = max(state.requests.wait_time(1), state.tokens.wait_time(ticket.tokens))
+                    if timeout <= 0:
+                        break
+                if deadline is not None:
+                    timeout = deadline.timeout_for(timeout)
+                if cancel_token is not None:
+                    # Cancellation does not notify the condition; poll for it
+                    timeout = min(timeout if timeout is not None else math.inf, config.RATE_LIMIT_POLL_INTERVAL)
+                self._cond.wait(timeout)
+
+            state.requests.take(1)
+            state.tokens.take(min(ticket.tokens, state.tokens.capacity))
+            state.remove(ticket)
+            if ticket.user in state.queues:
+                # Round robin: this user goes to the back of the rotation
+                state.queues.move_to_end(ticket.user)
+
+            ticket.wait_seconds = time.monotonic() - ticket.enqueued
+            state.waits.append(ticket.wait_seconds)
+            state.granted += 1
+            state.tokens_estimated += ticket.tokens
+            self._cond.notify_all()
+
+        return ticket
+
+    def settle(self, ticket: _Ticket, actual_tokens: int) -> None:
+        """Correct the token bucket with the tokens the call actually used."""
+        with self._cond:
+            state = self._state(ticket.model)
+            charged = min(ticket.tokens, state.tokens.capacity)
+            state.tokens.adjust(charged - actual_tokens)
+            state.tokens_used += actual_tokens
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Get scheduler statistics per model.
+
+        Returns:
+            Dictionary of model -> queue_depth, users_waiting, granted,
+            mean/p95/max wait seconds, available requests and tokens, and
+            estimated vs actual tokens granted so far
+        """
+        with self._cond:
+            stats = {}
+            for model, state in self._models.items():
+                waits = sorted(state.waits)
+                state.requests._refill()
+                state.tokens._refill()
+                stats[model] = {
+                    'queue_depth': sum(len(tickets) for tickets in state.queues.values()),
+                    'users_waiting': len(state.queues),
+                    'granted': state.granted,
+                    'mean_wait': sum(waits) / len(waits) if waits else 0.0,
+                    'p95_wait': waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    'max_wait': waits[-1] if waits else 0.0,
+                    'requests_available': int(state.requests.tokens),
+                    'tokens_available': int(state.tokens.tokens),
+                    'tokens_estimated': state.tokens_estimated,
+                    'tokens_used': state.tokens_used
+                }
+            return stats
+
+
+_rate_scheduler: Optional[RateScheduler] = None
+_rate_scheduler_lock = threading.Lock()
+
+
+def get_rate_scheduler() -> RateScheduler:
+    """Get the process-wide rate scheduler (created on first use)."""
+    global _rate_scheduler
+
+    if _rate_scheduler is None:
+        with _rate_scheduler_lock:
+            if _rate_scheduler is None:
+                _rate_scheduler = RateScheduler()
+
+    return _rate_scheduler
@@ -0,0 +1,140 @@
+"""
+Relevance Module
+Ranks resume bullets and job description sentences against the JD's terms
+with TF-IDF vectors over the analyzer's vocabulary, so prompts only carry the
+most relevant parts.
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .resume_analyzer import extract_keywords, strip_jd_boilerplate
+from .resume_sections import split_bullet
+
+
+# Extra query weight for technical terms (they carry 60% of the match score)
+TECHNICAL_WEIGHT = 2.0
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?;])\s+')
+
+# Sentences shorter than this are headings or fragments
+MIN_SENTENCE_WORDS = 4
+
+
+def rank_by_relevance(texts: List[str], query_terms: Iterable[str], technical_terms: Iterable[str] = ()) -> List[float]:
+    """
+    Score texts by TF-IDF cosine similarity to a set of query terms.
+
+    Texts are vectorized with the analyzer's keyword extraction (so
+    multi-word technical terms count as one term), with IDF fitted on the
+    texts themselves; terms shared by every text therefore count least.
+
+    Args:
+        texts: Texts to score (bullets, sentences)
+        query_terms: Terms to score against (e.g. JD keywords)
+        technical_terms: Query terms weighted by TECHNICAL_WEIGHT
+
+    Returns:
+        Relevance score per text, in input order
+    """
+    if not texts:
+        return []
+
+    vectorizer = TfidfVectorizer(analyzer=extract_keywords)
+    try:
+        matrix = vectorizer.fit_transform(texts)
+    except ValueError:
+        # No text contains any keyword
+        return [0.0] * len(texts)
+
+    technical_terms = set(technical_terms)
+    vocabulary = vectorizer.vocabulary_
+    query = np.zeros(len(vocabulary))
+    for term in query_terms:
+        column = vocabulary.get(term)
+        if column is not None:
+            query[column] = vectorizer.idf_[column] * (TECHNICAL_WEIGHT if term in technical_terms else 1.0)
+
+    # Rows are L2-normalized, so this is cosine similarity up to the query norm
+    return (matrix @ query).tolist()
+
+
+def top_k_indexes(scores: List[float], k: int) -> List[int]:
+    """Indexes of the k highest scores, in their original order (ties keep the earlier item)."""
+    ranked = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+    return sorted(ranked[:k])
+
+
+def split_jd_sentences(jd_text: str) -> List[str]:
+    """
+    Split a job description into sentences, boilerplate removed.
+
+    Bullet markers are dropped and short heading-like lines are skipped.
+
+    Args:
+        jd_text: Job description text
+
+    Returns:
+        List of sentences in document order
+    """
+    sentences = []
+    for line in strip_jd_boilerplate(jd_text).split('\n'):
+        _, text = split_bullet(line)
+        for sentence in SENTENCE_SPLIT_PATTERN.split(text):
+            sentence = sentence.strip()
+            if len(sentence.split()) >= MIN_SENTENCE_WORDS:
+                sentences.append(sentence)
+    return sentences
+
+
+def select_jd_sentences(jd_text: str, match_analysis: Dict, k: int) -> str:
+    """
+    Reduce a job description to its k most relevant requirement sentences.
+
+    Sentences are ranked by the JD's technical terms and by the JD terms the
+    resume already covers (the ones tailoring can act on); generic wording
+    shared with nothing in the resume carries no weight.
+
+    Args:
+        jd_text: Job description text
+        match_analysis: Match analysis from resume_analyzer
+        k: Number of sentences to keep
+
+    Returns:
+        Selected sentences in original order, one per line (the boilerplate-
+        stripped JD if it has k sentences or fewer)
+    """
+    sentences = split_jd_sentences(jd_text)
+    if len(sentences) <= k:
+        return strip_jd_boilerplate(jd_text)
+
+    technical = match_analysis.get('matched_technical', set()) | match_analysis.get('missing_technical', set())
+    query_terms = technical | match_analysis.get('matched_keywords', set())
+    scores = rank_by_relevance(sentences, query_terms, technical)
+
+    return '\n'.join(f"- {sentences[i]}" for i in top_k_indexes(scores, k))
+
+
+def select_bullets(bullets: List[Dict], match_analysis: Dict, k: int) -> List[Dict]:
+    """
+    Pick the k bullets most related to the job description.
+
+    Args:
+        bullets: Bullets from resume_sections.segment_resume
+        match_analysis: Match analysis from resume_analyzer
+        k: Number of bullets to keep (None keeps all)
+
+    Returns:
+        Selected bullets in document order
+    """
+    if k is None or len(bullets) <= k:
+        return bullets
+
+    technical = match_analysis.get('matched_technical', set()) | match_analysis.get('missing_technical', set())
+    query_terms = match_analysis.get('matched_keywords', set()) | match_analysis.get('missing_keywords', set())
+    scores = rank_by_relevance([bullet['text'] for bullet in bullets], query_terms, technical)
+
+    return [bullets[i] for i in top_k_indexes(scores, k)]
@@ -29,6 +29,65 @@ def clean_text(text: str) -> str:
     return text
 
 
+# Section headings in job descriptions whose content does not describe the role
+JD_BOILERPLATE_HEADINGS = re.compile(
+    r'^\W*(about (us|the company|the team|our company|the organization)|who we are|our (company|mission|values|culture)|'
+    r'benefits|perks|what we offer|compensation|salary|pay range|equal (employment )?opportunity|eeo|'
+    r'diversity|accommodations?|privacy|disclaimer|how to apply|location)\b[^a-z0-9]*$',
+    re.IGNORECASE
+)
+
+# Individual boilerplate lines that may appear anywhere in a job description
+JD_BOILERPLATE_LINES = re.compile(
+    r'equal opportunity employer|without regard to|reasonable accommodation|e-verify|'
+    r'401\(?k\)?|paid time off|\bpto\b|health insurance|\bdental\b|vision insurance|'
+    r'pay range|salary range|base salary|\$\d[\d,]*(\.\d+)?\s*(k|-|to|/)|'
+    r'^\s*(location|work location|job location|job id|req(uisition)? id|posted|date posted)\s*:',
+    re.IGNORECASE
+)
+
+# Role-describing headings that end a boilerplate block
+JD_CONTENT_HEADINGS = re.compile(
+    r'^\W*(responsibilities|requirements|qualifications|what you.ll do|what you will do|'
+    r'the role|role|about the role|skills|experience|preferred|must have|nice to have|duties)\b[^a-z0-9]*$',
+    re.IGNORECASE
+)
+
+
+def strip_jd_boilerplate(jd_text: str) -> str:
+    """
+    Remove boilerplate from a job description (company blurb, benefits,
+    EEO statements, salary and location lines), keeping role content.
+
+    Args:
+        jd_text: Job description text
+
+    Returns:
+        Job description with boilerplate lines and sections removed
+    """
+    kept = []
+    in_boilerplate = False
+
+    for line in jd_text.split('\n'):
+        stripped = line.strip()
+
+        # Short heading-like lines switch boilerplate sections on or off
+        if stripped and len(stripped) <= 60:
+            if JD_CONTENT_HEADINGS.match(stripped):
+                in_boilerplate = False
+            elif JD_BOILERPLATE_HEADINGS.match(stripped):
+                in_boilerplate = True
+                continue
+
+        if in_boilerplate or JD_BOILERPLATE_LINES.search(stripped):
+            continue
+
+        kept.append(line)
+
+    # Collapse the blank runs left behind by removed sections
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+
+
 def extract_technical_keywords(text: str) -> Set[str]:
     """
     Extract technical keywords and skills from text.
@@ -187,13 +246,39 @@ def calculate_match_score(resume_text: str, jd_text: str) -> Dict:
     resume_keywords = extract_keywords(resume_text)
     jd_keywords = extract_keywords(jd_text)
 
-    # Calculate keyword match
-    keyword_match = calculate_keyword_match(resume_keywords, jd_keywords)
-
     # Extract technical keywords specifically
     resume_tech = extract_technical_keywords(resume_text)
     jd_tech = extract_technical_keywords(jd_text)
 
+    # Extract experience requirements
+    experience_reqs = extract_experience_requirements(jd_text)
+
+    return build_match_result(resume_keywords, jd_keywords, resume_tech, jd_tech, experience_reqs)
+
+
+def build_match_result(
+    resume_keywords: Set[str],
+    jd_keywords: Set[str],
+    resume_tech: Set[str],
+    jd_tech: Set[str],
+    experience_reqs: Dict[str, int]
+) -> Dict:
+    """
+    Build the match score dictionary from extracted keyword sets.
+
+    Args:
+        resume_keywords: All keywords from the resume
+        jd_keywords: All keywords from the job description
+        resume_tech: Technical keywords from the resume
+        jd_tech: Technical keywords from the job description
+        experience_reqs: Experience requirements from the job description
+
+    Returns:
+        Dictionary containing match score and details
+    """
+    # Calculate keyword match
+    keyword_match = calculate_keyword_match(resume_keywords, jd_keywords)
+
     # Calculate technical skills match
     if jd_tech:
         tech_match = (len(resume_tech.intersection(jd_tech)) / len(jd_tech)) * 100
@@ -204,9 +289,6 @@ def calculate_match_score(resume_text: str, jd_text: str) -> Dict:
     # Technical skills are weighted more heavily (60%) vs general keywords (40%)
     overall_score = (tech_match * 0.6) + (keyword_match * 0.4)
 
-    # Extract experience requirements
-    experience_reqs = extract_experience_requirements(jd_text)
-
     # Matched and missing keywords
     matched_keywords = resume_keywords.intersection(jd_keywords)
     missing_keywords = jd_keywords - resume_keywords
@@ -230,6 +312,65 @@ def calculate_match_score(resume_text: str, jd_text: str) -> Dict:
     }
 
 
+class IncrementalMatchScorer:
+    """
+    Match scorer that re-scores a resume after line edits without
+    re-analyzing the whole text or the job description.
+
+    Keywords are counted per line, so a multi-word term split across a
+    line break is not recognized (calculate_match_score joins lines first).
+    """
+
+    def __init__(self, resume_text: str, jd_text: str):
+        self.jd_keywords = extract_keywords(jd_text)
+        self.jd_tech = extract_technical_keywords(jd_text)
+        self.experience_reqs = extract_experience_requirements(jd_text)
+        self._keyword_counts = Counter()
+        self._tech_counts = Counter()
+        self._line_terms = {}
+        self.add_lines(resume_text.split('\n'))
+
+    def _terms(self, line: str) -> Tuple[Set[str], Set[str]]:
+        """Get (keywords, technical keywords) for a line, cached by content."""
+        terms = self._line_terms.get(line)
+        if terms is None:
+            terms = (extract_keywords(line), extract_technical_keywords(line))
+            self._line_terms[line] = terms
+        return terms
+
+    def add_lines(self, lines: List[str]) -> None:
+        """Count the keywords of added lines."""
+        for line in lines:
+            keywords, tech = self._terms(line)
+            self._keyword_counts.update(keywords)
+            self._tech_counts.update(tech)
+
+    def remove_lines(self, lines: List[str]) -> None:
+        """Uncount the keywords of removed lines."""
+        for line in lines:
+            keywords, tech = self._terms(line)
+            self._keyword_counts.subtract(keywords)
+            self._tech_counts.subtract(tech)
+
+    def replace_lines(self, old_lines: List[str], new_lines: List[str]) -> None:
+        """Apply an edit that replaced old_lines with new_lines."""
+        self.remove_lines(old_lines)
+        self.add_lines(new_lines)
+
+    def score(self) -> Dict:
+        """
+        Score the current resume text.
+
+        Returns:
+            Dictionary in the same format as calculate_match_score
+        """
+        resume_keywords = {term for term, count in self._keyword_counts.items() if count > 0}
+        resume_tech = {term for term, count in self._tech_counts.items() if count > 0}
+        return build_match_result(
+            resume_keywords, self.jd_keywords, resume_tech, self.jd_tech, self.experience_reqs
+        )
+
+
 def get_match_summary(match_results: Dict) -> str:
     """
     Generate human-readable summary of match results.
@@ -0,0 +1,262 @@
+"""
+Resume Sections Module
+Segments resume text into sections, Experience roles and bullets, with line
+offsets, so individual parts can be edited, compared or re-assembled.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+# Normalized section heading -> canonical section name
+SECTION_HEADINGS = {
+    'summary': 'summary',
+    'professional summary': 'summary',
+    'career summary': 'summary',
+    'executive summary': 'summary',
+    'profile': 'summary',
+    'professional profile': 'summary',
+    'objective': 'summary',
+    'career objective': 'summary',
+    'about me': 'summary',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'core skills': 'skills',
+    'key skills': 'skills',
+    'core competencies': 'skills',
+    'technologies': 'skills',
+    'technical expertise': 'skills',
+    'tools and technologies': 'skills',
+    'experience': 'experience',
+    'professional experience': 'experience',
+    'work experience': 'experience',
+    'relevant experience': 'experience',
+    'employment history': 'experience',
+    'employment': 'experience',
+    'work history': 'experience',
+    'career history': 'experience',
+    'projects': 'projects',
+    'key projects': 'projects',
+    'personal projects': 'projects',
+    'education': 'education',
+    'academic background': 'education',
+    'education and training': 'education',
+    'certifications': 'certifications',
+    'certification': 'certifications',
+    'licenses and certifications': 'certifications',
+    'publications': 'publications',
+    'awards': 'awards',
+    'honors and awards': 'awards',
+    'achievements': 'awards',
+    'patents': 'patents',
+    'languages': 'languages',
+    'volunteer experience': 'volunteer',
+    'volunteering': 'volunteer',
+    'interests': 'interests',
+    'references': 'references',
+}
+
+# Sections whose roles may be rewritten (the rest must be preserved verbatim)
+EXPERIENCE_SECTIONS = {'experience'}
+
+BULLET_PATTERN = re.compile(r'^\s*(?:[•\-\*●▪◦‣■□➢►✓]|\d{1,2}[.)])\s+')
+
+# Labels that continue a role after its bullets rather than starting a new one
+ROLE_TRAILER_PATTERN = re.compile(r'^\s*(environment|tools|technologies|tech stack|stack)\s*[:\-]', re.IGNORECASE)
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+DATE = rf'(?:{MONTH}\s*,?\s*\d{{2,4}}|\d{{1,2}}/\d{{2,4}}|\d{{4}})'
+DATE_RANGE_PATTERN = re.compile(
+    rf'({DATE})\s*(?:-|–|—|to|until)\s*({DATE}|present|current|now|till date|date)',
+    re.IGNORECASE
+)
+
+
+def normalize_heading(line: str) -> str:
+    """Normalize a candidate heading line (lowercase, letters and spaces only)."""
+    text = line.strip().lower().replace('&', ' and ')
+    text = re.sub(r'[^a-z ]', ' ', text)
+    return ' '.join(text.split())
+
+
+def match_section_heading(line: str) -> Optional[str]:
+    """
+    Check whether a line is a section heading.
+
+    Args:
+        line: Resume line
+
+    Returns:
+        Canonical section name, or None if the line is not a heading
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60 or is_bullet(stripped):
+        return None
+
+    return SECTION_HEADINGS.get(normalize_heading(stripped))
+
+
+def is_bullet(line: str) -> bool:
+    """Check whether a line starts with a bullet marker."""
+    return bool(BULLET_PATTERN.match(line))
+
+
+def split_bullet(line: str):
+    """
+    Split a bullet line into its marker prefix and text.
+
+    Returns:
+        Tuple of (prefix including trailing space, bullet text)
+    """
+    match = BULLET_PATTERN.match(line)
+    if not match:
+        return '', line.strip()
+    return line[:match.end()], line[match.end():].strip()
+
+
+def find_date_range(line: str) -> Optional[str]:
+    """Get the date range (e.g. 'Jan 2020 - Present') in a line, if any."""
+    match = DATE_RANGE_PATTERN.search(line)
+    return match.group(0) if match else None
+
+
+def _segment_roles(lines: List[str], start: int, end: int) -> List[Dict]:
+    """
+    Split an Experience section into roles.
+
+    A role is a run of header lines (company, title, dates) followed by
+    bullets and optional trailer lines (e.g. 'Environment: ...'). A
+    non-bullet line after bullets starts a new role, unless it is a trailer
+    line or a lowercase continuation of a wrapped bullet.
+    """
+    roles = []
+    current = None
+
+    for i in range(start, end):
+        line = lines[i]
+        stripped = line.strip()
+
+        if not stripped:
+            continue
+
+        if is_bullet(line):
+            if current is None:
+                current = {'start': i, 'header_end': i, 'bullets': []}
+                roles.append(current)
+            current['bullets'].append({'start': i, 'end': i + 1})
+            current['end'] = i + 1
+            continue
+
+        if current is not None and current['bullets']:
+            last_bullet = current['bullets'][-1]
+            if last_bullet['end'] == i and stripped[0].islower():
+                # Wrapped continuation of the previous bullet
+                last_bullet['end'] = i + 1
+                current['end'] = i + 1
+                continue
+            if ROLE_TRAILER_PATTERN.match(stripped):
+                current['end'] = i + 1
+                continue
+
+        if current is None or current['bullets']:
+            current = {'start': i, 'header_end': i + 1, 'bullets': [], 'end': i + 1}
+            roles.append(current)
+        else:
+            current['header_end'] = i + 1
+            current['end'] = i + 1
+
+    for role in roles:
+        role['header_lines'] = [lines[j] for j in range(role['start'], role['header_end']) if lines[j].strip()]
+        role['dates'] = next(
+            (find_date_range(line) for line in role['header_lines'] if find_date_range(line)), None
+        )
+        for bullet in role['bullets']:
+            prefix, text = split_bullet(lines[bullet['start']])
+            continuation = [lines[j].strip() for j in range(bullet['start'] + 1, bullet['end'])]
+            bullet['prefix'] = prefix
+            bullet['text'] = ' '.join([text] + continuation).strip()
+
+    return roles
+
+
+def segment_resume(resume_text: str) -> Dict:
+    """
+    Segment a resume into sections and Experience roles.
+
+    Line offsets are half-open ranges into resume_text.split('\\n').
+
+    Args:
+        resume_text: Resume text
+
+    Returns:
+        Dictionary with 'lines', 'sections' (each with name, title, start,
+        end) and 'roles' (roles of the first Experience section, most
+        recent first, each with header_lines, dates and bullets)
+    """
+    lines = resume_text.split('\n')
+    sections = []
+    current = {'name': 'header', 'title': '', 'start': 0}
+
+    for i, line in enumerate(lines):
+        name = match_section_heading(line)
+        if name is None:
+            continue
+        current['end'] = i
+        sections.append(current)
+        current = {'name': name, 'title': line.strip(), 'start': i}
+
+    current['end'] = len(lines)
+    sections.append(current)
+
+    # Drop an empty leading header block (resume starting with a heading)
+    if len(sections) > 1 and sections[0]['name'] == 'header' and not any(line.strip() for line in lines[:sections[0]['end']]):
+        sections.pop(0)
+
+    roles = []
+    for section in sections:
+        if section['name'] in EXPERIENCE_SECTIONS:
+            roles = _segment_roles(lines, section['start'] + 1, section['end'])
+            break
+
+    return {
+        'lines': lines,
+        'sections': sections,
+        'roles': roles
+    }
+
+
+def get_editable_roles(structure: Dict, max_projects: int) -> List[Dict]:
+    """Get the most recent max_projects roles (the only ones tailoring may change)."""
+    return structure['roles'][:max_projects]
+
+
+def get_editable_bullets(structure: Dict, max_projects: int) -> List[Dict]:
+    """Get every bullet of the editable roles, in document order."""
+    return [bullet for role in get_editable_roles(structure, max_projects) for bullet in role['bullets']]
+
+
+def replace_bullets(resume_text: str, replacements: Dict[int, str]) -> str:
+    """
+    Replace bullets in resume text, keeping each bullet's marker.
+
+    Args:
+        resume_text: Resume text
+        replacements: Mapping of bullet start line -> new bullet text. The
+            bullet's full line range (including wrapped lines) is replaced
+            by a single line.
+
+    Returns:
+        Resume text with the bullets replaced
+    """
+    structure = segment_resume(resume_text)
+    lines = structure['lines']
+    bullets = {bullet['start']: bullet for role in structure['roles'] for bullet in role['bullets']}
+
+    # Splice from the bottom up so earlier line offsets stay valid
+    for start in sorted(replacements, reverse=True):
+        bullet = bullets.get(start)
+        if bullet is None:
+            continue
+        lines[bullet['start']:bullet['end']] = [bullet['prefix'] + replacements[start].strip()]
+
+    return '\n'.join(lines)
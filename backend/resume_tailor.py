@@ -4,27 +4,151 @@ Uses LLM (via OpenRouter) to intelligently tailor resume content to job descript
 Preserves dates and structure while optimizing bullet points.
 """
 
+import hashlib
 import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Dict, List, Tuple
 from openai import OpenAI
 import config
+from . import llm_client
+from .balance_cache import get_balance_cache
+from .deadline import Deadline, DeadlineExceeded
+from .hedging import choose_fallback_model, hedge_delay, latency_tracker, run_hedged
+from .jd_similarity import get_jd_index
+from .output_repair import cut_before_violation, repair_resume, salvageable
+from .output_validator import IncrementalValidator
+from .rate_limiter import get_rate_scheduler
+from .relevance import select_bullets, select_jd_sentences
+from .resume_analyzer import IncrementalMatchScorer, strip_jd_boilerplate
+from .resume_sections import get_editable_bullets, get_editable_roles, replace_bullets, segment_resume
+from .single_flight import get_single_flight
+from .token_budget import (
+    estimate_completion_tokens,
+    estimate_latency,
+    estimate_messages_tokens,
+    estimate_tokens,
+    record_usage
+)
+
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "You are an expert resume writer with deep knowledge of ATS systems and recruitment best practices. "
+    "CRITICAL: Output ONLY the clean, professional resume document starting with the candidate's name. "
+    "Do NOT include any meta-text, preambles, or explanations. Start directly with resume content. "
+    "NEVER use placeholders like '[PRESERVED]' or '[ORIGINAL SECTION]' - output the COMPLETE actual content. "
+    "Copy all preserved sections word-for-word including Technical Skills (all categories), Education (complete details), "
+    "and older Experience roles (all bullets). Maintain exact formatting and capitalization. "
+    "The output must be a COMPLETE resume ready to send to recruiters with no additional editing needed."
+)
+
+CONTINUATION_PROMPT = (
+    "Your previous response was cut off. Continue the resume exactly from the line after the last "
+    "line you wrote. Do NOT repeat any earlier lines and do NOT add any preamble or explanation. "
+    "Finish the remaining resume content, then the ---TAILORING SUMMARY--- section."
+)
+
+# Appended to the prompt when a generation aborted by streaming validation is retried
+VALIDATION_RETRY_NOTE = (
+    "\n\nIMPORTANT: A previous answer was rejected because it contained {violation!r}. "
+    "Write out every section and every role in full. Never use placeholders or notes in place of content."
+)
+
+# Summary of an output cut off by streaming validation (its own summary never arrived)
+ABORTED_SUMMARY = (
+    "Tailoring summary not available: generation was stopped early at a placeholder and "
+    "the rest of the resume was restored from the original."
+)
+CUT_SUMMARY = (
+    "Tailoring summary not available: generation was stopped early at a placeholder and "
+    "the resume ends where it stopped."
+)
+
+TAILORING_EXAMPLES = """**EXAMPLES OF CORRECT TAILORING:**
+
+Example 1 - Adding existing tech:
+Original: "Developed data pipelines using Python and SQL"
+JD requires: Snowflake, Databricks, PySpark
+IF resume has these: "Developed data pipelines using Python, PySpark, and SQL with Snowflake and Databricks"
+IF resume doesn't: "Developed scalable data pipelines using Python and SQL" (emphasize scale, don't add tech)
+
+Example 2 - Preserving action verbs:
+Original: "Designed and delivered BCAMS system processing 400M+ rows"
+CORRECT: "Designed and delivered BCAMS system processing 400M+ rows using Snowflake and Snowpark"
+WRONG: "Architected and scaled BCAMS system..." (changes "Designed" to "Architected" - NOT ALLOWED)
+
+Example 3 - No leadership inflation:
+Original: "Developed probabilistic matching engine in Python"
+CORRECT: "Developed probabilistic matching engine in Python with automated training pipelines"
+WRONG: "Led development of probabilistic matching engine..." (adds "Led" when not in original - NOT ALLOWED)
+
+"""
+
+# Prompt compaction steps, applied in order until the quote fits the budget
+PROMPT_COMPACTION_STEPS = [
+    ({'trim_jd': True}, 'Trimmed job description boilerplate'),
+    ({'jd_top_sentences': config.RELEVANCE_COMPACT_JD_SENTENCES},
+     f'Kept the {config.RELEVANCE_COMPACT_JD_SENTENCES} most relevant job description sentences'),
+    ({'include_examples': False}, 'Dropped worked tailoring examples'),
+]
+
+# "[n] bullet text" lines in a delta-round response
+DELTA_BULLET_PATTERN = re.compile(r'^\s*\[(\d+)\]\s*(.*?)\s*$')
+
+# Fields of a run_completion result that hold generated text rather than accounting data
+CALL_TEXT_FIELDS = {'content', 'tailored_resume', 'summary'}
+
+# Rule-based terminology rewrites for the instant preview: (JD term, resume
+# phrase pattern, replacement, resume technical terms of which at least one
+# must be present). A rule fires only when the JD uses the term, the resume
+# lacks it, and an editable bullet already describes the same concept.
+TERMINOLOGY_RULES = [
+    ('mlops', r'\b(?:ML|machine learning) pipeline(s?)\b', r'MLOps pipeline\1', None),
+    ('mlops', r'\bmodel deployment(s?)\b', r'MLOps model deployment\1', None),
+    ('machine learning', r'(?<![(.\w])(?-i:ML)\b(?!\s*(?:pipeline|ops))', 'machine learning (ML)', None),
+    ('devops', r'\b(?:build and deployment|deployment|release) pipeline(s?)\b', r'DevOps deployment pipeline\1',
+     {'jenkins', 'gitlab', 'github', 'circleci', 'docker', 'terraform'}),
+    ('microservices', r'\bmicro[- ]services\b', 'microservices', None),
+    ('rest api', r'\brest(?:ful)? (?:apis?|services|web services)\b', 'REST APIs', None),
+    ('postgresql', r'\bpostgres\b', 'PostgreSQL', None),
+    ('kubernetes', r'\bk8s\b', 'Kubernetes', None),
+    ('aws', r'\bamazon web services\b', 'AWS', None),
+    ('gcp', r'\bgoogle cloud(?: platform)?\b(?! \()', 'Google Cloud (GCP)', None),
+    ('nlp', r'\bnatural language processing\b(?! \()', 'natural language processing (NLP)', None),
+    ('genai', r'\bgenerative ai\b(?! \()', 'Generative AI (GenAI)', None),
+    ('llm', r'\blarge language models?\b(?! \()', 'large language models (LLMs)', None),
+    ('scikit-learn', r'\bsklearn\b', 'scikit-learn', None),
+    ('javascript', r'(?<![.\w])(?-i:JS)\b', 'JavaScript', None),
+    ('tdd', r'\btest[- ]driven development\b(?! \()', 'test-driven development (TDD)', None),
+    ('agile', r'(?<!agile )\bsprint(s?)\b', r'Agile sprint\1', None),
+    ('spark', r'\bpyspark\b(?! \()', 'PySpark (Spark)', None),
+    ('analytics', r'\bdata analysis\b', 'data analytics', None),
+    ('big_data', r'\blarge[- ]scale data\b', 'big data', None),
+]
+COMPILED_TERMINOLOGY_RULES = [
+    (term, re.compile(pattern, re.IGNORECASE), replacement, requires)
+    for term, pattern, replacement, requires in TERMINOLOGY_RULES
+]
 
 
 def get_openrouter_client() -> OpenAI:
     """
-    Initialize OpenRouter client using OpenAI SDK.
+    Get the shared OpenRouter client using OpenAI SDK.
+
+    The client (and its pooled keep-alive transport) is created once per
+    process, so repeated calls do not pay connection setup again.
 
     Returns:
         OpenAI client configured for OpenRouter
     """
-    config.validate_config()
-
-    client = OpenAI(
-        base_url=config.OPENROUTER_BASE_URL,
-        api_key=config.OPENROUTER_API_KEY,
-    )
-
-    return client
+    return llm_client.get_client()
 
 
 def get_account_balance() -> Dict:
@@ -34,8 +158,6 @@ def get_account_balance() -> Dict:
     Returns:
         Dictionary with balance information or error
     """
-    import requests
-
     try:
         config.validate_config()
 
@@ -44,10 +166,9 @@ def get_account_balance() -> Dict:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(
-            "https://openrouter.ai/api/v1/auth/key",
-            headers=headers,
-            timeout=10
+        response = llm_client.http_get(
+            f"{config.OPENROUTER_BASE_URL}/auth/key",
+            headers=headers
         )
 
         if response.status_code == 200:
@@ -76,7 +197,10 @@ def create_tailoring_prompt(
     resume_text: str,
     jd_text: str,
     match_analysis: Dict,
-    max_projects: int = 2
+    max_projects: int = 2,
+    include_examples: bool = True,
+    trim_jd: bool = False,
+    jd_top_sentences: int = None
 ) -> str:
     """
     Create detailed prompt for LLM to tailor resume.
@@ -86,6 +210,11 @@ def create_tailoring_prompt(
         jd_text: Job description text
         match_analysis: Match analysis results from resume_analyzer
         max_projects: Maximum number of recent projects to tailor
+        include_examples: Include the worked tailoring examples
+        trim_jd: Strip boilerplate (benefits, EEO, company blurb) from the JD,
+            before jd_top_sentences ranks it
+        jd_top_sentences: Include only this many of the most relevant JD
+            sentences (None includes the whole JD)
 
     Returns:
         Formatted prompt string
@@ -97,6 +226,13 @@ def create_tailoring_prompt(
     if experience_reqs:
         exp_req_text = "\n".join([f"  - {skill}: {years} years" for skill, years in list(experience_reqs.items())[:5]])
 
+    if trim_jd:
+        jd_text = strip_jd_boilerplate(jd_text)
+    if jd_top_sentences:
+        jd_text = select_jd_sentences(jd_text, match_analysis, jd_top_sentences)
+
+    examples_text = TAILORING_EXAMPLES if include_examples else ''
+
     prompt = f"""You are an expert resume writer. Your task is to output a COMPLETE resume with ALL sections included.
 
 **ORIGINAL RESUME:**
@@ -159,25 +295,7 @@ Create a tailored resume by COPYING THE ENTIRE ORIGINAL RESUME and modifying ONL
 6. **PRESERVE ACTION VERBS**: If original says "Designed", keep "Designed" - do NOT change to "Architected"
 7. **NO TITLE INFLATION**: If original doesn't say "Led" or "Architected", do NOT add leadership claims - use "Developed", "Implemented", "Built", "Created" instead
 
-**EXAMPLES OF CORRECT TAILORING:**
-
-Example 1 - Adding existing tech:
-Original: "Developed data pipelines using Python and SQL"
-JD requires: Snowflake, Databricks, PySpark
-IF resume has these: "Developed data pipelines using Python, PySpark, and SQL with Snowflake and Databricks"
-IF resume doesn't: "Developed scalable data pipelines using Python and SQL" (emphasize scale, don't add tech)
-
-Example 2 - Preserving action verbs:
-Original: "Designed and delivered BCAMS system processing 400M+ rows"
-CORRECT: "Designed and delivered BCAMS system processing 400M+ rows using Snowflake and Snowpark"
-WRONG: "Architected and scaled BCAMS system..." (changes "Designed" to "Architected" - NOT ALLOWED)
-
-Example 3 - No leadership inflation:
-Original: "Developed probabilistic matching engine in Python"
-CORRECT: "Developed probabilistic matching engine in Python with automated training pipelines"
-WRONG: "Led development of probabilistic matching engine..." (adds "Led" when not in original - NOT ALLOWED)
-
-**CRITICAL: SECTIONS TO NEVER TOUCH:**
+{examples_text}**CRITICAL: SECTIONS TO NEVER TOUCH:**
 - Professional Summary / Objective (keep 100% as-is)
 - Technical Skills / Skills (keep 100% as-is)
 - Education (keep 100% as-is)
@@ -287,12 +405,438 @@ def parse_llm_response(response_text: str) -> Tuple[str, str]:
     return tailored_resume, summary
 
 
-def tailor_resume(
+def prompt_hash(model: str, messages: List[Dict], **params) -> str:
+    """
+    Hash a request (model, messages and generation parameters).
+
+    Args:
+        model: Model ID
+        messages: Chat messages
+        **params: Other parameters that change the output (e.g. max_tokens)
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    payload = json.dumps({'model': model, 'messages': messages, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_messages(prompt: str) -> List[Dict]:
+    """
+    Build the chat messages for a tailoring request.
+
+    Args:
+        prompt: User prompt from create_tailoring_prompt
+
+    Returns:
+        List of chat message dictionaries
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def run_completion(
+    model: str,
+    messages: List[Dict],
+    max_tokens: int,
+    cancel_token: llm_client.CancelToken = None,
+    first_token_event: threading.Event = None,
+    resume_text: str = None,
+    deadline: Deadline = None,
+    user: str = None,
+    validator: IncrementalValidator = None
+) -> Dict:
+    """
+    Run one streaming chat completion and collect the result.
+
+    When config.RATE_LIMITING_ENABLED, the call first waits its turn in the
+    rate scheduler (estimated as prompt tokens plus max_tokens) and the
+    estimate is corrected from the reported usage afterwards.
+
+    Args:
+        model: Model ID
+        messages: Chat messages
+        max_tokens: Completion token limit
+        cancel_token: Optional token that aborts the stream when cancelled
+        first_token_event: Optional event set when the first token arrives
+        resume_text: Original resume when the completion is a full tailored
+            resume (used to calibrate completion size estimates)
+        deadline: Optional request deadline; the call is cancelled (and its
+            partial output returned) when it passes
+        user: Caller identity for fair queuing in the rate scheduler
+        validator: Optional streaming validator fed every delta; the call is
+            cancelled (reason 'validation') as soon as it reports a violation
+
+    Returns:
+        Dictionary with content, finish_reason, usage_info, latencies,
+        rate-limit wait, whether the call was cancelled and the validator's
+        violation, if any
+    """
+    client = get_openrouter_client()
+
+    if deadline is not None:
+        deadline.check('llm')
+    if (deadline is not None or validator is not None) and cancel_token is None:
+        cancel_token = llm_client.CancelToken()
+
+    # A call that fails before reporting usage is assumed to have billed its prompt
+    used_tokens = estimate_messages_tokens(messages, model)
+    ticket = None
+    if config.RATE_LIMITING_ENABLED:
+        ticket = get_rate_scheduler().acquire(model, used_tokens + max_tokens, user=user, deadline=deadline,
+                                             cancel_token=cancel_token)
+        if ticket is None:
+            # Cancelled while queued (e.g. a hedge that lost): nothing was sent
+            return {
+                'success': False,
+                'model': model,
+                'content': '',
+                'finish_reason': None,
+                'usage_info': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                'estimated_usage': False,
+                'first_token_latency': None,
+                'latency': 0.0,
+                'rate_limit_wait': 0.0,
+                'cancelled': True,
+                'cancel_reason': cancel_token.reason,
+                'violation': None
+            }
+
+    started = time.monotonic()
+    watch = deadline.watch(cancel_token) if deadline is not None else nullcontext()
+
+    try:
+        with watch:
+            stream = llm_client.call_with_retries(
+                client.chat.completions.create,
+                model=model,
+                messages=messages,
+                temperature=0.3,  # Lower temperature for more deterministic, less "creative" output
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+                deadline=deadline
+            )
+            if cancel_token is not None:
+                cancel_token.bind(stream)
+
+            chunks = []
+            finish_reason = None
+            usage = None
+            first_token_latency = None
+
+            try:
+                for chunk in stream:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        break
+                    if getattr(chunk, 'usage', None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    delta = choice.delta.content if choice.delta else None
+                    if delta:
+                        if first_token_latency is None:
+                            first_token_latency = time.monotonic() - started
+                            if first_token_event is not None:
+                                first_token_event.set()
+                        chunks.append(delta)
+                        if validator is not None and validator.feed(delta):
+                            # Doomed output: stop paying for it
+                            cancel_token.cancel('validation')
+                            break
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+            except Exception:
+                # Closing the stream from another thread surfaces as a read error
+                if cancel_token is None or not cancel_token.cancelled:
+                    raise
+            finally:
+                stream.close()
+
+        content = ''.join(chunks)
+        latency = time.monotonic() - started
+        cancelled = cancel_token is not None and cancel_token.cancelled
+
+        if usage is not None:
+            usage_info = {
+                'prompt_tokens': usage.prompt_tokens,
+                'completion_tokens': usage.completion_tokens,
+                'total_tokens': usage.total_tokens
+            }
+            estimated_usage = False
+        else:
+            # Cancelled streams never receive the final usage chunk
+            prompt_tokens = estimate_messages_tokens(messages, model)
+            completion_tokens = estimate_tokens(content, model)
+            usage_info = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+            estimated_usage = True
+        used_tokens = usage_info['total_tokens']
+    finally:
+        if ticket is not None:
+            get_rate_scheduler().settle(ticket, used_tokens)
+
+    if not cancelled:
+        latency_tracker.record(model, first_token_latency, latency)
+        if not estimated_usage:
+            generation_seconds = latency - first_token_latency if first_token_latency is not None else None
+            record_usage(model, messages, usage_info, resume_text, generation_seconds, finish_reason)
+
+    return {
+        'success': not cancelled,
+        'model': model,
+        'content': content,
+        'finish_reason': finish_reason,
+        'usage_info': usage_info,
+        'estimated_usage': estimated_usage,
+        'first_token_latency': first_token_latency,
+        'latency': latency,
+        'rate_limit_wait': ticket.wait_seconds if ticket is not None else 0.0,
+        'cancelled': cancelled,
+        'cancel_reason': cancel_token.reason if cancelled else None,
+        'violation': validator.violation if validator is not None else None
+    }
+
+
+def summarize_call(call: Dict, **extra) -> Dict:
+    """
+    Strip generated text from a run_completion result for call accounting.
+
+    Args:
+        call: Result of run_completion
+        **extra: Additional fields to record (e.g. role='hedge')
+
+    Returns:
+        Dictionary with model, usage and latency fields only
+    """
+    record = {key: value for key, value in call.items() if key not in CALL_TEXT_FIELDS}
+    record.update(extra)
+    return record
+
+
+def combine_usage(calls: List[Dict]) -> Dict:
+    """
+    Sum token usage over every LLM call made for one tailoring.
+
+    Args:
+        calls: Call records (each with a usage_info dictionary)
+
+    Returns:
+        Dictionary with prompt_tokens, completion_tokens, total_tokens
+    """
+    totals = {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+    for call in calls:
+        for key in totals:
+            totals[key] += (call.get('usage_info') or {}).get(key) or 0
+    return totals
+
+
+def completion_token_budget(resume_text: str, model: str = None) -> int:
+    """
+    Size max_tokens for a full-resume completion from the input length.
+
+    The tailored resume is roughly as long as the original, plus the
+    tailoring summary; the result is clamped to the configured range.
+
+    Args:
+        resume_text: Original resume text
+        model: Model ID (estimates are calibrated per model family)
+
+    Returns:
+        max_tokens to request
+    """
+    budget = estimate_completion_tokens(resume_text, model)
+    return max(config.MIN_COMPLETION_TOKENS, min(config.MAX_COMPLETION_TOKENS, budget))
+
+
+def quote_tailoring(
+    resume_text: str,
+    jd_text: str,
+    match_analysis: Dict,
+    model: str = None,
+    max_projects: int = 2,
+    prompt_options: Dict = None
+) -> Dict:
+    """
+    Pre-flight quote for a tailoring call, computed offline.
+
+    Args:
+        resume_text: Original resume text
+        jd_text: Job description text
+        match_analysis: Match analysis results
+        model: LLM model to use (defaults to config.DEFAULT_MODEL)
+        max_projects: Number of recent projects to tailor
+        prompt_options: Extra create_tailoring_prompt options (compaction)
+
+    Returns:
+        Dictionary with prompt_tokens, completion_tokens, estimated_cost,
+        expected_latency and the prompt options used
+    """
+    if model is None:
+        model = config.DEFAULT_MODEL
+    prompt_options = prompt_options or {}
+
+    prompt = create_tailoring_prompt(resume_text, jd_text, match_analysis, max_projects, **prompt_options)
+    prompt_tokens = estimate_messages_tokens(build_messages(prompt), model)
+    completion_tokens = min(estimate_completion_tokens(resume_text, model), config.MAX_COMPLETION_TOKENS)
+
+    cost = calculate_estimated_cost(model, {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens
+    })
+
+    return {
+        'model': model,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+        'estimated_cost': cost.get('estimated_cost'),
+        'expected_latency': round(estimate_latency(model, completion_tokens), 1),
+        'prompt_options': prompt_options,
+        'compactions': []
+    }
+
+
+def within_budget(quote: Dict) -> bool:
+    """Check a quote against config.PROMPT_TOKEN_BUDGET and config.COST_BUDGET_PER_RESUME."""
+    if config.PROMPT_TOKEN_BUDGET and quote['prompt_tokens'] > config.PROMPT_TOKEN_BUDGET:
+        return False
+    if (config.COST_BUDGET_PER_RESUME and quote['estimated_cost'] is not None
+            and quote['estimated_cost'] > config.COST_BUDGET_PER_RESUME):
+        return False
+    return True
+
+
+def plan_tailoring(
     resume_text: str,
     jd_text: str,
     match_analysis: Dict,
     model: str = None,
     max_projects: int = 2
+) -> Dict:
+    """
+    Quote a tailoring call, compacting the prompt until it fits the budget.
+
+    The JD is first reduced to its config.RELEVANCE_TOP_JD_SENTENCES most
+    relevant sentences. Compaction steps from PROMPT_COMPACTION_STEPS are
+    then applied cumulatively (trim JD boilerplate, keep fewer JD sentences,
+    then drop the worked examples) until the quote is within the configured
+    token and cost budgets. A step is kept, and listed, only if it made the
+    prompt smaller.
+
+    Returns:
+        Quote dictionary (see quote_tailoring) with 'compactions' listing the
+        steps applied (with the prompt tokens each saved) and 'within_budget'
+        telling whether it fits
+    """
+    prompt_options = {}
+    if config.RELEVANCE_TOP_JD_SENTENCES:
+        prompt_options['jd_top_sentences'] = config.RELEVANCE_TOP_JD_SENTENCES
+    quote = quote_tailoring(resume_text, jd_text, match_analysis, model, max_projects, dict(prompt_options))
+    compactions = []
+
+    for options, description in PROMPT_COMPACTION_STEPS:
+        if within_budget(quote):
+            break
+        candidate = quote_tailoring(resume_text, jd_text, match_analysis, model, max_projects,
+                                    dict(prompt_options, **options))
+        saved = quote['prompt_tokens'] - candidate['prompt_tokens']
+        if saved > 0:
+            prompt_options.update(options)
+            compactions.append(f"{description} (~{saved:,} tokens)")
+            quote = candidate
+
+    quote['compactions'] = compactions
+    quote['within_budget'] = within_budget(quote)
+    return quote
+
+
+def continue_truncated(
+    model: str,
+    messages: List[Dict],
+    content: str,
+    expected_tokens: int,
+    calls: List[Dict],
+    deadline: Deadline = None,
+    user: str = None
+) -> Tuple[str, str]:
+    """
+    Finish a completion that stopped at max_tokens (finish_reason 'length').
+
+    The partial output is cut back to its last complete line and the model is
+    asked to continue from the next line; the pieces are stitched together.
+    Each continuation is appended to calls for cost accounting.
+
+    Args:
+        model: Model that produced the partial output
+        messages: Original chat messages
+        content: Partial completion text
+        expected_tokens: Expected size of the complete output in tokens
+        calls: Call records to append continuation calls to
+        deadline: Optional request deadline; no continuation is started
+            after it passes and the output is left truncated
+        user: Caller identity for the rate scheduler
+
+    Returns:
+        Tuple of (stitched content, final finish_reason)
+    """
+    finish_reason = 'length'
+
+    for _ in range(config.MAX_CONTINUATIONS):
+        if deadline is not None and deadline.expired:
+            break
+
+        # Drop the partial last line so the model restarts on a line boundary
+        last_newline = content.rfind('\n')
+        if last_newline != -1:
+            content = content[:last_newline + 1]
+        last_line = content.rstrip('\n').rsplit('\n', 1)[-1].strip()
+
+        remaining = expected_tokens - estimate_tokens(content, model)
+        max_tokens = max(config.CONTINUATION_MIN_TOKENS, min(config.MAX_COMPLETION_TOKENS, remaining))
+
+        continuation_messages = messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": CONTINUATION_PROMPT}
+        ]
+        call = run_completion(model, continuation_messages, max_tokens, deadline=deadline, user=user)
+        calls.append(summarize_call(call, role='continuation', won=True))
+        if call['cancelled']:
+            # Cut off by the deadline: keep what arrived, still truncated
+            content += call['content']
+            break
+
+        continuation = call['content'].lstrip('\n')
+        # Models sometimes repeat the last line they were shown; drop it
+        first_line, _, rest = continuation.partition('\n')
+        if last_line and first_line.strip() == last_line:
+            continuation = rest
+
+        content += continuation
+        finish_reason = call['finish_reason']
+        if finish_reason != 'length':
+            break
+
+    return content, finish_reason
+
+
+def tailor_resume(
+    resume_text: str,
+    jd_text: str,
+    match_analysis: Dict,
+    model: str = None,
+    max_projects: int = 2,
+    hedge: bool = None,
+    deadline: Deadline = None,
+    user: str = None
 ) -> Dict:
     """
     Tailor resume to job description using LLM.
@@ -303,88 +847,496 @@ def tailor_resume(
         match_analysis: Match analysis results
         model: LLM model to use (defaults to config.DEFAULT_MODEL)
         max_projects: Number of recent projects to tailor
+        hedge: Fire the request at a fallback model if the primary is slow
+            (defaults to config.HEDGING_ENABLED)
+        deadline: Optional request deadline. If it passes during the call,
+            the call is cancelled and a failure with status
+            'deadline_exceeded' (and any partial output) is returned; if it
+            passes during continuation, the truncated result is returned.
+        user: Caller identity for fair queuing in the rate scheduler
 
     Returns:
         Dictionary with tailored resume and metadata
     """
     if model is None:
         model = config.DEFAULT_MODEL
+    if hedge is None:
+        hedge = config.HEDGING_ENABLED
 
-    # Create client
-    client = get_openrouter_client()
+    # Pre-flight quote; the prompt is compacted if it would exceed the budget
+    quote = plan_tailoring(resume_text, jd_text, match_analysis, model, max_projects)
 
     # Create prompt
-    prompt = create_tailoring_prompt(resume_text, jd_text, match_analysis, max_projects)
-
-    try:
-        # Call LLM
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert resume writer with deep knowledge of ATS systems and recruitment best practices. "
-                               "CRITICAL: Output ONLY the clean, professional resume document starting with the candidate's name. "
-                               "Do NOT include any meta-text, preambles, or explanations. Start directly with resume content. "
-                               "NEVER use placeholders like '[PRESERVED]' or '[ORIGINAL SECTION]' - output the COMPLETE actual content. "
-                               "Copy all preserved sections word-for-word including Technical Skills (all categories), Education (complete details), "
-                               "and older Experience roles (all bullets). Maintain exact formatting and capitalization. "
-                               "The output must be a COMPLETE resume ready to send to recruiters with no additional editing needed."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,  # Lower temperature for more deterministic, less "creative" output
-            max_tokens=6000  # Higher token limit for complete resume with all sections
-        )
-
-        # Extract response
-        response_text = response.choices[0].message.content
+    prompt = create_tailoring_prompt(resume_text, jd_text, match_analysis, max_projects, **quote['prompt_options'])
+    messages = build_messages(prompt)
+    # Sized from the resume; truncated output is continued rather than regenerated
+    max_tokens = completion_token_budget(resume_text, model)
+
+    def stream_validator():
+        return IncrementalValidator() if config.STREAM_VALIDATION_ENABLED else None
+
+    def run_tailoring() -> Dict:
+        if hedge:
+            from .output_validator import validate_resume_sections
+
+            def attempt(attempt_model, cancel_token, first_token_event):
+                call = run_completion(attempt_model, messages, max_tokens, cancel_token, first_token_event,
+                                      resume_text=resume_text, deadline=deadline, user=user,
+                                      validator=stream_validator())
+                call['tailored_resume'], call['summary'] = parse_llm_response(call['content'])
+                return call
+
+            hedge_result = run_hedged(
+                attempt,
+                model,
+                choose_fallback_model(model),
+                hedge_delay(model),
+                is_valid=lambda call: validate_resume_sections(
+                    call['tailored_resume'], resume_text, max_projects
+                )['valid']
+            )
+            winner = hedge_result['winner']
+            for call in hedge_result['attempts']:
+                if 'usage_info' not in call:
+                    # Abandoned before the stream opened: the prompt was still billed
+                    prompt_tokens = estimate_messages_tokens(messages, call['model'])
+                    call['usage_info'] = {'prompt_tokens': prompt_tokens, 'completion_tokens': 0,
+                                          'total_tokens': prompt_tokens}
+                    call['estimated_usage'] = True
+            calls = [
+                summarize_call(call, role='primary' if call.get('model') == model else 'hedge',
+                               won=winner is not None and call is winner)
+                for call in hedge_result['attempts']
+            ]
+            if winner is None:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded('llm')
+                # Every attempt was aborted by streaming validation: salvage one below
+                winner = next((call for call in hedge_result['attempts']
+                               if call.get('cancel_reason') == 'validation'), None)
+            if winner is None:
+                errors = [call.get('error') for call in hedge_result['attempts'] if call.get('error')]
+                raise RuntimeError(errors[0] if errors else 'All hedged requests failed')
+            hedged = hedge_result['hedged']
+        else:
+            winner = run_completion(model, messages, max_tokens, resume_text=resume_text, deadline=deadline,
+                                    user=user, validator=stream_validator())
+            calls = [summarize_call(winner, role='primary', won=True)]
+            hedged = False
+            if winner['cancelled'] and winner['cancel_reason'] != 'validation':
+                raise DeadlineExceeded('llm', partial=winner['content'])
+
+        # An aborted output is repaired if every editable role arrived before the
+        # violation (and repair is on); otherwise it is regenerated with a warning
+        # in the prompt
+        retries = 0
+        while winner.get('cancel_reason') == 'validation' and retries < config.STREAM_VALIDATION_RETRIES:
+            if config.OUTPUT_REPAIR_ENABLED and salvageable(resume_text, cut_before_violation(winner['content'], winner['violation']), max_projects):
+                break
+            retries += 1
+            retry_messages = messages[:-1] + [{
+                "role": "user",
+                "content": messages[-1]['content'] + VALIDATION_RETRY_NOTE.format(violation=winner['violation']['text'])
+            }]
+            winner = run_completion(winner['model'], retry_messages, max_tokens, resume_text=resume_text,
+                                    deadline=deadline, user=user, validator=stream_validator())
+            for call in calls:
+                call['won'] = False
+            calls.append(summarize_call(winner, role='retry', won=True))
+            if winner['cancelled'] and winner['cancel_reason'] != 'validation':
+                raise DeadlineExceeded('llm', partial=winner['content'])
+
+        content = winner['content']
+        finish_reason = winner['finish_reason']
+        repairs = []
+        aborted = winner.get('cancel_reason') == 'validation'
+        if aborted:
+            cut = cut_before_violation(content, winner['violation'])
+            repairs = [f"Stopped generation early at {winner['violation']['text'][:60]!r}"]
+            if config.OUTPUT_REPAIR_ENABLED:
+                repair = repair_resume(resume_text, cut, max_projects)
+                tailored_resume, summary = repair['tailored_resume'], ABORTED_SUMMARY
+                repairs += repair['repairs']
+                partial = bool(repair['roles_kept'])
+            else:
+                # Repair is off: return the output as far as it got
+                tailored_resume, summary = parse_llm_response(cut)[0], CUT_SUMMARY
+                partial = True
+            finish_reason = 'validation'
+        else:
+            if finish_reason == 'length':
+                content, finish_reason = continue_truncated(
+                    winner['model'], messages, content, max_tokens, calls, deadline, user
+                )
 
-        # Parse response
-        tailored_resume, summary = parse_llm_response(response_text)
+            # Parse response
+            tailored_resume, summary = parse_llm_response(content)
+            partial = finish_reason == 'length'
 
-        # Calculate detailed token usage and cost
-        usage_info = {}
-        if hasattr(response, 'usage'):
-            usage_info = {
-                'prompt_tokens': response.usage.prompt_tokens,
-                'completion_tokens': response.usage.completion_tokens,
-                'total_tokens': response.usage.total_tokens
-            }
+        # Token usage across every call (including a cancelled hedge)
+        usage_info = combine_usage(calls)
 
         return {
             'success': True,
             'tailored_resume': tailored_resume,
             'summary': summary,
-            'model_used': model,
+            'model_used': winner['model'],
             'original_match_score': match_analysis.get('overall_score', 0),
-            'tokens_used': response.usage.total_tokens if hasattr(response, 'usage') else None,
-            'usage_info': usage_info
+            'tokens_used': usage_info['total_tokens'],
+            'usage_info': usage_info,
+            'finish_reason': finish_reason,
+            'truncated': finish_reason == 'length',
+            'continuations': sum(1 for call in calls if call.get('role') == 'continuation'),
+            'hedged': hedged,
+            'calls': calls,
+            'quote': quote,
+            'aborted': aborted,
+            'repairs': repairs,
+            'status': 'partial' if partial else 'complete'
         }
 
+    try:
+        if config.SINGLE_FLIGHT_ENABLED:
+            # Identical concurrent requests (same prompt hash) share one call
+            key = prompt_hash(model, messages, max_tokens=max_tokens, hedge=hedge)
+            result, shared = get_single_flight().do(key, run_tailoring, deadline=deadline)
+            if shared:
+                # No spend of our own: the upstream call belongs to another request
+                result = dict(result, coalesced=True, calls=[])
+            return result
+
+        return run_tailoring()
+
+    except DeadlineExceeded as e:
+        return {
+            'success': False,
+            'status': 'deadline_exceeded',
+            'stage': e.stage,
+            'error': f"Timed out during {e.stage}",
+            'partial_resume': parse_llm_response(e.partial)[0] if e.partial else None,
+            'tailored_resume': resume_text,
+            'summary': f"Tailoring timed out during {e.stage}"
+        }
     except Exception as e:
         return {
             'success': False,
+            'status': 'error',
             'error': str(e),
             'tailored_resume': resume_text,  # Return original on failure
             'summary': f"Error during tailoring: {str(e)}"
         }
 
 
+def create_delta_prompt(bullets: List[Dict], missing_terms: List[str], role_header: List[str] = None) -> str:
+    """
+    Create a compact follow-up prompt that refines only the editable bullets.
+
+    Args:
+        bullets: Editable bullets (from resume_sections.get_editable_bullets)
+        missing_terms: Job description terms still missing from the resume
+        role_header: Header lines of the role the bullets belong to, given
+            as context when a single role is tailored on its own (optional)
+
+    Returns:
+        Formatted prompt string
+    """
+    numbered = '\n'.join(f"[{i}] {bullet['text']}" for i, bullet in enumerate(bullets, 1))
+    role_context = ''
+    if role_header:
+        role_context = "\n**ROLE (context only, do not output):**\n" + '\n'.join(role_header) + "\n"
+
+    return f"""Refine these resume bullet points to better match a job description.
+{role_context}
+**JOB DESCRIPTION TERMS STILL MISSING:**
+{', '.join(missing_terms) if missing_terms else '(none)'}
+
+**BULLETS:**
+{numbered}
+
+**RULES:**
+- Only use a missing term if the bullet's existing content already supports it (e.g. "ML pipeline" -> "MLOps pipeline")
+- NEVER add technologies, tools or experience the bullet does not already describe
+- Keep the original action verbs; no leadership inflation ("Led", "Architected")
+- Keep every bullet; do not merge, split or reorder them
+
+**OUTPUT FORMAT:**
+Output ONLY the bullets, one per line, in the same numbered format ("[1] ..."), with no other text.
+"""
+
+
+def parse_delta_response(response_text: str, bullet_count: int) -> Dict[int, str]:
+    """
+    Parse numbered bullets from a delta response.
+
+    Args:
+        response_text: Raw LLM response
+        bullet_count: Number of bullets that were sent
+
+    Returns:
+        Mapping of 1-based bullet number -> rewritten text
+    """
+    rewritten = {}
+    for line in response_text.split('\n'):
+        match = DELTA_BULLET_PATTERN.match(line)
+        if match:
+            number = int(match.group(1))
+            if 1 <= number <= bullet_count and match.group(2):
+                rewritten[number] = match.group(2)
+    return rewritten
+
+
+def missing_jd_terms(match_analysis: Dict) -> List[str]:
+    """Get the JD terms still missing from the resume (technical terms first), capped."""
+    missing_terms = sorted(match_analysis.get('missing_technical', set()))
+    missing_terms += sorted(match_analysis.get('missing_keywords', set()) - set(missing_terms))
+    return missing_terms[:config.DELTA_MAX_MISSING_TERMS]
+
+
+def delta_token_budget(bullets: List[Dict], model: str) -> int:
+    """Size max_tokens for a numbered-bullets response."""
+    bullets_text = '\n'.join(bullet['text'] for bullet in bullets)
+    return int(estimate_tokens(bullets_text, model) * 1.5) + 100 + 10 * len(bullets)
+
+
+def refine_bullets(resume_text: str, match_analysis: Dict, model: str, max_projects: int) -> Dict:
+    """
+    Run one delta round: send only the editable bullets and still-missing
+    terms, then splice the rewritten bullets back into the resume.
+
+    Args:
+        resume_text: Current (already tailored) resume text
+        match_analysis: Current match analysis
+        model: LLM model to use
+        max_projects: Number of recent roles whose bullets are editable
+
+    Returns:
+        Dictionary with the new resume text, the replaced and replacement
+        lines (for incremental re-scoring) and the call records
+    """
+    structure = segment_resume(resume_text)
+    # Only the bullets most related to the JD are sent, per role
+    bullets = [
+        bullet
+        for role in get_editable_roles(structure, max_projects)
+        for bullet in select_bullets(role['bullets'], match_analysis, config.RELEVANCE_TOP_BULLETS_PER_ROLE)
+    ]
+    if not bullets:
+        return {'success': False, 'error': 'No editable bullets found', 'calls': []}
+
+    messages = build_messages(create_delta_prompt(bullets, missing_jd_terms(match_analysis)))
+    call = run_completion(model, messages, delta_token_budget(bullets, model))
+    calls = [summarize_call(call, role='delta', won=True)]
+
+    rewritten = parse_delta_response(call['content'], len(bullets))
+    replacements = {}
+    old_lines = []
+    new_lines = []
+    for number, text in rewritten.items():
+        bullet = bullets[number - 1]
+        if text == bullet['text']:
+            continue
+        replacements[bullet['start']] = text
+        old_lines.extend(structure['lines'][bullet['start']:bullet['end']])
+        new_lines.append(bullet['prefix'] + text)
+
+    return {
+        'success': True,
+        'tailored_resume': replace_bullets(resume_text, replacements),
+        'old_lines': old_lines,
+        'new_lines': new_lines,
+        'bullets_changed': len(replacements),
+        'calls': calls
+    }
+
+
+def tailor_role(
+    role: Dict,
+    missing_terms: List[str],
+    model: str,
+    role_index: int,
+    bullets: List[Dict] = None,
+    deadline: Deadline = None,
+    user: str = None
+) -> Dict:
+    """
+    Tailor the bullets of a single role, retrying that role alone on failure.
+
+    A response counts as failed if the call errors or does not return every
+    bullet, since a partially rewritten role cannot be merged safely.
+
+    Args:
+        role: Role from resume_sections.segment_resume
+        missing_terms: JD terms still missing from the resume
+        model: LLM model to use
+        role_index: Position of the role (0 = most recent), for call records
+        bullets: Subset of the role's bullets to tailor (defaults to all)
+        deadline: Optional request deadline; no retry is made after it passes
+        user: Caller identity for the rate scheduler
+
+    Returns:
+        Dictionary with 'success', 'replacements' (bullet start line -> new
+        text), 'calls' and 'error' if every attempt failed
+    """
+    if bullets is None:
+        bullets = role['bullets']
+    messages = build_messages(create_delta_prompt(bullets, missing_terms, role['header_lines']))
+    max_tokens = delta_token_budget(bullets, model)
+    calls = []
+    error = None
+
+    for attempt in range(1, config.ROLE_MAX_ATTEMPTS + 1):
+        if deadline is not None and deadline.expired:
+            error = 'Timed out'
+            break
+        try:
+            call = run_completion(model, messages, max_tokens, deadline=deadline, user=user)
+        except Exception as e:
+            error = str(e)
+            continue
+
+        rewritten = parse_delta_response(call['content'], len(bullets))
+        complete = len(rewritten) == len(bullets)
+        calls.append(summarize_call(call, role='role', role_index=role_index, attempt=attempt, won=complete))
+        if complete:
+            return {
+                'success': True,
+                'replacements': {
+                    bullets[number - 1]['start']: text
+                    for number, text in rewritten.items()
+                    if text != bullets[number - 1]['text']
+                },
+                'calls': calls
+            }
+        error = f"Expected {len(bullets)} bullets, got {len(rewritten)}"
+
+    return {'success': False, 'replacements': {}, 'calls': calls, 'error': error}
+
+
+def tailor_resume_parallel(
+    resume_text: str,
+    jd_text: str,
+    match_analysis: Dict,
+    model: str = None,
+    max_projects: int = 2,
+    deadline: Deadline = None,
+    user: str = None
+) -> Dict:
+    """
+    Tailor each editable role in its own concurrent request and merge locally.
+
+    Only Experience bullets of the most recent max_projects roles are
+    rewritten; everything else is kept verbatim. Latency is roughly that of
+    the slowest role rather than of the whole document. A role whose
+    request keeps failing is left unchanged.
+
+    Args:
+        resume_text: Original resume text
+        jd_text: Job description text
+        match_analysis: Match analysis from resume_analyzer
+        model: LLM model to use (defaults to config.DEFAULT_MODEL)
+        max_projects: Number of recent roles to tailor
+        deadline: Optional request deadline shared by every role request;
+            roles still running when it passes are left unchanged
+        user: Caller identity for fair queuing in the rate scheduler
+
+    Returns:
+        Dictionary with the same fields as tailor_resume, plus
+        'failed_roles' (indexes of roles left unchanged)
+    """
+    if model is None:
+        model = config.DEFAULT_MODEL
+
+    structure = segment_resume(resume_text)
+    roles = [role for role in get_editable_roles(structure, max_projects) if role['bullets']]
+    if not roles:
+        return {
+            'success': False,
+            'error': 'No editable roles found in the Experience section',
+            'tailored_resume': resume_text,
+            'summary': None
+        }
+
+    missing_terms = missing_jd_terms(match_analysis)
+
+    with ThreadPoolExecutor(max_workers=min(len(roles), config.PARALLEL_ROLE_WORKERS),
+                            thread_name_prefix='role') as executor:
+        futures = [
+            executor.submit(
+                tailor_role, role, missing_terms, model, index,
+                select_bullets(role['bullets'], match_analysis, config.RELEVANCE_TOP_BULLETS_PER_ROLE),
+                deadline, user
+            )
+            for index, role in enumerate(roles)
+        ]
+        results = [future.result() for future in futures]
+
+    replacements = {}
+    calls = []
+    failed_roles = []
+    for index, result in enumerate(results):
+        calls.extend(result['calls'])
+        if result['success']:
+            replacements.update(result['replacements'])
+        else:
+            failed_roles.append(index)
+
+    usage_info = combine_usage(calls)
+
+    timed_out = deadline is not None and deadline.expired
+
+    if len(failed_roles) == len(roles):
+        return {
+            'success': False,
+            'status': 'deadline_exceeded' if timed_out else 'error',
+            'stage': 'llm' if timed_out else None,
+            'error': results[0].get('error') or 'Every role failed to tailor',
+            'tailored_resume': resume_text,
+            'summary': None,
+            'calls': calls,
+            'usage_info': usage_info
+        }
+
+    summary = f"Refined {len(replacements)} bullets across {len(roles) - len(failed_roles)} of {len(roles)} recent roles."
+    if failed_roles:
+        summary += f" {len(failed_roles)} role(s) could not be tailored and were kept unchanged."
+
+    return {
+        'success': True,
+        'tailored_resume': replace_bullets(resume_text, replacements),
+        'summary': summary,
+        'model_used': model,
+        'original_match_score': match_analysis.get('overall_score', 0),
+        'tokens_used': usage_info['total_tokens'],
+        'usage_info': usage_info,
+        'finish_reason': 'stop',
+        'truncated': False,
+        'continuations': 0,
+        'hedged': False,
+        'calls': calls,
+        'failed_roles': failed_roles,
+        'status': 'partial' if failed_roles else 'complete'
+    }
+
+
 def tailor_resume_iterative(
     resume_text: str,
     jd_text: str,
     match_analysis: Dict,
     target_score: float = 85.0,
     max_iterations: int = 2,
-    model: str = None
+    model: str = None,
+    max_projects: int = None,
+    min_gain_per_dollar: float = None
 ) -> Dict:
     """
     Iteratively tailor resume to achieve target match score.
 
+    The first round is a full tailoring; later rounds send only the
+    editable bullets and the still-missing terms. Scores are updated
+    incrementally, and iteration stops at the target score, when a round
+    does not improve the score, or when the score gain per dollar drops
+    below min_gain_per_dollar.
+
     Args:
         resume_text: Original resume text
         jd_text: Job description text
@@ -392,54 +1344,111 @@ def tailor_resume_iterative(
         target_score: Target match score percentage
         max_iterations: Maximum tailoring iterations
         model: LLM model to use
+        max_projects: Number of recent projects to tailor
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
+        min_gain_per_dollar: Plateau threshold in score points per USD
+            (defaults to config.ITERATION_MIN_GAIN_PER_DOLLAR)
 
     Returns:
         Dictionary with final tailored resume and metadata
     """
+    if model is None:
+        model = config.DEFAULT_MODEL
+    if max_projects is None:
+        max_projects = config.MAX_PROJECTS_TO_TAILOR
+    if min_gain_per_dollar is None:
+        min_gain_per_dollar = config.ITERATION_MIN_GAIN_PER_DOLLAR
+
+    initial_score = match_analysis.get('overall_score', 0)
     current_resume = resume_text
-    current_score = match_analysis.get('overall_score', 0)
+    current_score = initial_score
+    current_analysis = match_analysis
+    scorer = IncrementalMatchScorer(resume_text, jd_text)
+    summary = None
+    calls = []
     iteration_history = []
+    stop_reason = 'max_iterations'
 
     for i in range(max_iterations):
         if current_score >= target_score:
+            stop_reason = 'target_reached'
             break
 
-        # Tailor resume
-        result = tailor_resume(
-            current_resume,
-            jd_text,
-            match_analysis,
-            model=model,
-            max_projects=min(2, i + 1)  # Tailor more projects in later iterations
-        )
+        started = time.monotonic()
 
-        if not result['success']:
-            break
-
-        current_resume = result['tailored_resume']
-
-        # Re-analyze match score
-        from .resume_analyzer import calculate_match_score
-        new_analysis = calculate_match_score(current_resume, jd_text)
-        new_score = new_analysis.get('overall_score', 0)
+        if i == 0:
+            result = tailor_resume(current_resume, jd_text, current_analysis, model=model, max_projects=max_projects)
+            if not result['success']:
+                return {**result, 'initial_score': initial_score, 'iteration_history': iteration_history}
+            old_lines = current_resume.split('\n')
+            new_lines = result['tailored_resume'].split('\n')
+            summary = result['summary']
+            mode = 'full'
+        else:
+            try:
+                result = refine_bullets(current_resume, current_analysis, model, max_projects)
+            except Exception as e:
+                result = {'success': False, 'error': str(e), 'calls': []}
+            if not result['success']:
+                stop_reason = 'error'
+                break
+            old_lines = result['old_lines']
+            new_lines = result['new_lines']
+            mode = 'delta'
+
+        round_calls = result.get('calls', [])
+        calls.extend(round_calls)
+
+        # Re-score only the changed lines
+        scorer.replace_lines(old_lines, new_lines)
+        new_analysis = scorer.score()
+        new_score = new_analysis['overall_score']
+        gain = new_score - current_score
+        round_cost = calculate_total_cost(round_calls).get('estimated_cost')
 
         iteration_history.append({
             'iteration': i + 1,
+            'mode': mode,
             'score': new_score,
-            'summary': result['summary']
+            'gain': round(gain, 2),
+            'latency': round(time.monotonic() - started, 2),
+            'cost': round_cost,
+            'tokens': combine_usage(round_calls)['total_tokens'],
+            'summary': result.get('summary', f"{result.get('bullets_changed', 0)} bullets refined")
         })
 
-        # Update for next iteration
+        if mode == 'delta' and gain <= 0:
+            # Keep the previous version rather than accept a regression
+            scorer.replace_lines(new_lines, old_lines)
+            stop_reason = 'no_improvement'
+            break
+
+        current_resume = result['tailored_resume']
         current_score = new_score
-        match_analysis = new_analysis
+        current_analysis = new_analysis
+
+        if round_cost and gain / round_cost < min_gain_per_dollar:
+            stop_reason = 'plateau'
+            break
+
+    usage_info = combine_usage(calls)
 
     return {
         'success': True,
         'tailored_resume': current_resume,
+        'summary': summary,
+        'model_used': model,
+        'initial_score': initial_score,
         'final_score': current_score,
+        'final_analysis': current_analysis,
         'iterations': len(iteration_history),
         'iteration_history': iteration_history,
-        'improvement': current_score - match_analysis.get('overall_score', 0)
+        'improvement': current_score - initial_score,
+        'stop_reason': stop_reason,
+        'tokens_used': usage_info['total_tokens'],
+        'usage_info': usage_info,
+        'cost_info': calculate_total_cost(calls),
+        'calls': calls
     }
 
 
@@ -481,7 +1490,226 @@ def calculate_estimated_cost(model: str, usage_info: Dict) -> Dict:
     }
 
 
-def quick_tailor(resume_text: str, jd_text: str, model: str = None) -> Dict:
+def calculate_total_cost(calls: List[Dict]) -> Dict:
+    """
+    Calculate estimated cost over several LLM calls (possibly different models).
+
+    Args:
+        calls: Call records, each with 'model' and 'usage_info'
+
+    Returns:
+        Dictionary with cost information summed over all calls
+    """
+    total = {'estimated_cost': 0.0, 'input_cost': 0.0, 'output_cost': 0.0, 'currency': 'USD'}
+
+    for call in calls:
+        cost = calculate_estimated_cost(call.get('model'), call.get('usage_info'))
+        if cost.get('estimated_cost') is None:
+            return {'estimated_cost': None, 'currency': 'USD'}
+        for key in ('estimated_cost', 'input_cost', 'output_cost'):
+            total[key] += cost[key]
+
+    for key in ('estimated_cost', 'input_cost', 'output_cost'):
+        total[key] = round(total[key], 4)
+
+    return total
+
+
+def find_reusable_tailoring(resume_text: str, jd_text: str) -> Dict:
+    """
+    Look up a prior tailoring of this resume against a near-duplicate JD.
+
+    Args:
+        resume_text: Original resume text
+        jd_text: Job description text
+
+    Returns:
+        Match with 'similarity', 'created_at' and the stored 'result', or
+        None if there is none above config.JD_SIMILARITY_THRESHOLD
+    """
+    try:
+        return get_jd_index().query(resume_text, jd_text)
+    except sqlite3.Error as e:
+        logger.warning("JD index lookup failed: %s", e)
+        return None
+
+
+def store_tailoring(resume_text: str, jd_text: str, tailor_result: Dict) -> None:
+    """Record a successful tailoring in the JD index for later reuse."""
+    try:
+        get_jd_index().add(resume_text, jd_text, {
+            'tailored_resume': tailor_result['tailored_resume'],
+            'summary': tailor_result['summary'],
+            'model_used': tailor_result.get('model_used')
+        })
+    except sqlite3.Error as e:
+        logger.warning("Could not store tailoring in JD index: %s", e)
+
+
+def reuse_tailoring(match: Dict, resume_text: str, jd_text: str, initial_analysis: Dict = None) -> Dict:
+    """
+    Build a quick_tailor result from a prior tailoring, re-scored against the new JD.
+
+    Args:
+        match: Result of find_reusable_tailoring
+        resume_text: Original resume text
+        jd_text: New job description text
+        initial_analysis: Match analysis of the original resume (computed if omitted)
+
+    Returns:
+        Tailoring results in the same shape as quick_tailor, at zero cost
+    """
+    from .resume_analyzer import calculate_match_score
+
+    if initial_analysis is None:
+        initial_analysis = calculate_match_score(resume_text, jd_text)
+    initial_score = initial_analysis.get('overall_score', 0)
+
+    stored = match['result']
+    final_analysis = calculate_match_score(stored['tailored_resume'], jd_text)
+    final_score = final_analysis.get('overall_score', 0)
+
+    return {
+        'success': True,
+        'original_resume': resume_text,
+        'tailored_resume': stored['tailored_resume'],
+        'summary': stored['summary'],
+        'initial_score': initial_score,
+        'final_score': final_score,
+        'improvement': final_score - initial_score,
+        'initial_analysis': initial_analysis,
+        'final_analysis': final_analysis,
+        'model_used': stored.get('model_used'),
+        'tokens_used': 0,
+        'usage_info': {},
+        'cost_info': calculate_total_cost([]),
+        'calls': [],
+        'coalesced': False,
+        'truncated': False,
+        'continuations': 0,
+        'reused': {
+            'similarity': match['similarity'],
+            'created_at': match['created_at']
+        },
+        'status': 'complete'
+    }
+
+
+def preview_tailoring(
+    resume_text: str,
+    jd_text: str,
+    match_analysis: Dict = None,
+    max_projects: int = None
+) -> Dict:
+    """
+    Instant, free tailoring preview using deterministic terminology rewrites.
+
+    Applies TERMINOLOGY_RULES to the bullets of the most recent roles only,
+    switching resume phrases to the JD's wording where the concept already
+    exists (e.g. "ML pipeline" -> "MLOps pipeline"). No API call is made;
+    the new score is computed incrementally from the changed lines.
+
+    Args:
+        resume_text: Original resume text
+        jd_text: Job description text
+        match_analysis: Match analysis of the original resume (computed if omitted)
+        max_projects: Number of recent roles whose bullets may change
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
+
+    Returns:
+        Tailoring results in the same shape as quick_tailor, plus 'preview'
+        (True), 'changes' (each with original, modified and the JD term)
+        and 'latency_ms'
+    """
+    from .resume_analyzer import calculate_match_score, extract_technical_keywords
+
+    started = time.perf_counter()
+    if max_projects is None:
+        max_projects = config.MAX_PROJECTS_TO_TAILOR
+    if match_analysis is None:
+        match_analysis = calculate_match_score(resume_text, jd_text)
+
+    missing = match_analysis.get('missing_technical', set()) | match_analysis.get('missing_keywords', set())
+    # Technical terms the resume has: matched ones plus those the JD does not ask for
+    resume_tech = match_analysis.get('matched_technical', set()) | extract_technical_keywords(resume_text)
+    rules = [
+        (term, pattern, replacement)
+        for term, pattern, replacement, requires in COMPILED_TERMINOLOGY_RULES
+        if term in missing and (requires is None or requires & resume_tech)
+    ]
+
+    structure = segment_resume(resume_text)
+    replacements = {}
+    changes = []
+    old_lines = []
+    new_lines = []
+    for bullet in get_editable_bullets(structure, max_projects):
+        text = bullet['text']
+        terms = []
+        for term, pattern, replacement in rules:
+            text, count = pattern.subn(replacement, text, count=1)
+            if count:
+                terms.append(term)
+        if not terms:
+            continue
+        replacements[bullet['start']] = text
+        changes.append({'original': bullet['text'], 'modified': text, 'terms': terms})
+        old_lines.extend(structure['lines'][bullet['start']:bullet['end']])
+        new_lines.append(bullet['prefix'] + text)
+
+    scorer = IncrementalMatchScorer(resume_text, jd_text)
+    scorer.replace_lines(old_lines, new_lines)
+    final_analysis = scorer.score()
+
+    initial_score = match_analysis.get('overall_score', 0)
+    final_score = final_analysis['overall_score']
+    if changes:
+        summary = '\n'.join(
+            [f"**Instant preview:** {len(changes)} bullet(s) reworded to the job description's terminology "
+             f"(no AI call).", ""] +
+            [f"- Original: \"{change['original']}\"\n- Modified: \"{change['modified']}\"" for change in changes]
+        )
+    else:
+        summary = ("**Instant preview:** no bullet uses a phrase that maps directly to the job description's "
+                   "terminology. Run the AI tailoring for deeper rewording.")
+
+    return {
+        'success': True,
+        'original_resume': resume_text,
+        'tailored_resume': replace_bullets(resume_text, replacements),
+        'summary': summary,
+        'initial_score': initial_score,
+        'final_score': final_score,
+        'improvement': final_score - initial_score,
+        'initial_analysis': match_analysis,
+        'final_analysis': final_analysis,
+        'model_used': None,
+        'tokens_used': 0,
+        'usage_info': {},
+        'cost_info': calculate_total_cost([]),
+        'calls': [],
+        'coalesced': False,
+        'truncated': False,
+        'continuations': 0,
+        'failed_roles': [],
+        'reused': None,
+        'preview': True,
+        'status': 'complete',
+        'changes': changes,
+        'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+def quick_tailor(
+    resume_text: str,
+    jd_text: str,
+    model: str = None,
+    reuse: str = None,
+    mode: str = None,
+    deadline: Deadline = None,
+    max_projects: int = None,
+    user: str = None
+) -> Dict:
     """
     Quick one-shot resume tailoring (main function for UI).
 
@@ -489,40 +1717,117 @@ def quick_tailor(resume_text: str, jd_text: str, model: str = None) -> Dict:
         resume_text: Original resume text
         jd_text: Job description text
         model: LLM model to use
+        reuse: Near-duplicate JD reuse mode: 'off', 'offer' (only record
+            results; the caller offers reuse via find_reusable_tailoring) or
+            'auto' (return a prior tailoring without calling the LLM).
+            Defaults to config.JD_REUSE_MODE.
+        mode: 'full' (one request rewriting the whole resume), 'parallel'
+            (one concurrent request per editable role, bullets only) or
+            'preview' (instant rule-based rewording, no API call).
+            Defaults to config.TAILORING_MODE.
+        deadline: Request deadline shared by every stage (defaults to
+            config.TAILORING_DEADLINE from now)
+        max_projects: Number of recent projects to tailor
+            (defaults to config.MAX_PROJECTS_TO_TAILOR)
+        user: Caller identity (e.g. a session ID) for fair queuing in the
+            rate scheduler
 
     Returns:
-        Complete tailoring results with before/after scores
+        Complete tailoring results with before/after scores and a 'status':
+        'complete', 'partial' (output truncated or some roles left
+        unchanged), 'deadline_exceeded' or 'error'. Outputs that fail
+        validation are repaired locally; 'repairs' lists what was fixed.
     """
     # Import here to avoid circular dependency
     from .resume_analyzer import calculate_match_score
 
+    if reuse is None:
+        reuse = config.JD_REUSE_MODE
+    if mode is None:
+        mode = config.TAILORING_MODE
+    if deadline is None:
+        deadline = Deadline.from_config()
+    if max_projects is None:
+        max_projects = config.MAX_PROJECTS_TO_TAILOR
+
     # Calculate initial match score
-    initial_analysis = calculate_match_score(resume_text, jd_text)
+    try:
+        with deadline.stage('analysis'):
+            initial_analysis = calculate_match_score(resume_text, jd_text)
+    except DeadlineExceeded as e:
+        return {'success': False, 'status': 'deadline_exceeded', 'stage': e.stage,
+                'error': f"Timed out during {e.stage}", 'initial_score': None}
     initial_score = initial_analysis.get('overall_score', 0)
 
+    if mode == 'preview':
+        return preview_tailoring(resume_text, jd_text, initial_analysis, max_projects)
+
+    if reuse == 'auto':
+        match = find_reusable_tailoring(resume_text, jd_text)
+        if match:
+            return reuse_tailoring(match, resume_text, jd_text, initial_analysis)
+
     # Tailor resume
-    tailor_result = tailor_resume(
-        resume_text,
-        jd_text,
-        initial_analysis,
-        model=model,
-        max_projects=config.MAX_PROJECTS_TO_TAILOR
-    )
+    tailor = tailor_resume_parallel if mode == 'parallel' else tailor_resume
+    try:
+        with deadline.stage('llm'):
+            tailor_result = tailor(
+                resume_text,
+                jd_text,
+                initial_analysis,
+                model=model,
+                max_projects=max_projects,
+                deadline=deadline,
+                user=user
+            )
+    except DeadlineExceeded as e:
+        tailor_result = {'success': False, 'status': 'deadline_exceeded', 'stage': e.stage,
+                         'error': f"Timed out during {e.stage}"}
 
     if not tailor_result['success']:
         return {
             'success': False,
+            'status': tailor_result.get('status', 'error'),
+            'stage': tailor_result.get('stage'),
             'error': tailor_result.get('error', 'Unknown error'),
-            'initial_score': initial_score
+            'partial_resume': tailor_result.get('partial_resume'),
+            'initial_score': initial_score,
+            'initial_analysis': initial_analysis,
+            'timings': deadline.stages
         }
 
-    # Calculate new match score
+    status = tailor_result.get('status', 'complete')
+
+    # Validate, and salvage a failed output locally instead of paying for another run
+    from .output_validator import validate_resume_sections
+    validation = validate_resume_sections(tailor_result['tailored_resume'], resume_text, max_projects)
+    repairs = list(tailor_result.get('repairs', []))
+    if not validation['valid'] and config.OUTPUT_REPAIR_ENABLED:
+        repair = repair_resume(resume_text, tailor_result['tailored_resume'], max_projects, validation)
+        tailor_result['tailored_resume'] = repair['tailored_resume']
+        validation = repair['validation']
+        repairs += repair['repairs']
+        if repair['roles_kept']:
+            status = 'partial'
+
+    if reuse != 'off' and not tailor_result.get('coalesced') and status == 'complete':
+        store_tailoring(resume_text, jd_text, tailor_result)
+
+    # Calculate new match score (local and fast, so it runs even past the deadline:
+    # the tailored resume has already been paid for)
     final_analysis = calculate_match_score(tailor_result['tailored_resume'], jd_text)
     final_score = final_analysis.get('overall_score', 0)
 
     # Calculate cost
     usage_info = tailor_result.get('usage_info', {})
-    cost_info = calculate_estimated_cost(tailor_result.get('model_used'), usage_info)
+    calls = tailor_result.get('calls')
+    if calls is not None:
+        # Coalesced results carry no calls of their own and cost nothing
+        cost_info = calculate_total_cost(calls)
+    else:
+        cost_info = calculate_estimated_cost(tailor_result.get('model_used'), usage_info)
+    # Shown in the sidebar balance right away; the next refresh replaces the estimate
+    get_balance_cache().record_spend(cost_info.get('estimated_cost'))
 
     return {
         'success': True,
@@ -537,5 +1842,15 @@ def quick_tailor(resume_text: str, jd_text: str, model: str = None) -> Dict:
         'model_used': tailor_result.get('model_used'),
         'tokens_used': tailor_result.get('tokens_used'),
         'usage_info': usage_info,
-        'cost_info': cost_info
+        'cost_info': cost_info,
+        'calls': calls or [],
+        'coalesced': tailor_result.get('coalesced', False),
+        'truncated': tailor_result.get('truncated', False),
+        'continuations': tailor_result.get('continuations', 0),
+        'failed_roles': tailor_result.get('failed_roles', []),
+        'validation': validation,
+        'repairs': repairs,
+        'reused': None,
+        'status': status,
+        'timings': deadline.stages
     }
@@ -0,0 +1,224 @@
+"""
+Single-Flight Module
+Coalesces identical concurrent requests so that only one upstream call runs:
+across threads via an in-process registry, and across processes via a small
+SQLite table of in-flight keys and freshly completed results.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import config
+from .deadline import Deadline, DeadlineExceeded
+
+
+class _Call:
+    """An in-flight call that other threads in this process can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing its result.
+
+    Only callers that arrive while a call is in flight share its result; a
+    call made after it finished runs again. Results must be
+    JSON-serializable to be shared across processes.
+    """
+
+    def __init__(
+        self,
+        db_path=None,
+        result_ttl: float = None,
+        lock_timeout: float = None,
+        poll_interval: float = None
+    ):
+        self.db_path = str(db_path or config.SINGLE_FLIGHT_DB)
+        self.result_ttl = config.SINGLE_FLIGHT_RESULT_TTL if result_ttl is None else result_ttl
+        self.lock_timeout = config.SINGLE_FLIGHT_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+        self.poll_interval = config.SINGLE_FLIGHT_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._owner = f"{os.getpid()}"
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS inflight (key TEXT PRIMARY KEY, owner TEXT, started_at REAL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT, created_at REAL)'
+            )
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = None,
+        deadline: Deadline = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn for key, or wait for an identical in-flight call and share it.
+
+        Args:
+            key: Request key (e.g. a prompt hash)
+            fn: Callable performing the request
+            cacheable: Predicate deciding whether a result may be shared with
+                other processes (defaults to sharing every result)
+            deadline: Caller's deadline; waiting on another call stops when
+                it passes
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result
+            came from another caller's call
+
+        Raises:
+            DeadlineExceeded: If the deadline passed while waiting on
+                another caller's call
+        """
+        if deadline is None:
+            deadline = Deadline(None)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.event.wait(deadline.timeout_for()):
+                raise DeadlineExceeded('single-flight wait')
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            result, shared = self._do_across_processes(key, fn, cacheable, deadline)
+            call.result = result
+            return result, shared
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _do_across_processes(self, key: str, fn: Callable[[], Any], cacheable,
+                             deadline: Deadline) -> Tuple[Any, bool]:
+        """
+        Claim the key in SQLite, or wait for the process that holds it.
+
+        A waiting process only takes a result stored since the claim it saw
+        began, so results of earlier calls are never handed out. A claim
+        left by a crashed process goes stale after lock_timeout and is taken
+        over; fn never runs without the claim.
+        """
+        waited_on = None  # Start time of the other process's claim
+        while True:
+            if waited_on is not None:
+                shared = self._load_result(key, since=waited_on)
+                if shared is not None:
+                    return shared, True
+
+            claimed, holder_started = self._claim(key)
+            if claimed:
+                break
+            if waited_on is None:
+                waited_on = holder_started
+
+            deadline.check('single-flight wait')
+            time.sleep(min(self.poll_interval, deadline.remaining()))
+
+        try:
+            result = fn()
+            if cacheable is None or cacheable(result):
+                self._store_result(key, result)
+            return result, False
+        finally:
+            self._release(key)
+
+    def _claim(self, key: str) -> Tuple[bool, Optional[float]]:
+        """
+        Try to become the process running key; clears stale claims.
+
+        Returns:
+            Tuple of (claimed, start time of the other process's claim, or
+            None if it was released in the meantime)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'DELETE FROM inflight WHERE key = ? AND started_at < ?',
+                (key, now - self.lock_timeout)
+            )
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO inflight (key, owner, started_at) VALUES (?, ?, ?)',
+                (key, self._owner, now)
+            )
+            if cursor.rowcount == 1:
+                return True, None
+            row = conn.execute('SELECT started_at FROM inflight WHERE key = ?', (key,)).fetchone()
+        return False, row[0] if row else None
+
+    def _release(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute('DELETE FROM inflight WHERE key = ? AND owner = ?', (key, self._owner))
+
+    def _load_result(self, key: str, since: float):
+        """Result stored for key since the given time (and within result_ttl), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT result FROM results WHERE key = ? AND created_at >= ?',
+                (key, max(since, time.time() - self.result_ttl))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _store_result(self, key: str, result: Any) -> None:
+        now = time.time()
+        try:
+            payload = json.dumps(result)
+        except (TypeError, ValueError):
+            return
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results (key, result, created_at) VALUES (?, ?, ?)',
+                (key, payload, now)
+            )
+            conn.execute('DELETE FROM results WHERE created_at < ?', (now - self.result_ttl,))
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide SingleFlight instance (created on first use)."""
+    global _single_flight
+
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+
+    return _single_flight
@@ -0,0 +1,271 @@
+"""
+Token Budget Module
+Offline token estimation calibrated per model family against recorded usage,
+used for pre-flight cost and latency quotes before any API call is made.
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import config
+from .hedging import latency_tracker
+
+
+# Word, number, newline run, or single symbol: roughly the units BPE tokenizers split on
+TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|\n+|[^\sA-Za-z\d]")
+
+# Uncalibrated tokenizer density relative to the piece count, per model family
+DEFAULT_FAMILY_RATIOS = {
+    'openai': 1.0,
+    'anthropic': 1.1,
+    'meta-llama': 1.05,
+}
+
+# Exponential moving average weight given to each new usage sample
+CALIBRATION_ALPHA = 0.2
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_calibration: Optional[Dict] = None
+_unsaved = False  # Calibration changed since it was last written
+_last_saved: Optional[float] = None  # time.monotonic() of the last write
+
+
+def model_family(model: str) -> str:
+    """Get the model family (provider prefix) from an OpenRouter model ID."""
+    return (model or config.DEFAULT_MODEL).split('/', 1)[0]
+
+
+def count_token_pieces(text: str) -> int:
+    """
+    Count tokenizer-like pieces in text without a tokenizer vocabulary.
+
+    Long words are assumed to split every ~7 letters, digit runs every 3
+    digits, and non-ASCII symbols (emoji, bullets) into about two tokens.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Uncalibrated token estimate
+    """
+    if not text:
+        return 0
+
+    count = 0
+    for match in TOKEN_PIECE_PATTERN.finditer(text):
+        piece = match.group()
+        first = piece[0]
+        if first.isalpha():
+            count += 1 + (len(piece) - 1) // 7
+        elif first.isdigit():
+            count += math.ceil(len(piece) / 3)
+        elif first == '\n' or ord(first) < 128:
+            count += 1
+        else:
+            count += max(1, len(first.encode('utf-8')) // 2)
+
+    return count
+
+
+def _load_calibration() -> Dict:
+    """Load calibration data from disk (once per process)."""
+    global _calibration
+
+    if _calibration is None:
+        try:
+            with open(config.TOKEN_CALIBRATION_FILE, 'r', encoding='utf-8') as f:
+                _calibration = json.load(f)
+        except (OSError, ValueError):
+            _calibration = {}
+
+    return _calibration
+
+
+def _save_calibration(calibration: Dict) -> None:
+    """
+    Persist calibration data atomically.
+
+    Each write goes through its own temporary file, so job workers and
+    other processes saving at the same time never interleave.
+    """
+    global _unsaved, _last_saved
+
+    path = config.TOKEN_CALIBRATION_FILE
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=f".{path.name}.",
+                                         suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            json.dump(calibration, f, indent=2)
+        os.replace(tmp_path, path)
+        _unsaved = False
+        _last_saved = time.monotonic()
+    except OSError as e:
+        logger.warning("Could not save token calibration: %s", e)
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def flush_calibration() -> None:
+    """Write calibration changes not yet saved (called at exit)."""
+    with _lock:
+        if _unsaved and _calibration is not None:
+            _save_calibration(_calibration)
+
+
+atexit.register(flush_calibration)
+
+
+def _family_record(calibration: Dict, family: str) -> Dict:
+    """Read a family's calibration record, filling in defaults."""
+    record = calibration.get(family, {})
+    default_ratio = DEFAULT_FAMILY_RATIOS.get(family, 1.0)
+    return {
+        'prompt_ratio': record.get('prompt_ratio', default_ratio),
+        'completion_ratio': record.get('completion_ratio', default_ratio * config.COMPLETION_TOKEN_RATIO),
+        'tokens_per_second': record.get('tokens_per_second', config.DEFAULT_TOKENS_PER_SECOND),
+        'samples': record.get('samples', 0)
+    }
+
+
+def get_family_calibration(model: str) -> Dict:
+    """
+    Get the calibration record for a model's family.
+
+    Returns:
+        Dictionary with prompt_ratio, completion_ratio, tokens_per_second
+        and the number of samples it is based on
+    """
+    with _lock:
+        return _family_record(_load_calibration(), model_family(model))
+
+
+def estimate_tokens(text: str, model: str = None) -> int:
+    """
+    Estimate the token count of text for a model.
+
+    Args:
+        text: Input text
+        model: Model ID (defaults to config.DEFAULT_MODEL)
+
+    Returns:
+        Calibrated token estimate
+    """
+    pieces = count_token_pieces(text)
+    if not pieces:
+        return 0
+    return max(1, int(round(pieces * get_family_calibration(model)['prompt_ratio'])))
+
+
+def estimate_messages_tokens(messages: List[Dict], model: str = None) -> int:
+    """Estimate prompt tokens for chat messages (content plus per-message overhead)."""
+    return sum(estimate_tokens(message['content'], model) + 4 for message in messages) + 3
+
+
+def estimate_completion_tokens(resume_text: str, model: str = None) -> int:
+    """
+    Estimate completion tokens for a full tailored resume.
+
+    Args:
+        resume_text: Original resume text
+        model: Model ID
+
+    Returns:
+        Expected completion tokens (resume plus tailoring summary)
+    """
+    ratio = get_family_calibration(model)['completion_ratio']
+    return int(round(count_token_pieces(resume_text) * ratio)) + config.SUMMARY_TOKEN_ALLOWANCE
+
+
+def estimate_latency(model: str, completion_tokens: int) -> float:
+    """
+    Estimate end-to-end latency for a call.
+
+    Uses the observed median first-token latency for the model plus
+    completion tokens at the family's measured generation speed.
+
+    Returns:
+        Expected latency in seconds
+    """
+    first_token = latency_tracker.percentile(model, 50)
+    if first_token is None:
+        first_token = config.DEFAULT_FIRST_TOKEN_LATENCY
+
+    tokens_per_second = get_family_calibration(model)['tokens_per_second']
+    return first_token + completion_tokens / max(tokens_per_second, 1.0)
+
+
+def record_usage(
+    model: str,
+    messages: List[Dict],
+    usage_info: Dict,
+    resume_text: str = None,
+    generation_seconds: float = None,
+    finish_reason: str = None
+) -> None:
+    """
+    Calibrate the estimator for a model family from reported usage.
+
+    A completion cut off at max_tokens (finish_reason 'length') says nothing
+    about the size of a complete output, so it does not update the
+    completion ratio. The calibration file is written at most every
+    config.TOKEN_CALIBRATION_SAVE_INTERVAL seconds.
+
+    Args:
+        model: Model ID
+        messages: Chat messages that were sent
+        usage_info: Usage reported by the API
+        resume_text: Original resume, to calibrate completion size (optional)
+        generation_seconds: Time from first to last token (optional)
+        finish_reason: Why the completion stopped (optional)
+    """
+    prompt_tokens = (usage_info or {}).get('prompt_tokens')
+    completion_tokens = (usage_info or {}).get('completion_tokens')
+    if not prompt_tokens:
+        return
+
+    prompt_pieces = sum(count_token_pieces(message['content']) + 4 for message in messages) + 3
+    if not prompt_pieces:
+        return
+
+    global _unsaved
+
+    family = model_family(model)
+    with _lock:
+        calibration = _load_calibration()
+        current = _family_record(calibration, family)
+
+        current['prompt_ratio'] = _ema(current['prompt_ratio'], prompt_tokens / prompt_pieces)
+
+        if resume_text and completion_tokens and finish_reason != 'length':
+            resume_pieces = count_token_pieces(resume_text)
+            body_tokens = completion_tokens - config.SUMMARY_TOKEN_ALLOWANCE
+            if resume_pieces and body_tokens > 0:
+                current['completion_ratio'] = _ema(current['completion_ratio'], body_tokens / resume_pieces)
+
+        if generation_seconds and completion_tokens and generation_seconds > 0:
+            current['tokens_per_second'] = _ema(current['tokens_per_second'], completion_tokens / generation_seconds)
+
+        current['samples'] += 1
+        calibration[family] = current
+        _unsaved = True
+        if _last_saved is None or time.monotonic() - _last_saved >= config.TOKEN_CALIBRATION_SAVE_INTERVAL:
+            _save_calibration(calibration)
+
+
+def _ema(current: float, sample: float) -> float:
+    """Blend a new sample into an exponential moving average."""
+    return (1 - CALIBRATION_ALPHA) * current + CALIBRATION_ALPHA * sample
@@ -0,0 +1,506 @@
+"""
+Mock OpenRouter Server
+OpenAI-compatible stand-in for offline benchmarking: replays recorded
+completions by prompt hash, synthesizes the rest with configurable latency,
+429, truncation and placeholder behaviour, and can record a live session
+into fixtures.
+
+Usage:
+    python benchmarks/mock_openrouter.py --port 8765
+    python benchmarks/mock_openrouter.py --first-token lognormal:0.8,0.5 --tokens-per-second uniform:40,80 --rate-429 0.05
+    python benchmarks/mock_openrouter.py --record --upstream https://openrouter.ai/api/v1
+
+Then point the app (or any benchmark) at it:
+    OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1 OPENROUTER_API_KEY=mock streamlit run app.py
+
+Distributions are 'X' or 'fixed:X', 'uniform:LOW,HIGH', 'normal:MEAN,STDDEV'
+or 'lognormal:MEDIAN,SIGMA' (seconds, or tokens/second). Responses are
+deterministic for a given --seed, prompt and request count.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from backend.resume_sections import segment_resume  # noqa: E402
+from backend.resume_tailor import CONTINUATION_PROMPT, prompt_hash  # noqa: E402
+from backend.token_budget import estimate_messages_tokens, estimate_tokens  # noqa: E402
+
+
+DEFAULT_FIXTURES_DIR = config.DATA_DIR / "llm_fixtures"
+
+RESUME_IN_PROMPT_PATTERN = re.compile(r'\*\*ORIGINAL RESUME:\*\*\n(.*?)\n\n\*\*JOB DESCRIPTION:\*\*', re.DOTALL)
+DELTA_BULLET_LINE_PATTERN = re.compile(r'^\[\d+\] .*$', re.MULTILINE)
+
+# What a model writes instead of the roles it was told to keep (see --placeholder-rate)
+PLACEHOLDER_LINE = "[Previous roles preserved exactly as written]"
+
+# Pieces of text sent per SSE chunk (roughly one token each)
+CHUNK_PATTERN = re.compile(r'\S+\s*|\s+')
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a distribution spec into a sampler.
+
+    Args:
+        spec: 'X', 'fixed:X', 'uniform:LOW,HIGH', 'normal:MEAN,STDDEV' or
+            'lognormal:MEDIAN,SIGMA'
+
+    Returns:
+        Function drawing a non-negative sample from a random.Random
+    """
+    kind, _, params = spec.partition(':')
+    if not params:
+        kind, params = 'fixed', kind
+    values = [float(value) for value in params.split(',')]
+
+    if kind == 'fixed':
+        return lambda rng: values[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown distribution: {spec}")
+
+
+def fixture_key(body: Dict) -> str:
+    """Fixture key of a chat request: the prompt hash of its model and messages."""
+    return prompt_hash(body['model'], body['messages'])
+
+
+class FixtureStore:
+    """Recorded completions stored as one JSON file per prompt hash."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def put(self, key: str, fixture: Dict) -> None:
+        path = self.directory / f"{key}.json"
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(fixture, indent=2), encoding='utf-8')
+        tmp.replace(path)
+
+
+def synthesize_content(messages: List[Dict]) -> str:
+    """
+    Make up a plausible completion for the app's prompts.
+
+    Full tailoring prompts get the original resume back unchanged with a
+    summary, delta prompts get their numbered bullets back, and
+    continuation prompts get the rest of what the original prompt would
+    have produced.
+
+    Args:
+        messages: Chat messages of the request
+
+    Returns:
+        Completion text
+    """
+    prompt = messages[-1]['content']
+
+    if prompt == CONTINUATION_PROMPT and len(messages) >= 3:
+        already = messages[-2]['content']
+        full = synthesize_content(messages[:-2])
+        return full[len(already):] if full.startswith(already) else full
+
+    match = RESUME_IN_PROMPT_PATTERN.search(prompt)
+    if match:
+        return f"{match.group(1)}\n---TAILORING SUMMARY---\nMock tailoring: resume returned unchanged."
+
+    bullets = DELTA_BULLET_LINE_PATTERN.findall(prompt)
+    if bullets:
+        return '\n'.join(bullets)
+
+    return "Mock response."
+
+
+def inject_placeholder(content: str) -> str:
+    """Replace the roles after the editable ones with a placeholder, as models sometimes do."""
+    resume, marker, summary = content.partition('---TAILORING SUMMARY---')
+    structure = segment_resume(resume)
+    roles = structure['roles']
+    if len(roles) <= config.MAX_PROJECTS_TO_TAILOR:
+        return content
+    lines = structure['lines']
+    lines[roles[config.MAX_PROJECTS_TO_TAILOR]['start']:roles[-1]['end']] = [PLACEHOLDER_LINE]
+    return '\n'.join(lines) + marker + summary
+
+
+def truncate_to_tokens(content: str, max_tokens: int, model: str) -> str:
+    """Cut content to about max_tokens tokens, on a chunk boundary."""
+    pieces = CHUNK_PATTERN.findall(content)
+    tokens = estimate_tokens(content, model)
+    if tokens <= max_tokens or not pieces:
+        return content
+    keep = int(len(pieces) * max_tokens / tokens)
+    return ''.join(pieces[:keep])
+
+
+class MockSettings:
+    """Behaviour of the mock server (see the command-line options)."""
+
+    def __init__(
+        self,
+        fixtures_dir=DEFAULT_FIXTURES_DIR,
+        first_token: str = '0.3',
+        tokens_per_second: str = '80',
+        rate_429: float = 0.0,
+        retry_after: float = 1.0,
+        truncate_rate: float = 0.0,
+        placeholder_rate: float = 0.0,
+        replay_timing: bool = False,
+        on_miss: str = 'synthesize',
+        seed: int = 0,
+        record: bool = False,
+        upstream: str = None
+    ):
+        self.fixtures = FixtureStore(fixtures_dir)
+        self.first_token = parse_distribution(first_token)
+        self.tokens_per_second = parse_distribution(tokens_per_second)
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.truncate_rate = truncate_rate
+        self.placeholder_rate = placeholder_rate
+        self.replay_timing = replay_timing
+        self.on_miss = on_miss
+        self.seed = seed
+        self.record = record
+        self.upstream = upstream.rstrip('/') if upstream else None
+
+
+class MockOpenRouterServer(ThreadingHTTPServer):
+    """HTTP server holding the mock settings, request counters and statistics."""
+
+    daemon_threads = True
+
+    def __init__(self, address, settings: MockSettings):
+        super().__init__(address, MockHandler)
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.stats = {'requests': 0, 'replayed': 0, 'synthesized': 0, 'recorded': 0,
+                      'rate_limited': 0, 'truncated': 0, 'placeholders': 0, 'missing': 0}
+
+    def count(self, stat: str, key: str = None) -> int:
+        """Increment a statistic; with key, also return how often that prompt was seen."""
+        with self.lock:
+            self.stats[stat] += 1
+            if key is None:
+                return 0
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+            return self.request_counts[key]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: MockOpenRouterServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.endswith('/auth/key'):
+            if self.server.settings.record and self.server.settings.upstream:
+                self._proxy_get('/auth/key')
+            else:
+                self._send_json(200, {'data': {'label': 'mock', 'usage': 0.0, 'limit': 10.0,
+                                               'is_free_tier': False}})
+        elif self.path.endswith('/mock/stats'):
+            with self.server.lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}"}})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        settings = self.server.settings
+        if settings.record and settings.upstream:
+            self._record(body)
+        else:
+            self._serve(body)
+
+    def _serve(self, body: Dict) -> None:
+        settings = self.server.settings
+        key = fixture_key(body)
+        # Retries of the same prompt draw fresh samples
+        attempt = self.server.count('requests', key)
+        rng = random.Random(f"{settings.seed}:{key}:{attempt}")
+
+        if rng.random() < settings.rate_429:
+            self.server.count('rate_limited')
+            self._send_json(429, {'error': {'message': 'Rate limit exceeded (mock)', 'code': 429}},
+                            headers={'Retry-After': f"{settings.retry_after:g}"})
+            return
+
+        model = body['model']
+        fixture = settings.fixtures.get(key)
+        if fixture is not None:
+            self.server.count('replayed')
+            content = fixture['content']
+            finish_reason = fixture.get('finish_reason') or 'stop'
+        elif settings.on_miss == 'error':
+            self.server.count('missing')
+            self._send_json(404, {'error': {'message': f"No fixture for prompt {key}"}})
+            return
+        else:
+            self.server.count('synthesized')
+            content = synthesize_content(body['messages'])
+            finish_reason = 'stop'
+            if rng.random() < settings.placeholder_rate:
+                content = inject_placeholder(content)
+                self.server.count('placeholders')
+
+        max_tokens = body.get('max_tokens')
+        if max_tokens and estimate_tokens(content, model) > max_tokens:
+            content, finish_reason = truncate_to_tokens(content, max_tokens, model), 'length'
+        elif rng.random() < settings.truncate_rate:
+            content, finish_reason = content[:len(content) // 2], 'length'
+        if finish_reason == 'length':
+            self.server.count('truncated')
+
+        if settings.replay_timing and fixture is not None and fixture.get('first_token_latency') is not None:
+            first_token = fixture['first_token_latency']
+            generation = max(0.0, fixture.get('latency', first_token) - first_token)
+        else:
+            first_token = settings.first_token(rng)
+            generation = estimate_tokens(content, model) / max(settings.tokens_per_second(rng), 1e-6)
+
+        prompt_tokens = estimate_messages_tokens(body['messages'], model)
+        completion_tokens = estimate_tokens(content, model)
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                 'total_tokens': prompt_tokens + completion_tokens}
+
+        time.sleep(first_token)
+        if body.get('stream'):
+            self._stream(model, content, finish_reason, usage, generation)
+        else:
+            time.sleep(generation)
+            self._send_json(200, {
+                'id': f"mock-{key[:12]}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                             'finish_reason': finish_reason}],
+                'usage': usage
+            })
+
+    def _stream(self, model: str, content: str, finish_reason: str, usage: Dict, generation: float) -> None:
+        pieces = CHUNK_PATTERN.findall(content)
+        delay = generation / len(pieces) if pieces else 0.0
+
+        self._start_stream()
+        try:
+            for piece in pieces:
+                self._send_event(self._chunk(model, {'content': piece}))
+                if delay:
+                    time.sleep(delay)
+            self._send_event(self._chunk(model, {}, finish_reason))
+            self._send_event({**self._chunk(model, {}), 'choices': [], 'usage': usage})
+            self._end_stream()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the stream
+            pass
+
+    @staticmethod
+    def _chunk(model: str, delta: Dict, finish_reason: str = None) -> Dict:
+        return {
+            'id': 'mock',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+        }
+
+    def _upstream_headers(self) -> Dict:
+        authorization = self.headers.get('Authorization') or f"Bearer {config.OPENROUTER_API_KEY}"
+        return {'Authorization': authorization, 'Content-Type': 'application/json'}
+
+    def _proxy_get(self, path: str) -> None:
+        import httpx
+
+        response = httpx.get(f"{self.server.settings.upstream}{path}", headers=self._upstream_headers(),
+                             timeout=config.LLM_READ_TIMEOUT)
+        self._send_json(response.status_code, response.json())
+
+    def _record(self, body: Dict) -> None:
+        """Forward the request upstream, relay the response and save it as a fixture."""
+        import httpx
+
+        settings = self.server.settings
+        key = fixture_key(body)
+        self.server.count('requests')
+        started = time.monotonic()
+
+        with httpx.stream('POST', f"{settings.upstream}/chat/completions", json=body,
+                          headers=self._upstream_headers(), timeout=config.LLM_READ_TIMEOUT) as response:
+            if response.status_code != 200 or not body.get('stream'):
+                data = json.loads(response.read() or b'{}')
+                self._send_json(response.status_code, data,
+                                headers={k: v for k, v in response.headers.items() if k.lower() == 'retry-after'})
+                if response.status_code == 200:
+                    choice = data['choices'][0]
+                    self._save_fixture(key, body, choice['message']['content'], choice.get('finish_reason'),
+                                       data.get('usage'), None, time.monotonic() - started)
+                return
+
+            self._start_stream()
+            chunks, finish_reason, usage, first_token_latency = [], None, None, None
+            for event in _iter_events(response.iter_lines()):
+                self._send_event(event)
+                if event == '[DONE]':
+                    continue
+                usage = event.get('usage') or usage
+                for choice in event.get('choices') or []:
+                    delta = (choice.get('delta') or {}).get('content')
+                    if delta:
+                        if first_token_latency is None:
+                            first_token_latency = time.monotonic() - started
+                        chunks.append(delta)
+                    finish_reason = choice.get('finish_reason') or finish_reason
+            self._end_stream()
+
+        self._save_fixture(key, body, ''.join(chunks), finish_reason, usage, first_token_latency,
+                           time.monotonic() - started)
+
+    def _save_fixture(self, key, body, content, finish_reason, usage, first_token_latency, latency) -> None:
+        self.server.settings.fixtures.put(key, {
+            'model': body['model'],
+            'content': content,
+            'finish_reason': finish_reason,
+            'usage': usage,
+            'first_token_latency': first_token_latency,
+            'latency': latency,
+            'recorded_at': time.time()
+        })
+        self.server.count('recorded')
+
+    def _send_json(self, status: int, data: Dict, headers: Dict = None) -> None:
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _send_event(self, event) -> None:
+        data = '[DONE]' if event == '[DONE]' else json.dumps(event)
+        payload = f"data: {data}\n\n".encode('utf-8')
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(payload), payload))
+        self.wfile.flush()
+
+    def _end_stream(self) -> None:
+        self._send_event('[DONE]')
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def _iter_events(lines: Iterator[str]) -> Iterator:
+    """Parse SSE 'data:' lines into JSON events (or '[DONE]')."""
+    for line in lines:
+        if not line.startswith('data:'):
+            continue
+        data = line[len('data:'):].strip()
+        yield '[DONE]' if data == '[DONE]' else json.loads(data)
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, **settings) -> MockOpenRouterServer:
+    """
+    Start a mock server on a background thread.
+
+    Args:
+        host: Interface to listen on
+        port: Port (0 picks a free one)
+        **settings: MockSettings options
+
+    Returns:
+        Running server; its base_url is ready for config.OPENROUTER_BASE_URL
+    """
+    server = MockOpenRouterServer((host, port), MockSettings(**settings))
+    threading.Thread(target=server.serve_forever, name='mock-openrouter', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES_DIR), help='Fixture directory')
+    parser.add_argument('--first-token', default='0.3', help='Time-to-first-token distribution (seconds)')
+    parser.add_argument('--tokens-per-second', default='80', help='Generation speed distribution')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Probability of answering 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--truncate-rate', type=float, default=0.0,
+                        help="Probability of cutting a response in half with finish_reason 'length'")
+    parser.add_argument('--placeholder-rate', type=float, default=0.0,
+                        help='Probability of replacing older roles with a placeholder in a synthesized resume')
+    parser.add_argument('--replay-timing', action='store_true', help='Replay fixtures with their recorded latency')
+    parser.add_argument('--on-miss', choices=('synthesize', 'error'), default='synthesize',
+                        help='What to do for prompts without a fixture')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', action='store_true', help='Proxy to --upstream and save every response')
+    parser.add_argument('--upstream', default='https://openrouter.ai/api/v1')
+    args = parser.parse_args()
+
+    server = MockOpenRouterServer((args.host, args.port), MockSettings(
+        fixtures_dir=args.fixtures,
+        first_token=args.first_token,
+        tokens_per_second=args.tokens_per_second,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        truncate_rate=args.truncate_rate,
+        placeholder_rate=args.placeholder_rate,
+        replay_timing=args.replay_timing,
+        on_miss=args.on_miss,
+        seed=args.seed,
+        record=args.record,
+        upstream=args.upstream
+    ))
+    mode = f"recording from {args.upstream}" if args.record else "replaying"
+    print(f"Mock OpenRouter at {server.base_url} ({mode}, fixtures in {args.fixtures})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
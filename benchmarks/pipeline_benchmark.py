@@ -0,0 +1,106 @@
+"""
+Pipeline Benchmark
+Runs quick_tailor end to end against the mock OpenRouter server (started
+in-process unless --base-url is given) and reports latency percentiles,
+throughput, completion tokens and result statuses. No API key or credits
+are needed.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py resume.pdf jd.txt --requests 50 --concurrency 8
+    python benchmarks/pipeline_benchmark.py resume.pdf jd.txt --mode parallel --rate-429 0.1
+    python benchmarks/pipeline_benchmark.py resume.pdf jd.txt --placeholder-rate 0.5 --no-stream-validation
+    python benchmarks/pipeline_benchmark.py resume.pdf jd.txt --base-url http://127.0.0.1:8765/v1
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault('OPENROUTER_API_KEY', 'mock')
+
+import config  # noqa: E402
+from benchmarks.mock_openrouter import DEFAULT_FIXTURES_DIR, start_mock_server  # noqa: E402
+from backend.file_parser import extract_text_from_file  # noqa: E402
+from backend.resume_tailor import quick_tailor  # noqa: E402
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))] if ordered else 0.0
+
+
+def run_benchmark(resume_text, jd_text, requests, concurrency, model, mode, distinct_users):
+    """Run quick_tailor requests concurrently; return per-request latencies, statuses and completion tokens."""
+
+    def one(index):
+        # Vary the JD slightly so single-flight and JD reuse do not coalesce the requests
+        started = time.monotonic()
+        result = quick_tailor(resume_text, f"{jd_text}\nRequisition {index}", model=model, reuse='off',
+                              mode=mode, user=f"user-{index % distinct_users}")
+        status = result.get('status') or ('complete' if result['success'] else 'error')
+        return time.monotonic() - started, status, (result.get('usage_info') or {}).get('completion_tokens', 0)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(requests)))
+    return results, time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resume', help='Resume file (PDF, DOCX or TXT)')
+    parser.add_argument('jd', help='Job description file (PDF, DOCX or TXT)')
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--users', type=int, default=4, help='Distinct users the requests are spread over')
+    parser.add_argument('--model', default=config.DEFAULT_MODEL)
+    parser.add_argument('--mode', choices=('full', 'parallel'), default='full')
+    parser.add_argument('--base-url', help='Use an already running mock (or real) server instead')
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES_DIR))
+    parser.add_argument('--first-token', default='0.3')
+    parser.add_argument('--tokens-per-second', default='80')
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--truncate-rate', type=float, default=0.0)
+    parser.add_argument('--placeholder-rate', type=float, default=0.0)
+    parser.add_argument('--no-stream-validation', action='store_true',
+                        help='Let placeholder outputs stream to the end (repair afterwards)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        config.OPENROUTER_BASE_URL = args.base_url
+    else:
+        server = start_mock_server(fixtures_dir=args.fixtures, first_token=args.first_token,
+                                   tokens_per_second=args.tokens_per_second, rate_429=args.rate_429,
+                                   truncate_rate=args.truncate_rate, placeholder_rate=args.placeholder_rate,
+                                   seed=args.seed)
+        config.OPENROUTER_BASE_URL = server.base_url
+    config.SINGLE_FLIGHT_ENABLED = False
+    config.STREAM_VALIDATION_ENABLED = not args.no_stream_validation
+
+    resume_text = extract_text_from_file(args.resume)
+    jd_text = extract_text_from_file(args.jd)
+    results, elapsed = run_benchmark(resume_text, jd_text, args.requests, args.concurrency, args.model,
+                                     args.mode, args.users)
+    latencies = [latency for latency, _, _ in results]
+
+    print(f"Requests:    {len(results)} ({args.mode} mode, concurrency {args.concurrency})")
+    print(f"Elapsed:     {elapsed:.2f}s ({len(results) / elapsed:.2f} tailorings/sec)")
+    print(f"Latency:     p50 {percentile(latencies, 0.5):.2f}s  p95 {percentile(latencies, 0.95):.2f}s  "
+          f"max {max(latencies):.2f}s")
+    print(f"Completion:  {sum(tokens for _, _, tokens in results)} tokens")
+    print(f"Statuses:    {dict(Counter(status for _, status, _ in results))}")
+    if server is not None:
+        print(f"Mock server: {server.stats}")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
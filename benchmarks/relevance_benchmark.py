@@ -0,0 +1,135 @@
+"""
+Relevance Ranking Benchmark
+Compares prompt size and JD term coverage with and without relevance
+ranking, and optionally the live match-score improvement and latency.
+
+Usage:
+    python benchmarks/relevance_benchmark.py resume.pdf jd.txt
+    python benchmarks/relevance_benchmark.py resume.pdf jd.txt --live --model openai/gpt-4o-mini
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config  # noqa: E402
+from backend.file_parser import extract_text_from_file  # noqa: E402
+from backend.relevance import select_bullets  # noqa: E402
+from backend.resume_analyzer import calculate_match_score, extract_technical_keywords  # noqa: E402
+from backend.resume_sections import get_editable_roles, segment_resume  # noqa: E402
+from backend.resume_tailor import (  # noqa: E402
+    build_messages,
+    create_delta_prompt,
+    create_tailoring_prompt,
+    missing_jd_terms,
+    tailor_resume,
+)
+from backend.token_budget import estimate_messages_tokens  # noqa: E402
+
+
+def jd_prompt_rows(resume_text, jd_text, analysis, model, cutoffs, max_projects):
+    """Prompt tokens and JD technical-term coverage per JD sentence cutoff."""
+    jd_tech = extract_technical_keywords(jd_text)
+    rows = []
+    for k in cutoffs:
+        prompt = create_tailoring_prompt(resume_text, jd_text, analysis, max_projects, jd_top_sentences=k)
+        kept_tech = extract_technical_keywords(prompt.split('**JOB DESCRIPTION:**', 1)[1].split('**MATCH ANALYSIS:**')[0])
+        rows.append({
+            'cutoff': k or 'all',
+            'prompt_tokens': estimate_messages_tokens(build_messages(prompt), model),
+            'tech_coverage': len(kept_tech & jd_tech) / len(jd_tech) if jd_tech else 1.0
+        })
+    return rows
+
+
+def bullet_prompt_rows(resume_text, analysis, model, cutoffs, max_projects):
+    """Delta prompt tokens and share of JD technical terms in the bullets kept, per bullets-per-role cutoff."""
+    roles = get_editable_roles(segment_resume(resume_text), max_projects)
+    missing_terms = missing_jd_terms(analysis)
+    jd_tech = analysis['matched_technical'] | analysis['missing_technical']
+    all_bullets = [bullet for role in roles for bullet in role['bullets']]
+    all_tech = extract_technical_keywords('\n'.join(bullet['text'] for bullet in all_bullets)) & jd_tech
+    rows = []
+    for k in cutoffs:
+        bullets = [bullet for role in roles for bullet in select_bullets(role['bullets'], analysis, k)]
+        prompt = create_delta_prompt(bullets, missing_terms)
+        kept_tech = extract_technical_keywords('\n'.join(bullet['text'] for bullet in bullets)) & jd_tech
+        rows.append({
+            'cutoff': k or 'all',
+            'bullets': len(bullets),
+            'prompt_tokens': estimate_messages_tokens(build_messages(prompt), model),
+            'tech_coverage': len(kept_tech) / len(all_tech) if all_tech else 1.0
+        })
+    return rows
+
+
+def live_rows(resume_text, jd_text, analysis, model, cutoffs, max_projects):
+    """Run real tailorings per JD cutoff and report tokens, latency and score gain."""
+    rows = []
+    for k in cutoffs:
+        config.RELEVANCE_TOP_JD_SENTENCES = k
+        started = time.monotonic()
+        result = tailor_resume(resume_text, jd_text, analysis, model=model, max_projects=max_projects)
+        latency = time.monotonic() - started
+        if not result['success']:
+            rows.append({'cutoff': k or 'all', 'error': result.get('error')})
+            continue
+        final_score = calculate_match_score(result['tailored_resume'], jd_text)['overall_score']
+        rows.append({
+            'cutoff': k or 'all',
+            'prompt_tokens': result['usage_info']['prompt_tokens'],
+            'latency': latency,
+            'improvement': final_score - analysis['overall_score']
+        })
+    return rows
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0])
+    print('  '.join(f"{column:>14}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row.get(column, '')
+            cells.append(f"{value:>14.2f}" if isinstance(value, float) else f"{str(value):>14}")
+        print('  '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resume', help='Resume file (PDF, DOCX or TXT)')
+    parser.add_argument('jd', help='Job description file (PDF, DOCX or TXT)')
+    parser.add_argument('--model', default=config.DEFAULT_MODEL)
+    parser.add_argument('--max-projects', type=int, default=config.MAX_PROJECTS_TO_TAILOR)
+    parser.add_argument('--jd-cutoffs', default='0,25,15,10,5',
+                        help='Comma-separated JD sentence cutoffs (0 = whole JD)')
+    parser.add_argument('--bullet-cutoffs', default='0,8,5,3',
+                        help='Comma-separated bullets-per-role cutoffs (0 = all)')
+    parser.add_argument('--live', action='store_true', help='Also run real tailorings (uses API credits)')
+    args = parser.parse_args()
+
+    resume_text = extract_text_from_file(args.resume)
+    jd_text = extract_text_from_file(args.jd)
+    analysis = calculate_match_score(resume_text, jd_text)
+    jd_cutoffs = [int(k) or None for k in args.jd_cutoffs.split(',')]
+    bullet_cutoffs = [int(k) or None for k in args.bullet_cutoffs.split(',')]
+
+    print(f"Initial match score: {analysis['overall_score']:.1f}%")
+    print_table("Full tailoring prompt (JD sentences kept)",
+                jd_prompt_rows(resume_text, jd_text, analysis, args.model, jd_cutoffs, args.max_projects))
+    print_table("Delta prompt (bullets kept per role)",
+                bullet_prompt_rows(resume_text, analysis, args.model, bullet_cutoffs, args.max_projects))
+
+    if args.live:
+        print_table("Live tailoring (JD sentences kept)",
+                    live_rows(resume_text, jd_text, analysis, args.model, jd_cutoffs, args.max_projects))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Render Benchmark
+Measures documents per second and peak memory per render for DOCX and PDF:
+the previous renderers, which rebuilt styles, margins and run formatting on
+every call, against the precompiled template renderers, including both DOCX
+backends (python-docx and the direct OOXML writer). The render cache is
+bypassed.
+
+Usage:
+    python benchmarks/render_benchmark.py resume.txt
+    python benchmarks/render_benchmark.py resume.txt --seconds 5 --scale 1,10
+"""
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+from docx.enum.text import WD_ALIGN_PARAGRAPH  # noqa: E402
+from docx.shared import Inches, Pt, RGBColor  # noqa: E402
+from reportlab.lib.enums import TA_CENTER  # noqa: E402
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet  # noqa: E402
+from reportlab.lib.units import inch  # noqa: E402
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer  # noqa: E402
+
+from backend.document_generator import classify_lines, get_renderer  # noqa: E402
+from backend.file_parser import extract_text_from_file  # noqa: E402
+
+
+def legacy_docx(blocks):
+    """DOCX rendering as it was: default template opened and every run styled per call."""
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.75)
+        section.right_margin = Inches(0.75)
+
+    for kind, text in blocks:
+        if kind == 'blank':
+            doc.add_paragraph()
+        elif kind == 'name':
+            p = doc.add_paragraph(text)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            p.runs[0].font.size = Pt(18)
+            p.runs[0].font.bold = True
+        elif kind == 'header':
+            p = doc.add_paragraph(text)
+            p.runs[0].font.size = Pt(12)
+            p.runs[0].font.bold = True
+            p.runs[0].font.color.rgb = RGBColor(0, 0, 128)
+        elif kind == 'bullet':
+            p = doc.add_paragraph(text, style='List Bullet')
+            p.runs[0].font.size = Pt(10)
+        else:
+            p = doc.add_paragraph(text)
+            p.runs[0].font.size = Pt(10)
+
+    bio = io.BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+
+def legacy_pdf(blocks):
+    """PDF rendering as it was: stylesheet and custom styles rebuilt per call."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=0.75 * inch, leftMargin=0.75 * inch,
+                            topMargin=0.5 * inch, bottomMargin=0.5 * inch)
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='CustomName', parent=styles['Heading1'], fontSize=18, textColor='black',
+                              alignment=TA_CENTER, spaceAfter=12))
+    styles.add(ParagraphStyle(name='CustomHeader', parent=styles['Heading2'], fontSize=12, textColor='darkblue',
+                              spaceAfter=6, spaceBefore=12))
+    styles.add(ParagraphStyle(name='CustomBody', parent=styles['Normal'], fontSize=10, spaceAfter=6))
+    styles.add(ParagraphStyle(name='CustomBullet', parent=styles['Normal'], fontSize=10, leftIndent=20,
+                              bulletIndent=10, spaceAfter=4))
+    names = {'name': 'CustomName', 'header': 'CustomHeader', 'body': 'CustomBody'}
+
+    story = []
+    for kind, text in blocks:
+        if kind == 'blank':
+            story.append(Spacer(1, 0.1 * inch))
+        elif kind == 'bullet':
+            story.append(Paragraph(f"• {text}", styles['CustomBullet']))
+        else:
+            story.append(Paragraph(text, styles[names[kind]]))
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def renders_per_second(func, blocks, seconds):
+    func(blocks)  # Warm up (and compile templates)
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        func(blocks)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def peak_kib(func, blocks):
+    """Peak Python memory allocated during one render, in KiB."""
+    tracemalloc.start()
+    func(blocks)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resume', help='Resume file (PDF, DOCX or TXT) to render')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Time spent on each measurement')
+    parser.add_argument('--scale', default='1,10', help='Comma-separated resume repetitions (document sizes)')
+    parser.add_argument('--template', default=None, help='Registered template to render with')
+    args = parser.parse_args()
+
+    resume_text = extract_text_from_file(args.resume)
+    renderers = {
+        'docx': [('previous', legacy_docx),
+                 ('python-docx', get_renderer('docx', args.template, 'python-docx').render),
+                 ('ooxml', get_renderer('docx', args.template, 'ooxml').render)],
+        'pdf': [('previous', legacy_pdf),
+                ('compiled', get_renderer('pdf', args.template).render)]
+    }
+
+    print(f"{'scale':>6}  {'format':>6}  {'renderer':>12}  {'renders/s':>10}  {'speedup':>8}  {'peak KiB':>9}")
+    for scale in (int(value) for value in args.scale.split(',')):
+        blocks = classify_lines('\n'.join([resume_text] * scale))
+        for name, candidates in renderers.items():
+            baseline = None
+            for label, render in candidates:
+                rate = renders_per_second(render, blocks, args.seconds)
+                baseline = baseline or rate
+                print(f"{scale:>5}x  {name:>6}  {label:>12}  {rate:>10.1f}  {rate / baseline:>7.2f}x  "
+                      f"{peak_kib(render, blocks):>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Validation Benchmark
+Measures output validation cost per byte on large tailored outputs: the
+previous one-regex-per-pattern scan against the compiled rule engine, and
+how the engine scales as rules are added.
+
+Usage:
+    python benchmarks/validation_benchmark.py resume.txt
+    python benchmarks/validation_benchmark.py resume.txt --sizes 10,100,1000 --extra-rules 0,20,100
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.file_parser import extract_text_from_file  # noqa: E402
+from backend.output_validator import RuleEngine, load_rules  # noqa: E402
+
+
+# The placeholder and verb patterns as they were scanned before the rule engine
+LEGACY_PATTERNS = [
+    r'\[.*?PRESERVED.*?\]',
+    r'\[.*?AS WRITTEN.*?\]',
+    r'\[.*?EXACTLY.*?\]',
+    r'\[.*?UNCHANGED.*?\]',
+    r'\[Previous roles.*?\]',
+    r'\[Environment section.*?\]',
+    r'\[EDUCATION.*?\]',
+    r'\[TECHNICAL SKILLS.*?\]',
+    r'\[All previous.*?\]',
+    r'\[Earlier roles.*?\]',
+    r'\bArchitected\b',
+    r'\bLed\s+(?:development|implementation)',
+]
+
+
+def legacy_scan(text):
+    findings = []
+    for pattern in LEGACY_PATTERNS:
+        findings.extend(re.findall(pattern, text, re.IGNORECASE))
+    return findings
+
+
+def make_output(resume_text, size_kb):
+    """Repeat the resume (with a placeholder per copy) up to about size_kb kilobytes."""
+    block = resume_text + "\n[Previous roles preserved exactly as written]\n"
+    copies = max(1, size_kb * 1024 // len(block))
+    return block * copies
+
+
+def synthetic_rules(count):
+    return [
+        {'id': f'synthetic_{i}', 'type': 'synthetic', 'severity': 'low',
+         'pattern': rf'\bsyntheticterm{i}\b', 'flags': 'i', 'keywords': [f'syntheticterm{i}'],
+         'message': 'Synthetic rule'}
+        for i in range(count)
+    ]
+
+
+def time_per_byte(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(text) * 1e9, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resume', help='Resume file (PDF, DOCX or TXT) used to build the outputs')
+    parser.add_argument('--sizes', default='10,100,1000', help='Comma-separated output sizes in KB')
+    parser.add_argument('--extra-rules', default='0,20,100', help='Comma-separated synthetic rule counts to add')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    resume_text = extract_text_from_file(args.resume)
+    rules = load_rules()
+
+    print(f"{'size':>8}  {'scanner':>22}  {'ns/byte':>8}  {'ms':>8}  {'findings':>8}")
+    for size_kb in (int(size) for size in args.sizes.split(',')):
+        text = make_output(resume_text, size_kb)
+        rows = [('legacy (per pattern)', legacy_scan)]
+        for extra in (int(count) for count in args.extra_rules.split(',')):
+            engine = RuleEngine(rules + synthetic_rules(extra))
+            rows.append((f"engine ({len(engine.rules)} rules)", engine.scan))
+
+        for name, func in rows:
+            ns_per_byte, seconds = time_per_byte(func, text, args.repeat)
+            print(f"{size_kb:>6}KB  {name:>22}  {ns_per_byte:>8.1f}  {seconds * 1000:>8.2f}  {len(func(text)):>8}")
+
+
+if __name__ == '__main__':
+    main()
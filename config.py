@@ -15,12 +15,28 @@ BASE_DIR = Path(__file__).parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 BACKEND_DIR = BASE_DIR / "backend"
 
-# Ensure upload directory exists
+DATA_DIR = BASE_DIR / "data"  # Local caches, calibration and job state
+
+# Ensure upload and data directories exist
 UPLOAD_DIR.mkdir(exist_ok=True)
+DATA_DIR.mkdir(exist_ok=True)
 
 # API Configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Point at benchmarks/mock_openrouter.py (e.g. http://127.0.0.1:8765/v1) to run offline
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+# HTTP client settings (shared by tailoring and balance lookups)
+LLM_CONNECT_TIMEOUT = 10.0  # Seconds to establish a connection
+LLM_READ_TIMEOUT = 120.0  # Seconds to wait between bytes of a response
+LLM_WRITE_TIMEOUT = 30.0  # Seconds to send the request body
+LLM_POOL_TIMEOUT = 10.0  # Seconds to wait for a free pooled connection
+LLM_POOL_MAX_CONNECTIONS = 20
+LLM_POOL_MAX_KEEPALIVE = 10
+LLM_POOL_KEEPALIVE_EXPIRY = 60.0  # Seconds an idle connection is kept open
+LLM_MAX_RETRIES = 3  # Retries on 429/5xx and transport errors
+LLM_BACKOFF_BASE = 1.0  # Seconds; doubled on each retry (full jitter)
+LLM_BACKOFF_MAX = 30.0  # Upper bound on any single retry delay
 
 # Default LLM model (GPT-4o: good balance of quality and cost)
 DEFAULT_MODEL = "openai/gpt-4o"
@@ -62,6 +78,114 @@ ALTERNATIVE_MODELS = [
 # Model IDs only (for backward compatibility)
 MODEL_IDS = [model["id"] for model in ALTERNATIVE_MODELS]
 
+# Hedged requests: if the primary model has not produced its first token within
+# HEDGE_LATENCY_PERCENTILE of its observed first-token latency, the same request
+# is also sent to a fallback model and the first valid result wins.
+HEDGING_ENABLED = False
+HEDGE_FALLBACK_MODEL = "openai/gpt-3.5-turbo"
+HEDGE_LATENCY_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 5  # Observed calls needed before the percentile is trusted
+HEDGE_DEFAULT_DELAY = 20.0  # Seconds to wait before hedging until then
+HEDGE_CANCEL_GRACE = 1.0  # Seconds to wait for a cancelled loser to report usage
+
+# Completion sizing: max_tokens is estimated from the input resume length;
+# output cut off at max_tokens is finished with short continuation calls.
+COMPLETION_TOKEN_RATIO = 1.15  # Tailored resume tokens per original resume token
+SUMMARY_TOKEN_ALLOWANCE = 700  # Tokens reserved for the tailoring summary
+MIN_COMPLETION_TOKENS = 1500
+MAX_COMPLETION_TOKENS = 6000
+MAX_CONTINUATIONS = 2  # Continuation calls allowed per tailoring
+CONTINUATION_MIN_TOKENS = 800
+
+# Pre-flight quotes: token estimates are calibrated per model family from
+# recorded usage. If a quote exceeds a budget, the prompt is compacted.
+TOKEN_CALIBRATION_FILE = DATA_DIR / "token_calibration.json"
+TOKEN_CALIBRATION_SAVE_INTERVAL = 30.0  # Min seconds between calibration file writes (also written at exit)
+DEFAULT_TOKENS_PER_SECOND = 60.0  # Generation speed until calibrated
+DEFAULT_FIRST_TOKEN_LATENCY = 2.0  # Seconds, until latencies are observed
+PROMPT_TOKEN_BUDGET = None  # Max prompt tokens per tailoring (None = no limit)
+COST_BUDGET_PER_RESUME = None  # Max USD per tailoring (None = no limit)
+
+# Iterative tailoring: rounds after the first send only editable bullets and
+# still-missing terms, and stop once the score gain per dollar drops below this
+ITERATION_MIN_GAIN_PER_DOLLAR = 100.0  # Match-score points per USD
+DELTA_MAX_MISSING_TERMS = 15  # Missing JD terms included in a delta round
+
+# Single-flight: identical concurrent tailoring requests (same prompt hash)
+# share one LLM call, across threads and across processes via SQLite
+SINGLE_FLIGHT_ENABLED = True
+SINGLE_FLIGHT_DB = DATA_DIR / "single_flight.db"
+SINGLE_FLIGHT_RESULT_TTL = 30.0  # Seconds a finished result is kept for processes that waited on it
+SINGLE_FLIGHT_LOCK_TIMEOUT = 300.0  # Seconds before another process's claim is considered stale
+SINGLE_FLIGHT_POLL_INTERVAL = 0.25  # Seconds between checks while waiting on another process
+
+# Near-duplicate JD reuse settings
+JD_REUSE_MODE = "offer"  # 'off', 'offer' (ask in the UI) or 'auto' (reuse without asking)
+JD_SIMILARITY_THRESHOLD = 0.85  # Minimum estimated Jaccard similarity of JD shingles
+JD_INDEX_DB = DATA_DIR / "jd_index.db"
+JD_INDEX_TTL = 30 * 24 * 3600.0  # Seconds a stored tailoring can be reused (None = forever)
+JD_INDEX_MAX_ENTRIES = 1000  # Newest tailorings kept; older ones are purged on add (None = no limit)
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: ~99% recall at 0.85 similarity, few candidates below 0.6
+
+# Parallel per-role tailoring settings
+TAILORING_MODE = "full"  # 'full' (one request for the whole resume) or 'parallel' (one request per role)
+PARALLEL_ROLE_WORKERS = 4  # Max concurrent role requests
+ROLE_MAX_ATTEMPTS = 2  # Attempts per role before it is left unchanged
+
+# Relevance ranking settings (shrink prompts to what matters for the JD)
+RELEVANCE_TOP_JD_SENTENCES = 15  # JD sentences kept in the full tailoring prompt (None = whole JD)
+RELEVANCE_COMPACT_JD_SENTENCES = 8  # JD sentences kept when the prompt is compacted to fit the budget
+RELEVANCE_TOP_BULLETS_PER_ROLE = 5  # Bullets per role sent in delta/per-role prompts (None = all)
+
+# Deadline settings (seconds; None disables)
+TAILORING_DEADLINE = 180.0  # End-to-end budget for one tailoring request
+EXTRACTION_DEADLINE = 30.0  # Budget for extracting text from one uploaded file
+RENDER_DEADLINE = 30.0  # Budget for rendering the download documents
+
+# Background job queue settings
+JOB_QUEUE_DB = DATA_DIR / "jobs.db"
+JOB_WORKERS = 4  # Worker threads per app process (tailoring is I/O-bound)
+JOB_POLL_INTERVAL = 1.0  # Seconds between queue checks when idle, and between UI status polls
+JOB_STALE_TIMEOUT = 600.0  # Seconds before a 'running' job from a dead process is re-queued
+JOB_RESULT_TTL = 7 * 24 * 3600  # Seconds finished job results are kept
+
+# Rate limiting settings (per model, applied before each LLM call)
+RATE_LIMITING_ENABLED = True
+RATE_LIMIT_REQUESTS_PER_MINUTE = 60  # Default requests/min per model
+RATE_LIMIT_TOKENS_PER_MINUTE = 200000  # Default prompt+completion tokens/min per model
+RATE_LIMITS_PER_MODEL = {
+    # "openai/gpt-4o": {"requests_per_minute": 500, "tokens_per_minute": 800000},
+}
+RATE_LIMIT_POLL_INTERVAL = 0.25  # Seconds between cancellation checks while queued
+
+# Account balance cache settings (shared by all sessions in the process)
+BALANCE_CACHE_TTL = 300.0  # Seconds before the cached balance is refreshed in the background
+BALANCE_INITIAL_WAIT = 5.0  # Seconds a page waits for the very first balance fetch
+
+# Output validation rules (JSON list; see output_validator.load_rules)
+VALIDATION_RULES_FILE = BACKEND_DIR / "validation_rules.json"
+# Repair invalid outputs locally (restore preserved sections, strip placeholders)
+OUTPUT_REPAIR_ENABLED = True
+
+# Streaming validation: a critical placeholder or commentary finding cancels the
+# stream at once; the output is then repaired, or regenerated if it cannot be
+STREAM_VALIDATION_ENABLED = True
+STREAM_VALIDATION_WINDOW = 400  # Max characters of an unfinished line re-scanned per delta
+STREAM_VALIDATION_RETRIES = 1  # Regenerations after an abort that repair cannot salvage
+
+# Rendered document cache (keyed by text hash, format and template version)
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Memory tier bound (least recently used evicted first)
+RENDER_CACHE_DIR = None  # Disk tier, off by default: it keeps resumes on disk (e.g. DATA_DIR / "render_cache")
+RENDER_CACHE_DISK_MAX_BYTES = 512 * 1024 * 1024
+
+# DOCX writer: 'python-docx' (object model) or 'ooxml' (document.xml streamed into a prebuilt package)
+DOCX_BACKEND = 'python-docx'
+
+# Batch rendering (python -m backend.batch_render)
+BATCH_RENDER_WORKERS = None  # Worker processes (None uses the CPU count)
+BATCH_RENDER_IN_FLIGHT_PER_WORKER = 4  # Resumes queued per worker; bounds memory use
+
 # Resume processing settings
 MAX_PROJECTS_TO_TAILOR = 2  # Tailor only the most recent 1-2 projects
 BULLET_VARIATION_ALLOWED = 1  # Allow +1 or -1 bullet points